@@ -0,0 +1,350 @@
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+from patterns import get_pattern, get_pattern_names
+from game_logic import CONWAY_RULE, StepScratch, update_grid_into
+from sparse_logic import ActiveTileGrid
+from cycle_detection import CycleDetector
+from memmap_logic import MemmapBoard
+from ensemble import Ensemble, random_soups
+from simulation import ENGINES, INPLACE_ENGINE, MEMMAP_ENGINE, SPARSE_ENGINE, place_centered
+
+# Reproducible benchmark suite for the engines, end-state detection and the
+# renderer. Every measurement uses fixed seeds and fixed generation counts,
+# reports the best of several repeats, and the results are written as JSON so
+# runs on different commits can be compared:
+#
+#     python -m benchmarks --output before.json
+#     python -m benchmarks --output after.json --compare before.json
+
+SEED = 12345
+SIZES = (100, 500, 2000)
+QUICK_SIZES = (64, 256)
+DENSITIES = (0.05, 0.3)
+PATTERN_GRID_SIZE = 200
+GENERATIONS = 20
+REPEATS = 3
+ENSEMBLE_COUNTS = (256, 2048)
+QUICK_ENSEMBLE_COUNTS = (64,)
+ENSEMBLE_BOARD_SIZE = 32
+REGRESSION_THRESHOLD = 0.10 # Report a slowdown of more than 10% as a regression
+
+
+def random_grid(size, density, seed=SEED):
+    """Returns a reproducible random size x size soup with the given density."""
+    rng = np.random.default_rng(seed)
+    return (rng.random((size, size)) < density).astype(np.int8)
+
+
+def _best_time(run, repeats):
+    """Runs `run()` `repeats` times and returns the fastest wall-clock time."""
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _peak_memory(run):
+    """Returns the peak traced allocation (bytes) while running `run()` once."""
+    tracemalloc.start()
+    try:
+        run()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def _make_stepper(engine, grid, wrap_edges, rule):
+    """Returns a function that advances a copy of `grid` by n generations with `engine`."""
+    if engine == SPARSE_ENGINE:
+        def run(n):
+            tracker = ActiveTileGrid(grid, wrap_edges, rule=rule)
+            for _ in range(n):
+                tracker.step()
+        return run
+    if engine == INPLACE_ENGINE:
+        def run(n):
+            current, spare = grid.copy(), np.empty_like(grid)
+            scratch = StepScratch(grid.shape)
+            for _ in range(n):
+                update_grid_into(current, spare, scratch, wrap_edges, rule)
+                current, spare = spare, current
+        return run
+    if engine == MEMMAP_ENGINE:
+        def run(n):
+            board = MemmapBoard(grid.shape, wrap_edges=wrap_edges, rule=rule)
+            board.paste(grid)
+            board.step(n)
+            board.close()
+        return run
+    update = ENGINES[engine]
+
+    def run(n):
+        current = grid
+        for _ in range(n):
+            current = update(current, wrap_edges, rule)
+    return run
+
+
+def _result(group, name, params, seconds, generations, cells, peak_bytes):
+    return {
+        "group": group,
+        "name": name,
+        "params": params,
+        "seconds": seconds,
+        "seconds_per_gen": seconds / generations,
+        "gens_per_sec": generations / seconds if seconds > 0 else None,
+        "cells_per_sec": cells * generations / seconds if seconds > 0 else None,
+        "peak_bytes": peak_bytes,
+    }
+
+
+def bench_engines(sizes, densities, engines, generations, repeats, wrap_edges=True, rule=CONWAY_RULE):
+    """Times each engine on random soups of each size and density."""
+    results = []
+    for size in sizes:
+        for density in densities:
+            grid = random_grid(size, density)
+            for engine in engines:
+                run = _make_stepper(engine, grid, wrap_edges, rule)
+                seconds = _best_time(lambda: run(generations), repeats)
+                peak = _peak_memory(lambda: run(1))
+                name = f"engine/{engine}/soup/{size}/{density}"
+                params = {"engine": engine, "size": size, "density": density, "wrap_edges": wrap_edges}
+                results.append(_result("engine", name, params, seconds, generations, size * size, peak))
+    return results
+
+
+def bench_patterns(engines, generations, repeats, size=PATTERN_GRID_SIZE):
+    """Times each engine on every seed in patterns.py, centred on a dead-bordered board."""
+    results = []
+    for pattern_name in get_pattern_names():
+        grid = place_centered(get_pattern(pattern_name), size)
+        for engine in engines:
+            run = _make_stepper(engine, grid, False, CONWAY_RULE)
+            seconds = _best_time(lambda: run(generations), repeats)
+            name = f"engine/{engine}/pattern/{pattern_name}"
+            params = {"engine": engine, "pattern": pattern_name, "size": size}
+            results.append(_result("pattern", name, params, seconds, generations, size * size, None))
+    return results
+
+
+def bench_detection(sizes, generations, repeats, density=0.3):
+    """
+    Times the per-generation end-state checks (population count, stable check
+    and cycle detection) separately from stepping.
+    """
+    results = []
+    update = ENGINES["Convolution"]
+    for size in sizes:
+        # Precompute the generations so only the checks are timed
+        states = [random_grid(size, density)]
+        for _ in range(generations):
+            states.append(update(states[-1], True))
+
+        def run():
+            detector = CycleDetector(states[0].shape)
+            detector.start(states[0])
+            for gen in range(1, len(states)):
+                int(np.sum(states[gen]))
+                rows, cols = np.nonzero(states[gen] != states[gen - 1])
+                if len(rows):
+                    detector.update(rows, cols, gen)
+
+        seconds = _best_time(run, repeats)
+        peak = _peak_memory(run)
+        params = {"size": size, "density": density}
+        results.append(_result("detection", f"detection/{size}", params, seconds, generations, size * size, peak))
+    return results
+
+
+class _FakePhoto:
+    """Display-free stand-in for tk.PhotoImage that keeps the image data size."""
+    def __init__(self, master=None, data=b"", format=None):
+        self.size = len(data)
+
+
+class _FakeCanvas:
+    """Display-free stand-in for the parts of tk.Canvas used by GridImageRenderer."""
+    def __init__(self):
+        self.items = {}
+        self.calls = 0
+
+    def create_image(self, x, y, image=None, anchor=None, tags=()):
+        self.calls += 1
+        item = len(self.items) + 1
+        self.items[item] = tags
+        return item
+
+    def itemconfig(self, item, **options):
+        self.calls += 1
+
+    def find_withtag(self, tag):
+        return [item for item, tags in self.items.items() if tag in tags]
+
+    def tag_lower(self, tag):
+        self.calls += 1
+
+
+def bench_ensemble(counts, generations, repeats, size=ENSEMBLE_BOARD_SIZE, density=0.3):
+    """
+    Times stepping a batch of small soups as one (batch, rows, cols) array
+    against stepping the same boards one at a time with the in-place engine.
+    """
+    results = []
+    for count in counts:
+        soups = random_soups(count, (size, size), density)
+
+        def run_batched():
+            ensemble = Ensemble(soups) # Few soups settle within a benchmark's generations
+            for _ in range(generations):
+                ensemble.step()
+
+        scratch = StepScratch((size, size))
+        boards = [(soup.copy(), np.empty_like(soup)) for soup in soups]
+
+        def run_looped():
+            for i, (grid, spare) in enumerate(boards):
+                for _ in range(generations):
+                    update_grid_into(grid, spare, scratch)
+                    grid, spare = spare, grid
+                boards[i] = (grid, spare)
+
+        for mode, run in (("batched", run_batched), ("looped", run_looped)):
+            seconds = _best_time(run, repeats)
+            params = {"mode": mode, "boards": count, "size": size, "density": density}
+            results.append(_result("ensemble", f"ensemble/{mode}/{count}/{size}", params, seconds, generations,
+                                   count * size * size, None))
+    return results
+
+
+def bench_rendering(sizes, frames, repeats, density=0.3, screen_pixels=800):
+    """Times full-board redraws through GridImageRenderer with a fake canvas."""
+    try:
+        from gui_components import GridImageRenderer, Viewport
+    except ImportError as e: # tkinter is not installed
+        print(f"Skipping rendering benchmarks: {e}", file=sys.stderr)
+        return []
+    results = []
+    for size in sizes:
+        grid = random_grid(size, density)
+        cell_size = max(1, screen_pixels // size)
+        renderer = GridImageRenderer(_FakeCanvas(), photo_factory=_FakePhoto)
+
+        def run():
+            for _ in range(frames):
+                renderer.render(grid, cell_size)
+
+        seconds = _best_time(run, repeats)
+        peak = _peak_memory(lambda: renderer.render(grid, cell_size))
+        params = {"size": size, "cell_size": cell_size, "density": density}
+        results.append(_result("render", f"render/{size}", params, seconds, frames, size * size, peak))
+
+        # Viewport rendering: a screen_pixels square window, whole board fitted in it
+        viewport = Viewport()
+        viewport.fit(grid.shape, screen_pixels, screen_pixels)
+
+        def run_view():
+            for _ in range(frames):
+                renderer.render_view(grid, viewport, screen_pixels, screen_pixels)
+
+        seconds = _best_time(run_view, repeats)
+        peak = _peak_memory(lambda: renderer.render_view(grid, viewport, screen_pixels, screen_pixels))
+        params = {"size": size, "zoom": viewport.zoom, "density": density, "screen_pixels": screen_pixels}
+        results.append(_result("render", f"render_view/{size}", params, seconds, frames, size * size, peak))
+    return results
+
+
+def _git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_suite(quick=False, generations=GENERATIONS, repeats=REPEATS):
+    """Runs every benchmark group and returns the JSON-serializable report."""
+    sizes = QUICK_SIZES if quick else SIZES
+    engines = [INPLACE_ENGINE] + list(ENGINES.keys()) + [SPARSE_ENGINE, MEMMAP_ENGINE]
+    results = []
+    results += bench_engines(sizes, DENSITIES, engines, generations, repeats)
+    results += bench_patterns(engines, generations, repeats)
+    results += bench_detection(sizes, generations, repeats)
+    results += bench_rendering(sizes, generations, repeats)
+    results += bench_ensemble(QUICK_ENSEMBLE_COUNTS if quick else ENSEMBLE_COUNTS, generations, repeats)
+    return {
+        "meta": {
+            "commit": _git_commit(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "quick": quick,
+            "generations": generations,
+            "repeats": repeats,
+        },
+        "results": results,
+    }
+
+
+def compare(report, baseline, threshold=REGRESSION_THRESHOLD):
+    """
+    Compares a report against a baseline report.
+
+    Returns:
+        list: (name, baseline_seconds, seconds, ratio) for every benchmark that
+              got slower by more than `threshold`.
+    """
+    previous = {r["name"]: r for r in baseline["results"]}
+    regressions = []
+    for result in report["results"]:
+        old = previous.get(result["name"])
+        if old is None or not old["seconds"]:
+            continue
+        ratio = result["seconds"] / old["seconds"]
+        if ratio > 1 + threshold:
+            regressions.append((result["name"], old["seconds"], result["seconds"], ratio))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the Game of Life engines, detection and renderer.")
+    parser.add_argument("--quick", action="store_true", help="Use small boards only")
+    parser.add_argument("--generations", type=int, default=GENERATIONS)
+    parser.add_argument("--repeats", type=int, default=REPEATS)
+    parser.add_argument("--output", help="Write the JSON report to this file (default: stdout)")
+    parser.add_argument("--compare", help="Baseline JSON report to check for regressions")
+    parser.add_argument("--threshold", type=float, default=REGRESSION_THRESHOLD,
+                        help="Relative slowdown reported as a regression (default: %(default)s)")
+    args = parser.parse_args(argv)
+
+    report = run_suite(args.quick, args.generations, args.repeats)
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text)
+    else:
+        print(text)
+
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(report, json.load(f), args.threshold)
+        for name, old, new, ratio in regressions:
+            print(f"REGRESSION {name}: {old:.4f}s -> {new:.4f}s ({ratio:.2f}x)", file=sys.stderr)
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
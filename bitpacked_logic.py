@@ -0,0 +1,201 @@
+import numpy as np
+
+from game_logic import CONWAY_RULE, rule_table
+
+# Bit-packed (SWAR) Game of Life engine.
+# Each row of the board is stored as uint64 words holding 64 cells each
+# (bit j of word k is column 64*k + j). Neighbor counts are computed for all
+# 64 cells of a word at once with bitwise full-adder logic, so the board takes
+# 1 bit per cell instead of the 8 bits used by the int8 grid in game_logic.
+
+WORD_BITS = 64
+
+
+def _words_per_row(width):
+    """Returns the number of uint64 words needed to hold `width` cells."""
+    return (width + WORD_BITS - 1) // WORD_BITS
+
+
+def pack_grid(grid):
+    """
+    Packs a dense 0/1 grid into uint64 words.
+
+    Args:
+        grid (np.ndarray): 2D array of 0/1 cells (any integer or bool dtype).
+
+    Returns:
+        np.ndarray: Array of shape (rows, words_per_row) and dtype uint64.
+                    Padding bits past the last column are always zero.
+    """
+    rows, cols = grid.shape
+    n_words = _words_per_row(cols)
+    packed_bytes = np.packbits(grid.astype(bool), axis=1, bitorder='little')
+    padded = np.zeros((rows, n_words * 8), dtype=np.uint8)
+    padded[:, :packed_bytes.shape[1]] = packed_bytes
+    return padded.view('<u8').astype(np.uint64, copy=False)
+
+
+def unpack_grid(words, width):
+    """
+    Unpacks uint64 words back into a dense int8 grid.
+
+    Args:
+        words (np.ndarray): Packed board as returned by pack_grid.
+        width (int): Number of columns of the original grid.
+
+    Returns:
+        np.ndarray: 2D int8 array of shape (rows, width).
+    """
+    as_bytes = np.ascontiguousarray(words, dtype='<u8').view(np.uint8)
+    return np.unpackbits(as_bytes, axis=1, count=width, bitorder='little').astype(np.int8)
+
+
+def _last_word_mask(width):
+    """Returns the mask of valid bits in the last word of each row."""
+    used_bits = width - (_words_per_row(width) - 1) * WORD_BITS
+    if used_bits == WORD_BITS:
+        return np.uint64(0xFFFFFFFFFFFFFFFF)
+    return np.uint64((1 << used_bits) - 1)
+
+
+def _shift_columns(words, width, wrap_edges):
+    """
+    Returns (west, east) boards: for every cell, the state of its left and
+    right neighbor, respectively.
+    """
+    one = np.uint64(1)
+    high = np.uint64(WORD_BITS - 1)
+    last_bit = np.uint64((width - 1) % WORD_BITS)
+
+    # West neighbor: bit j takes bit j-1, word k takes bit 63 of word k-1
+    west = words << one
+    west[:, 1:] |= words[:, :-1] >> high
+    # East neighbor: bit j takes bit j+1, word k takes bit 0 of word k+1
+    east = words >> one
+    east[:, :-1] |= words[:, 1:] << high
+
+    if wrap_edges:
+        # Column 0's west neighbor is the last column, and vice versa
+        west[:, 0] |= (words[:, -1] >> last_bit) & one
+        east[:, -1] |= (words[:, 0] & one) << last_bit
+
+    # Bits shifted into the padding past the last column must stay zero
+    west[:, -1] &= _last_word_mask(width)
+    return west, east
+
+
+def _shift_rows(words, offset, wrap_edges):
+    """Shifts a packed board vertically by `offset` rows (+1 = down)."""
+    if wrap_edges:
+        return np.roll(words, offset, axis=0)
+    shifted = np.zeros_like(words)
+    if offset > 0:
+        shifted[offset:] = words[:-offset]
+    else:
+        shifted[:offset] = words[-offset:]
+    return shifted
+
+
+def count_neighbors_packed(words, width, wrap_edges=True):
+    """
+    Computes the neighbor count of every cell as four bit-planes.
+
+    Args:
+        words (np.ndarray): Packed board as returned by pack_grid.
+        width (int): Number of columns of the board.
+        wrap_edges (bool): If True, edges wrap around (toroidal array).
+                           If False, edges are treated as dead cells.
+
+    Returns:
+        tuple: (s0, s1, s2, s3) packed boards holding bits 0..3 of the
+               neighbor count (0-8) of each cell.
+    """
+    west, east = _shift_columns(words, width, wrap_edges)
+
+    # Horizontal sum of (west, self, east) as a 2-bit number for the rows
+    # above and below, and of (west, east) for the cell's own row.
+    row3_lo = west ^ words ^ east
+    row3_hi = (west & words) | (west & east) | (words & east)
+    row2_lo = west ^ east
+    row2_hi = west & east
+
+    up_lo = _shift_rows(row3_lo, 1, wrap_edges)
+    up_hi = _shift_rows(row3_hi, 1, wrap_edges)
+    down_lo = _shift_rows(row3_lo, -1, wrap_edges)
+    down_hi = _shift_rows(row3_hi, -1, wrap_edges)
+
+    # Add the three 2-bit numbers with full adders
+    s0 = up_lo ^ row2_lo ^ down_lo
+    carry0 = (up_lo & row2_lo) | (up_lo & down_lo) | (row2_lo & down_lo)
+    twos = up_hi ^ row2_hi ^ down_hi
+    fours_a = (up_hi & row2_hi) | (up_hi & down_hi) | (row2_hi & down_hi)
+    s1 = twos ^ carry0
+    fours_b = twos & carry0
+    s2 = fours_a ^ fours_b
+    s3 = fours_a & fours_b
+    return s0, s1, s2, s3
+
+
+def _apply_rule_packed(words, width, planes, table):
+    """Applies an arbitrary rule table to packed neighbor-count bit-planes."""
+    result = np.zeros_like(words)
+    for count in range(9):
+        born, survives = table[count], table[9 + count]
+        if not (born or survives):
+            continue
+        # Bits where the neighbor count equals `count`
+        matches = ~np.zeros_like(words)
+        for bit, plane in enumerate(planes):
+            matches &= plane if (count >> bit) & 1 else ~plane
+        if born and survives:
+            result |= matches
+        elif born:
+            result |= matches & ~words
+        else:
+            result |= matches & words
+    # Birth on 0 neighbors would switch on the padding bits past the last column
+    result[:, -1] &= _last_word_mask(width)
+    return result
+
+
+def update_packed_grid(words, width, wrap_edges=True, rule=CONWAY_RULE):
+    """
+    Advances a packed board by one generation.
+
+    Args:
+        words (np.ndarray): Packed board as returned by pack_grid.
+        width (int): Number of columns of the board.
+        wrap_edges (bool): If True, edges wrap around (toroidal array).
+                           If False, edges are treated as dead cells.
+        rule (str or np.ndarray): Rulestring or table from game_logic.rule_table().
+
+    Returns:
+        np.ndarray: The next packed board.
+    """
+    planes = count_neighbors_packed(words, width, wrap_edges)
+    table = rule_table(rule)
+    if np.array_equal(table, rule_table(CONWAY_RULE)):
+        s0, s1, s2, s3 = planes
+        # Alive next generation iff count == 3, or count == 2 and currently alive
+        return s1 & ~(s2 | s3) & (s0 | words)
+    return _apply_rule_packed(words, width, planes, table)
+
+
+def update_grid_logic_bitpacked(grid, wrap_edges=True, rule=CONWAY_RULE):
+    """
+    Drop-in replacement for game_logic.update_grid_logic using the
+    bit-packed engine. Results are bit-identical. The board is packed and
+    unpacked on every call, so the dense grid and the packed temporaries are
+    both held; use update_packed_grid directly to keep a board packed.
+
+    Args:
+        grid (np.ndarray): The current state of the grid.
+        wrap_edges (bool): If True, edges wrap around (toroidal array).
+                           If False, edges are treated as dead cells.
+        rule (str or np.ndarray): Rulestring or table from game_logic.rule_table().
+
+    Returns:
+        np.ndarray: The next state of the grid.
+    """
+    width = grid.shape[1]
+    return unpack_grid(update_packed_grid(pack_grid(grid), width, wrap_edges, rule), width)
@@ -0,0 +1,279 @@
+import argparse
+import json
+import sys
+import time
+from collections import Counter
+from functools import lru_cache
+
+import numpy as np
+from scipy import ndimage
+
+from game_logic import CONWAY_RULE, format_rule, parse_rule, update_grid_logic
+from patterns import PATTERN_PERIODS, get_pattern, get_pattern_names
+from simulation import load_grid_file
+
+# Object census of a board.
+# Live cells are split into objects by one labeling pass over the whole grid
+# (scipy.ndimage.label, 8-connected). Each object is cut out to its bounding
+# box and reduced to a canonical key: the smallest encoding among its 8
+# rotations and reflections, taken in the orientation with no more rows than
+# columns. Objects are grouped by bounding-box size, so the 8 variants of every
+# object in a group are built and encoded as 64-bit integers in a few array
+# operations; only objects whose box holds more than 64 cells are encoded one
+# by one (as packed bytes). The keys are looked up in an index built from every
+# phase of the patterns in patterns.py.
+#
+# Some objects are made of pieces that are not touching (the beacon in one of
+# its phases, the four arms of a pulsar). Pieces that match nothing are
+# therefore tried again as part of their cluster: the cells that lie within
+# two cells of each other, found by a second labeling pass over the board
+# dilated by a 2x2 block.
+#
+#     python -m census board.rle --wrap
+
+SMALL_CELLS = 64 # Bounding-box cells encoded into one uint64 key
+UNKNOWN = "Unknown"
+_STRUCTURE = np.ones((3, 3), dtype=bool) # 8-connectivity
+_BIT_WEIGHTS = np.left_shift(np.uint64(1), np.arange(SMALL_CELLS, dtype=np.uint64))
+
+
+def _variants(masks):
+    """Returns the 8 rotations and reflections of a (k, h, w) stack of masks."""
+    flips = (masks, masks[:, ::-1], masks[:, :, ::-1], masks[:, ::-1, ::-1])
+    return flips + tuple(m.transpose(0, 2, 1) for m in flips)
+
+
+def _canonical_keys(masks):
+    """
+    Returns the canonical key of each object in a (k, h, w) stack of masks
+    (all with the same bounding box), as a list of hashable tuples.
+    """
+    k, h, w = masks.shape
+    rows, cols = min(h, w), max(h, w)
+    # Only the variants with no more rows than columns (all 8 for a square box)
+    variants = [v for v in _variants(masks) if v.shape[1] == rows]
+    if h * w <= SMALL_CELLS:
+        weights = _BIT_WEIGHTS[:h * w]
+        values = np.stack([(v.reshape(k, -1) * weights).sum(axis=1, dtype=np.uint64) for v in variants])
+        return [(rows, cols, int(value)) for value in values.min(axis=0)]
+    packed = np.stack([np.packbits(v.reshape(k, -1), axis=1) for v in variants], axis=1)
+    return [(rows, cols, min(p.tobytes() for p in obj)) for obj in packed]
+
+
+def canonical_key(cells):
+    """Returns the canonical key of a single object given as a 2D 0/1 array."""
+    cells = np.asarray(cells) != 0
+    live_rows, live_cols = np.nonzero(cells)
+    if len(live_rows) == 0:
+        return None
+    trimmed = cells[live_rows.min():live_rows.max() + 1, live_cols.min():live_cols.max() + 1]
+    return _canonical_keys(trimmed[None])[0]
+
+
+def _object_keys(labels, ids, boxes):
+    """
+    Returns the canonical keys of the objects `ids` of a label array.
+
+    Args:
+        labels (np.ndarray): Label array; object `i` is the cells equal to `i`.
+        ids (np.ndarray): Labels of the objects to encode.
+        boxes (np.ndarray): (len(ids), 4) top, left, bottom, right (exclusive)
+                            bounding boxes of those objects.
+
+    Returns:
+        list: Canonical key of each object, in the order of `ids`.
+    """
+    keys = [None] * len(ids)
+    heights = boxes[:, 2] - boxes[:, 0]
+    widths = boxes[:, 3] - boxes[:, 1]
+    size_codes = heights * (int(widths.max(initial=0)) + 1) + widths
+    for code in np.unique(size_codes):
+        members = np.flatnonzero(size_codes == code)
+        h, w = int(heights[members[0]]), int(widths[members[0]])
+        # Gather every bounding box of this size at once: (k, h, w)
+        window_rows = boxes[members, 0][:, None, None] + np.arange(h)[None, :, None]
+        window_cols = boxes[members, 1][:, None, None] + np.arange(w)[None, None, :]
+        masks = (labels[window_rows, window_cols] == ids[members][:, None, None]).astype(np.uint8)
+        for i, key in zip(members, _canonical_keys(masks)):
+            keys[i] = key
+    return keys
+
+
+def _boxes(slices, ids):
+    """Returns (len(ids), 4) bounding boxes from ndimage.find_objects slices."""
+    return np.array([(s[0].start, s[1].start, s[0].stop, s[1].stop) for s in (slices[i - 1] for i in ids)],
+                    dtype=np.int64).reshape(-1, 4)
+
+
+def _label_objects(grid):
+    """Returns (labels, count) of the 8-connected objects of a 0/1 grid."""
+    return ndimage.label(grid, structure=_STRUCTURE)
+
+
+def _label_clusters(grid):
+    """
+    Returns (labels, count) of clusters of live cells within two cells of each
+    other; dead cells are labeled 0.
+    """
+    rows, cols = grid.shape
+    dilated = np.zeros((rows + 1, cols + 1), dtype=bool)
+    # Each live cell covers a 2x2 block, so cells at distance 2 cover touching blocks
+    for dr in (0, 1):
+        for dc in (0, 1):
+            dilated[dr:dr + rows, dc:dc + cols] |= grid
+    labels, count = ndimage.label(dilated, structure=_STRUCTURE)
+    return np.where(grid, labels[:rows, :cols], 0), count
+
+
+def _phases(pattern, period, rule):
+    """
+    Returns the phases of `pattern` over `period` generations, on a padded
+    board; just the pattern itself if it has no period (0) or doesn't come
+    back to its own shape (e.g. under another rule).
+    """
+    pad = period + 2 # Room to move or grow by a cell per generation
+    grid = np.pad((np.asarray(pattern) != 0).astype(np.int8), pad)
+    phases = [grid]
+    if period == 0:
+        return phases
+    for _ in range(period):
+        grid = update_grid_logic(grid, wrap_edges=False, rule=rule)
+        phases.append(grid)
+    if canonical_key(phases[-1]) != canonical_key(phases[0]):
+        return [phases[0]]
+    return phases[:-1]
+
+
+@lru_cache(maxsize=None)
+def catalogue_index(rule=CONWAY_RULE):
+    """
+    Returns a dict mapping canonical keys to names for every phase of every
+    pattern in patterns.py. Periodic patterns (PATTERN_PERIODS) are stepped
+    through their period under `rule`; the rest are indexed as drawn.
+    Patterns listed earlier win when two share a shape.
+    """
+    rule = format_rule(*parse_rule(rule))
+    index = {}
+    names = sorted(get_pattern_names(), key=lambda name: name not in PATTERN_PERIODS) # Stable sort keeps the order
+    for name in names:
+        for phase in _phases(get_pattern(name), PATTERN_PERIODS.get(name, 0), rule):
+            key = canonical_key(phase)
+            if key is not None:
+                index.setdefault(key, name)
+    return index
+
+
+def _unwrap(grid):
+    """
+    Rolls a wrapped board so that an empty row and column lie on its edges,
+    which keeps objects crossing the seam in one piece. Boards without an
+    empty row or column are returned as they are.
+    """
+    empty_rows = np.flatnonzero(~grid.any(axis=1))
+    empty_cols = np.flatnonzero(~grid.any(axis=0))
+    if len(empty_rows):
+        grid = np.roll(grid, -int(empty_rows[0]), axis=0)
+    if len(empty_cols):
+        grid = np.roll(grid, -int(empty_cols[0]), axis=1)
+    return grid
+
+
+def census(grid, wrap_edges=False, rule=CONWAY_RULE):
+    """
+    Counts the objects on a board by type.
+
+    Args:
+        grid (np.ndarray): 2D array of 0/1 cells.
+        wrap_edges (bool): If True, objects may cross the board's edges.
+        rule (str): Rule the pattern phases are computed under.
+
+    Returns:
+        Counter: Object name -> count, e.g. {"Block": 12, "Blinker": 5}.
+                 Objects not in the catalogue are counted as
+                 "Unknown (<n> cells)".
+    """
+    grid = np.asarray(grid) != 0
+    if wrap_edges:
+        grid = _unwrap(grid)
+    counts = Counter()
+    labels, count = _label_objects(grid)
+    if count == 0:
+        return counts
+    index = catalogue_index(rule)
+
+    ids = np.arange(1, count + 1)
+    keys = _object_keys(labels, ids, _boxes(ndimage.find_objects(labels), ids))
+    names = [index.get(key) for key in keys]
+    matched = np.array([name is not None for name in names])
+
+    if not matched.all():
+        clusters, _ = _label_clusters(grid)
+        # Cluster of each object, read at one of its cells
+        flat = labels.ravel()
+        cells = np.flatnonzero(flat)
+        _, first = np.unique(flat[cells], return_index=True)
+        object_cluster = clusters.ravel()[cells[first]]
+        pieces = np.bincount(object_cluster)
+        candidates = np.unique(object_cluster[~matched])
+        candidates = candidates[pieces[candidates] > 1] # A lone piece was already tried
+        if len(candidates):
+            cluster_keys = _object_keys(clusters, candidates, _boxes(ndimage.find_objects(clusters), candidates))
+            for cluster, key in zip(candidates, cluster_keys):
+                name = index.get(key)
+                if name is None:
+                    continue
+                counts[name] += 1
+                members = object_cluster == cluster
+                matched |= members
+                for i in np.flatnonzero(members):
+                    names[i] = "" # Counted with its cluster
+
+    sizes = np.bincount(labels.ravel(), minlength=count + 1)[1:]
+    for i, name in enumerate(names):
+        if name:
+            counts[name] += 1
+        elif name is None:
+            counts[f"{UNKNOWN} ({sizes[i]} cells)"] += 1
+    return counts
+
+
+def format_census(counts, limit=None):
+    """Returns census counts as a short comma-separated string, most common first."""
+    if not counts:
+        return "empty"
+    items = counts.most_common(limit)
+    text = ", ".join(f"{n} {name}" for name, n in items)
+    if limit is not None and len(counts) > limit:
+        text += ", ..."
+    return text
+
+
+def main(argv=None):
+    """Command line entry point: prints the objects on a board file."""
+    parser = argparse.ArgumentParser(description="Count the objects on a board by type.")
+    parser.add_argument("file", help="Board file (.rle, .cells, .lif, .mc, .npy or plaintext grid)")
+    parser.add_argument("--wrap", action="store_true", help="Let objects cross the board's edges")
+    parser.add_argument("--rule", default=CONWAY_RULE, help="Life-like rulestring (default: %(default)s)")
+    parser.add_argument("--json", action="store_true", help="Print the counts as JSON")
+    args = parser.parse_args(argv)
+    try:
+        parse_rule(args.rule)
+    except ValueError as e:
+        parser.error(str(e))
+
+    grid = load_grid_file(args.file)
+    start = time.perf_counter()
+    counts = census(grid, wrap_edges=args.wrap, rule=args.rule)
+    elapsed = time.perf_counter() - start
+
+    if args.json:
+        print(json.dumps({"elapsed_s": elapsed, "objects": dict(counts.most_common())}, indent=2))
+    else:
+        for name, n in counts.most_common():
+            print(f"{n:>8} {name}")
+        print(f"\n{sum(counts.values())} objects in {elapsed * 1e3:.1f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
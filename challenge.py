@@ -0,0 +1,238 @@
+import argparse
+import json
+import os
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from census import census, format_census
+from pattern_library import default_library
+from game_logic import CONWAY_RULE, format_rule, initialize_grid, parse_rule, paste_pattern
+from ensemble import DEFAULT_MAX_PERIOD, STATE_NAMES, Ensemble, RUNNING, SPACESHIP
+from simulation import DEFAULT_GRID_SIZE, load_grid_file
+
+# Headless challenge mode.
+# Evaluates many placements of one pattern on a board (positions times the four
+# quarter-turn rotations) instead of one click at a time: the variants are
+# split into batches, each batch is stacked and run to its end state as one
+# ensemble.Ensemble, and the batches are spread over a process pool. The result
+# is a table ranked like the challenge (highest final population first), with
+# the initial population and the generation each variant settled at, and
+# optionally the objects each variant's final board holds (census.census).
+#
+#     python -m challenge --pattern "R-pentomino" --size 64 --stride 4 --top 20
+
+ROTATIONS = (0, 1, 2, 3) # Quarter turns clockwise, as with a right click in the GUI
+DEFAULT_MAX_GENERATIONS = 5000
+DEFAULT_STRIDE = 8 # Cells between tried positions when none are given
+DEFAULT_BATCH_SIZE = 128 # Variants stepped together in one task
+SORT_KEYS = ("final_population", "initial_population", "stabilized_at", "growth")
+
+_worker = {} # Per-process evaluation settings, set by _init_worker
+
+
+def rotate(pattern, rotation):
+    """Returns `pattern` turned `rotation` quarter turns clockwise."""
+    return np.rot90(pattern, k=-rotation)
+
+
+def placement_variants(pattern, board_shape, positions=None, rotations=ROTATIONS, stride=DEFAULT_STRIDE):
+    """
+    Lists the (row, col, rotation) placements to evaluate.
+
+    Args:
+        pattern (np.ndarray): The pattern, before rotation.
+        board_shape (tuple): (rows, cols) of the board.
+        positions (iterable): (row, col) top-left corners to try with every
+                              rotation. Default: every `stride`-th position at
+                              which the rotated pattern fits on the board.
+        rotations (iterable): Quarter turns to try.
+        stride (int): Spacing of the default positions.
+
+    Returns:
+        list: (row, col, rotation) tuples.
+    """
+    variants = []
+    for rotation in rotations:
+        if positions is not None:
+            variants.extend((int(r), int(c), rotation) for r, c in positions)
+            continue
+        height, width = rotate(pattern, rotation).shape
+        rows = range(0, max(0, board_shape[0] - height) + 1, stride)
+        cols = range(0, max(0, board_shape[1] - width) + 1, stride)
+        variants.extend((r, c, rotation) for r in rows for c in cols)
+    return variants
+
+
+def _init_worker(board, pattern, wrap_edges, rule, max_generations, max_period, count_objects=False):
+    _worker.update(board=board, wrap_edges=wrap_edges, rule=rule, max_generations=max_generations,
+                   max_period=max_period, count_objects=count_objects,
+                   rotations={k: rotate(pattern, k) for k in ROTATIONS})
+
+
+def _evaluate_batch(variants):
+    """Runs one batch of (row, col, rotation) variants to their end states."""
+    board = _worker["board"]
+    boards = np.empty((len(variants), *board.shape), dtype=np.int8)
+    for i, (row, col, rotation) in enumerate(variants):
+        boards[i] = board
+        paste_pattern(boards[i], _worker["rotations"][rotation % 4], row, col, _worker["wrap_edges"])
+    ensemble = Ensemble(boards, wrap_edges=_worker["wrap_edges"], rule=_worker["rule"],
+                        max_period=_worker["max_period"], keep_final=_worker["count_objects"])
+    results = ensemble.run(_worker["max_generations"])
+    finals = ensemble.final_boards() if _worker["count_objects"] else None
+    rows = []
+    for i, (row, col, rotation) in enumerate(variants):
+        running = results["state"][i] == RUNNING
+        rows.append({
+            "row": row,
+            "col": col,
+            "rotation": rotation,
+            "state": STATE_NAMES[results["state"][i]],
+            "period": int(results["period"][i]) if not running else None,
+            "displacement": [int(d) for d in results["displacement"][i]] if results["state"][i] == SPACESHIP else None,
+            "initial_population": int(results["initial_population"][i]),
+            "final_population": int(results["population"][i]),
+            "stabilized_at": int(results["stabilized_at"][i]) if not running else None,
+            "generations": int(results["end_generation"][i]) if not running else ensemble.generation,
+        })
+        if finals is not None:
+            rows[-1]["objects"] = dict(census(finals[i], _worker["wrap_edges"], _worker["rule"]).most_common())
+    return rows
+
+
+def _sort_value(result, key):
+    if key == "growth":
+        return result["final_population"] - result["initial_population"]
+    value = result[key]
+    return -1 if value is None else value # Variants still running rank last on stabilized_at
+
+
+def evaluate_placements(pattern, board=None, positions=None, rotations=ROTATIONS, stride=DEFAULT_STRIDE,
+                        wrap_edges=True, rule=CONWAY_RULE, max_generations=DEFAULT_MAX_GENERATIONS,
+                        max_period=DEFAULT_MAX_PERIOD, workers=None, batch_size=DEFAULT_BATCH_SIZE,
+                        sort_by="final_population", count_objects=False):
+    """
+    Runs every placement of `pattern` on `board` to its end state and ranks them.
+
+    Args:
+        pattern (np.ndarray): 2D array of 0/1 cells.
+        board (np.ndarray): Board the pattern is placed on (default: an empty
+                            DEFAULT_GRID_SIZE board). It is not modified.
+        positions, rotations, stride: Placements to try (see placement_variants).
+        wrap_edges (bool): If True, edges wrap around.
+        rule (str): Life-like rulestring.
+        max_generations (int): Generations after which a variant counts as Running.
+        max_period (int): Longest oscillation period detected.
+        workers (int): Worker processes (default: os.cpu_count(); 1 runs in
+                       this process).
+        batch_size (int): Variants per task.
+        sort_by (str): One of SORT_KEYS; ranks from highest to lowest.
+        count_objects (bool): If True, also take a census of each variant's
+                              final board.
+
+    Returns:
+        list: One dict per variant, best first, with its rank, row, col,
+              rotation, state (the same end states as the GUI challenge,
+              including "Spaceship"), period, displacement (per period, for
+              a spaceship), initial_population, final_population,
+              stabilized_at (None if it did not settle) and generations run,
+              plus objects (name -> count) with count_objects.
+    """
+    if sort_by not in SORT_KEYS:
+        raise ValueError(f"Unknown sort key '{sort_by}'. Choose from: {', '.join(SORT_KEYS)}")
+    pattern = (np.asarray(pattern) != 0).astype(np.int8)
+    board = initialize_grid(DEFAULT_GRID_SIZE) if board is None else (np.asarray(board) != 0).astype(np.int8)
+    rule = format_rule(*parse_rule(rule))
+    variants = placement_variants(pattern, board.shape, positions, rotations, stride)
+    batches = [variants[i:i + batch_size] for i in range(0, len(variants), batch_size)]
+    workers = max(1, min(workers or os.cpu_count() or 1, len(batches)))
+    initargs = (board, pattern, wrap_edges, rule, max_generations, max_period, count_objects)
+
+    results = []
+    if workers == 1:
+        _init_worker(*initargs)
+        for batch in batches:
+            results.extend(_evaluate_batch(batch))
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=initargs) as pool:
+            for rows in pool.map(_evaluate_batch, batches):
+                results.extend(rows)
+
+    results.sort(key=lambda result: _sort_value(result, sort_by), reverse=True)
+    for rank, result in enumerate(results, start=1):
+        result["rank"] = rank
+    return results
+
+
+def format_table(results, limit=None):
+    """Returns the ranked results as a plain-text table."""
+    header = f"{'Rank':>5} {'Row':>5} {'Col':>5} {'Rot':>4} {'State':<12} {'Period':>6} {'Initial':>8} {'Final':>8} {'Settled':>8}"
+    with_objects = any("objects" in result for result in results)
+    if with_objects:
+        header += "  Objects"
+    lines = [header, "-" * len(header)]
+    for result in results[:limit]:
+        period = "" if result["period"] is None else result["period"]
+        settled = "-" if result["stabilized_at"] is None else result["stabilized_at"]
+        lines.append(f"{result['rank']:>5} {result['row']:>5} {result['col']:>5} {result['rotation'] * 90:>4} "
+                     f"{result['state']:<12} {period:>6} {result['initial_population']:>8} "
+                     f"{result['final_population']:>8} {settled:>8}")
+        if with_objects:
+            lines[-1] += "  " + format_census(Counter(result.get("objects", {})), limit=3)
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    """Command line entry point: evaluates every placement of a pattern and prints the ranking."""
+    parser = argparse.ArgumentParser(description="Rank placements of a pattern by how the run ends.")
+    seed = parser.add_mutually_exclusive_group(required=True)
+    seed.add_argument("--pattern", help="Name of a pattern from the pattern library")
+    seed.add_argument("--file", help="Pattern file (.rle, .cells, .lif, .mc, .npy or plaintext grid)")
+    parser.add_argument("--board", default=None, help="File with the board to place the pattern on (default: empty)")
+    parser.add_argument("--size", type=int, default=DEFAULT_GRID_SIZE, help="Side length of the empty board (default: %(default)s)")
+    parser.add_argument("--stride", type=int, default=DEFAULT_STRIDE, help="Cells between tried positions (default: %(default)s)")
+    parser.add_argument("--rotations", default="0,1,2,3", help="Comma-separated quarter turns to try (default: %(default)s)")
+    parser.add_argument("--generations", type=int, default=DEFAULT_MAX_GENERATIONS, help="Maximum generations (default: %(default)s)")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: all cores)")
+    parser.add_argument("--rule", default=CONWAY_RULE, help="Life-like rulestring (default: %(default)s)")
+    parser.add_argument("--no-wrap", action="store_true", help="Treat edges as dead cells instead of wrapping")
+    parser.add_argument("--sort", choices=SORT_KEYS, default="final_population")
+    parser.add_argument("--top", type=int, default=20, help="Rows of the table to print (default: %(default)s)")
+    parser.add_argument("--census", action="store_true", help="Count the objects on each final board")
+    parser.add_argument("--json", action="store_true", help="Print every result as JSON")
+    args = parser.parse_args(argv)
+
+    if args.pattern:
+        pattern = default_library().get(args.pattern)
+        if pattern is None:
+            parser.error(f"Unknown pattern '{args.pattern}'")
+    else:
+        pattern = load_grid_file(args.file)
+    board = load_grid_file(args.board) if args.board else initialize_grid(args.size)
+    try:
+        parse_rule(args.rule)
+        rotations = [int(k) % 4 for k in args.rotations.split(",")]
+    except ValueError as e:
+        parser.error(str(e))
+
+    start = time.perf_counter()
+    results = evaluate_placements(pattern, board, rotations=rotations, stride=args.stride, wrap_edges=not args.no_wrap,
+                                  rule=args.rule, max_generations=args.generations, workers=args.workers,
+                                  sort_by=args.sort, count_objects=args.census)
+    elapsed = time.perf_counter() - start
+
+    if args.json:
+        print(json.dumps({"elapsed_s": elapsed, "results": results}, indent=2))
+    else:
+        print(format_table(results, args.top))
+        rate = len(results) / elapsed if elapsed > 0 else 0.0
+        print(f"\n{len(results)} placements in {elapsed:.2f} s ({rate:.0f}/s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
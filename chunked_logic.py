@@ -0,0 +1,195 @@
+import numpy as np
+
+from game_logic import CONWAY_RULE, parse_rule, rule_table
+
+# Unbounded board stored as a dictionary of fixed-size chunks.
+# The plane is cut into CHUNK_SIZE x CHUNK_SIZE squares; only squares holding
+# live cells have an array, so memory follows the live area rather than the
+# bounding box (a glider stream from a gun costs one chunk per glider, not the
+# whole rectangle it sweeps). Each generation, every live chunk and every
+# empty chunk next to a live edge is stepped at once: the chunks are stacked
+# into one (n, CHUNK_SIZE + 2, CHUNK_SIZE + 2) array whose one-cell halo is
+# copied from the edges of the neighbouring chunks, and chunks that end up
+# empty are dropped.
+
+CHUNK_SIZE = 64
+
+# (d_row, d_col) of the eight neighbouring chunks
+_DIRECTIONS = ((-1, -1), (-1, 0), (-1, 1), (0, -1), (0, 1), (1, -1), (1, 0), (1, 1))
+
+
+class ChunkedBoard:
+    """
+    Game of Life on an unbounded plane of lazily allocated chunks.
+
+    Cell coordinates are (row, col) and may be negative.
+
+    Args:
+        grid (np.ndarray): Optional initial 2D array of 0/1 cells.
+        origin (tuple): (row, col) plane coordinate of grid[0, 0].
+        chunk_size (int): Side length of a chunk in cells.
+        rule (str): Life-like rulestring (see game_logic.parse_rule). Rules
+                    with birth on 0 neighbors (B0) are not supported, since
+                    they would switch on the whole infinite plane.
+    """
+
+    def __init__(self, grid=None, origin=(0, 0), chunk_size=CHUNK_SIZE, rule=CONWAY_RULE):
+        self.set_rule(rule)
+        self.chunk_size = chunk_size
+        self.chunks = {} # (chunk_row, chunk_col) -> chunk_size x chunk_size int8 array
+        self.population = 0
+        self.generation = 0
+        if grid is not None:
+            self.paste(grid, *origin)
+
+    def set_rule(self, rule):
+        """Switches to another Life-like rule (B0 rules raise ValueError)."""
+        birth, _ = parse_rule(rule)
+        if 0 in birth:
+            raise ValueError("An unbounded board does not support B0 rules")
+        self.rule = rule
+        self._table = rule_table(rule)
+
+    @property
+    def memory_bytes(self):
+        """Bytes used by the allocated chunks."""
+        return len(self.chunks) * self.chunk_size * self.chunk_size
+
+    # --- Editing and export ---
+
+    def _chunk_range(self, start, stop):
+        """Chunk indices covering plane coordinates [start, stop)."""
+        return range(start // self.chunk_size, (stop - 1) // self.chunk_size + 1)
+
+    def paste(self, pattern, row, col):
+        """
+        Overwrites the rectangle starting at (row, col) with `pattern`, dead
+        cells included (like placing a pattern in the GUI).
+        """
+        pattern = np.asarray(pattern) != 0
+        height, width = pattern.shape
+        if height == 0 or width == 0: return
+        cs = self.chunk_size
+        for cy in self._chunk_range(row, row + height):
+            for cx in self._chunk_range(col, col + width):
+                # Overlap of the pattern and this chunk, in plane coordinates
+                r0, r1 = max(row, cy * cs), min(row + height, (cy + 1) * cs)
+                c0, c1 = max(col, cx * cs), min(col + width, (cx + 1) * cs)
+                piece = pattern[r0 - row:r1 - row, c0 - col:c1 - col]
+                chunk = self.chunks.get((cy, cx))
+                if chunk is None:
+                    if not piece.any(): continue
+                    chunk = self.chunks[(cy, cx)] = np.zeros((cs, cs), dtype=np.int8)
+                target = chunk[r0 - cy * cs:r1 - cy * cs, c0 - cx * cs:c1 - cx * cs]
+                self.population += int(piece.sum()) - int(np.count_nonzero(target))
+                target[:] = piece
+                if not chunk.any():
+                    del self.chunks[(cy, cx)]
+
+    def get_grid(self, shape, origin=(0, 0)):
+        """
+        Exports a window of the plane as a dense int8 grid.
+
+        Args:
+            shape (tuple): (rows, cols) of the returned grid.
+            origin (tuple): (row, col) plane coordinate of the grid's top-left cell.
+        """
+        out = np.zeros(shape, dtype=np.int8)
+        row, col = origin
+        cs = self.chunk_size
+        for (cy, cx), chunk in self.chunks.items():
+            r0, r1 = max(row, cy * cs), min(row + shape[0], (cy + 1) * cs)
+            c0, c1 = max(col, cx * cs), min(col + shape[1], (cx + 1) * cs)
+            if r0 < r1 and c0 < c1:
+                out[r0 - row:r1 - row, c0 - col:c1 - col] = chunk[r0 - cy * cs:r1 - cy * cs, c0 - cx * cs:c1 - cx * cs]
+        return out
+
+    def live_cells(self):
+        """Returns (rows, cols) int64 arrays of all live cells."""
+        if not self.chunks:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+        keys = np.array(list(self.chunks), dtype=np.int64)
+        index, rows, cols = np.nonzero(np.stack(list(self.chunks.values())))
+        return keys[index, 0] * self.chunk_size + rows, keys[index, 1] * self.chunk_size + cols
+
+    def bounding_box(self):
+        """
+        Returns (min_row, min_col, max_row, max_col) of the live cells
+        (inclusive), or None if the plane is empty.
+        """
+        rows, cols = self.live_cells()
+        if len(rows) == 0: return None
+        return int(rows.min()), int(cols.min()), int(rows.max()), int(cols.max())
+
+    # --- Stepping ---
+
+    def step(self, generations=1):
+        """
+        Advances the board.
+
+        Returns:
+            int: Number of cells that changed in the last generation.
+        """
+        changed = 0
+        for _ in range(generations):
+            changed = self._step_once()
+        return changed
+
+    def _step_once(self):
+        self.generation += 1
+        if not self.chunks:
+            return 0
+        cs = self.chunk_size
+        keys = list(self.chunks)
+        live = np.stack(list(self.chunks.values()))
+        live_index = {key: i for i, key in enumerate(keys)}
+        empty = len(keys) # Index of an all-dead chunk appended to `live`
+
+        # Empty chunks next to a live edge (or corner) can get births
+        facing = {
+            (-1, -1): live[:, 0, 0] != 0, (-1, 0): live[:, 0, :].any(axis=1), (-1, 1): live[:, 0, -1] != 0,
+            (0, -1): live[:, :, 0].any(axis=1), (0, 1): live[:, :, -1].any(axis=1),
+            (1, -1): live[:, -1, 0] != 0, (1, 0): live[:, -1, :].any(axis=1), (1, 1): live[:, -1, -1] != 0,
+        }
+        candidates = list(keys)
+        seen = set(keys)
+        for (dy, dx), mask in facing.items():
+            for i in np.flatnonzero(mask):
+                key = (keys[i][0] + dy, keys[i][1] + dx)
+                if key not in seen:
+                    seen.add(key)
+                    candidates.append(key)
+
+        # Source chunk of every candidate and of its eight neighbours
+        neighbours = np.array([[live_index.get((cy + dy, cx + dx), empty) for dy, dx in _DIRECTIONS]
+                               for cy, cx in candidates], dtype=np.intp)
+        centre = np.array([live_index.get(key, empty) for key in candidates], dtype=np.intp)
+        source = np.concatenate((live, np.zeros((1, cs, cs), dtype=np.int8)))
+
+        # Halo exchange: each side of the padded block is the facing edge of a neighbour
+        padded = np.zeros((len(candidates), cs + 2, cs + 2), dtype=np.int8)
+        padded[:, 1:-1, 1:-1] = source[centre]
+        nw, n, ne, w, e, sw, s, se = neighbours.T
+        padded[:, 0, 0] = source[nw, -1, -1]
+        padded[:, 0, 1:-1] = source[n, -1, :]
+        padded[:, 0, -1] = source[ne, -1, 0]
+        padded[:, 1:-1, 0] = source[w, :, -1]
+        padded[:, 1:-1, -1] = source[e, :, 0]
+        padded[:, -1, 0] = source[sw, 0, -1]
+        padded[:, -1, 1:-1] = source[s, 0, :]
+        padded[:, -1, -1] = source[se, 0, 0]
+
+        neighbor_count = np.zeros((len(candidates), cs, cs), dtype=np.int8)
+        for dy in range(3):
+            for dx in range(3):
+                if dy != 1 or dx != 1:
+                    neighbor_count += padded[:, dy:dy + cs, dx:dx + cs]
+        current = padded[:, 1:-1, 1:-1]
+        new = self._table[current * 9 + neighbor_count]
+
+        changed = int(np.count_nonzero(new != current))
+        alive = new.any(axis=(1, 2))
+        kept = new[alive] # Compact copy, so dropped chunks free their memory
+        self.chunks = {key: kept[i] for i, key in enumerate(k for k, a in zip(candidates, alive) if a)}
+        self.population = int(kept.sum(dtype=np.int64))
+        return changed
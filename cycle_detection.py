@@ -0,0 +1,244 @@
+from collections import deque
+from math import gcd
+
+import numpy as np
+
+# Hash-based cycle detection.
+# Every cell index gets a pseudo-random 128-bit key (two uint64 halves derived
+# with splitmix64, so no per-cell table is stored). The hash of a board is the
+# XOR of the keys of its live cells (Zobrist hashing), which means it can be
+# updated from just the cells that flipped. Hashes are kept in a dict mapping
+# to the generation they were seen at, so a repeat is found in O(1) and gives
+# the exact period and pre-period of the cycle.
+#
+# Spaceships never repeat a board exactly, so a second, translation-invariant
+# hash is kept alongside: the sum over live cells of a**row * b**col (mod 2**64,
+# for two pairs of odd multipliers). Shifting every cell multiplies the sum by
+# a**drow * b**dcol, so multiplying by the inverse powers of the bounding box's
+# top-left corner gives the same value for every translate of a pattern. The
+# sum is updated from the births and deaths of each step and the bounding box
+# from per-row and per-column live-cell counts, so a generation costs time
+# proportional to the changes plus the board's side lengths.
+
+DEFAULT_MAX_HISTORY = 10000
+
+_SEEDS = (np.uint64(0x243F6A8885A308D3), np.uint64(0x13198A2E03707344))
+
+
+def _splitmix64(x):
+    """Vectorized splitmix64 finalizer over a uint64 array."""
+    x = x + np.uint64(0x9E3779B97F4A7C15)
+    x = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return x ^ (x >> np.uint64(31))
+
+
+def hash_cells(indices):
+    """
+    Returns the 128-bit Zobrist hash of a set of flat cell indices.
+
+    Args:
+        indices (np.ndarray): Flat (row * width + col) indices of live or
+                              flipped cells.
+
+    Returns:
+        tuple: Two Python ints (high, low halves of the hash).
+    """
+    indices = np.asarray(indices, dtype=np.uint64)
+    return tuple(int(np.bitwise_xor.reduce(_splitmix64(indices ^ seed))) for seed in _SEEDS)
+
+
+def hash_grid(grid):
+    """Returns the 128-bit Zobrist hash of a whole grid."""
+    return hash_cells(np.flatnonzero(grid))
+
+
+def _powers(base, count):
+    """Returns base**0 .. base**(count - 1) modulo 2**64 as a uint64 array."""
+    powers = np.full(count, base, dtype=np.uint64)
+    if count:
+        powers[0] = 1
+    return np.multiply.accumulate(powers)
+
+
+def _inverse(x):
+    """Multiplicative inverse of an odd number modulo 2**64 (Newton's iteration)."""
+    inverse = x
+    for _ in range(6): # Each round doubles the number of correct low bits
+        inverse = inverse * (2 - x * inverse) % (1 << 64)
+    return inverse
+
+
+# Odd multipliers of the translation-invariant hash: (row base, col base) per half
+_TRANSLATION_BASES = tuple(tuple(int(v) | 1 for v in _splitmix64(np.array([2 * i, 2 * i + 1], dtype=np.uint64) ^ seed))
+                           for i, seed in enumerate(_SEEDS))
+
+
+def translation_powers(shape):
+    """
+    Returns the tables of the translation-invariant hash for a board shape:
+    (row_powers, col_powers, row_inverses, col_inverses), each a (2, n)
+    uint64 array holding the powers of the row or column base of both hash
+    halves (or of their inverses) for every row or column index.
+    """
+    rows, cols = shape
+    return (np.stack([_powers(a, rows) for a, _ in _TRANSLATION_BASES]),
+            np.stack([_powers(b, cols) for _, b in _TRANSLATION_BASES]),
+            np.stack([_powers(_inverse(a), rows) for a, _ in _TRANSLATION_BASES]),
+            np.stack([_powers(_inverse(b), cols) for _, b in _TRANSLATION_BASES]))
+
+
+def describe_velocity(displacement, period):
+    """
+    Returns the speed and direction of a spaceship in the usual notation,
+    e.g. "c/4 diagonal" for the glider's (1, 1) every 4 generations.
+    """
+    steps = max(abs(displacement[0]), abs(displacement[1]))
+    if steps == 0 or not period:
+        return "stationary"
+    divisor = gcd(steps, period)
+    steps, period = steps // divisor, period // divisor
+    speed = ("c" if steps == 1 else f"{steps}c") + ("" if period == 1 else f"/{period}")
+    if displacement[0] == 0 or displacement[1] == 0:
+        direction = "orthogonal"
+    elif abs(displacement[0]) == abs(displacement[1]):
+        direction = "diagonal"
+    else:
+        direction = "oblique"
+    return f"{speed} {direction}"
+
+
+class CycleDetector:
+    """
+    Detects when a board returns to an earlier state, or to an earlier state
+    shifted by some (rows, cols) displacement (a spaceship).
+
+    Args:
+        shape (tuple): (rows, cols) of the board, used to flatten cell indices.
+        max_history (int): Number of past generations remembered. A cycle is
+                           found if its period is at most this long.
+    """
+
+    def __init__(self, shape, max_history=DEFAULT_MAX_HISTORY):
+        self.shape = tuple(shape)
+        self.max_history = max_history
+        self._row_powers, self._col_powers, self._row_inverses, self._col_inverses = translation_powers(self.shape)
+        self.clear()
+
+    def clear(self):
+        """Forgets all history; the next start() begins a new run."""
+        self.hash = None
+        self._seen = {}
+        self._order = deque()
+        self.period = None
+        self.pre_period = None
+        self.displacement = None
+        self.start_generation = None
+        self._shape_sum = None # Translation-invariant hash before normalization, (2,) uint64
+        self._row_counts = None
+        self._col_counts = None
+        self._shapes_seen = {} # Normalized hash -> (generation, top row, left col)
+        self._shape_order = deque()
+
+    @property
+    def moving(self):
+        """True if the recurrence found is a translated one (a spaceship)."""
+        return self.displacement is not None and self.displacement != (0, 0)
+
+    @property
+    def velocity(self):
+        """Cells per generation (rows, cols) of the spaceship found, or None."""
+        if not self.moving: return None
+        return (self.displacement[0] / self.period, self.displacement[1] / self.period)
+
+    @property
+    def started(self):
+        return self.hash is not None
+
+    def start(self, grid, generation=0):
+        """Hashes the full board once and records it as the first state."""
+        self.clear()
+        self.start_generation = generation
+        self.hash = hash_grid(grid)
+        rows, cols = np.nonzero(grid)
+        self._shape_sum = self._terms(rows, cols).sum(axis=1, dtype=np.uint64)
+        self._row_counts = np.bincount(rows, minlength=self.shape[0])
+        self._col_counts = np.bincount(cols, minlength=self.shape[1])
+        self._record(generation)
+        self._record_shape(generation)
+
+    def _terms(self, rows, cols):
+        return self._row_powers[:, rows] * self._col_powers[:, cols]
+
+    def _record(self, generation):
+        first_seen = self._seen.get(self.hash)
+        if first_seen is not None:
+            self.period = generation - first_seen
+            self.pre_period = first_seen - self.start_generation
+            self.displacement = (0, 0)
+            return True
+        self._seen[self.hash] = generation
+        self._order.append(self.hash)
+        if len(self._order) > self.max_history:
+            del self._seen[self._order.popleft()]
+        return False
+
+    def _record_shape(self, generation):
+        live_rows = np.flatnonzero(self._row_counts)
+        if len(live_rows) == 0: return False # An empty board has no position
+        top, left = int(live_rows[0]), int(np.flatnonzero(self._col_counts)[0])
+        normalized = self._shape_sum * self._row_inverses[:, top] * self._col_inverses[:, left]
+        key = (int(normalized[0]), int(normalized[1]))
+        first_seen = self._shapes_seen.get(key)
+        if first_seen is not None:
+            seen_generation, seen_top, seen_left = first_seen
+            rows, cols = self.shape
+            # Smallest displacement, in case the ship crossed a wrapped edge
+            shift = ((top - seen_top + rows // 2) % rows - rows // 2, (left - seen_left + cols // 2) % cols - cols // 2)
+            if shift != (0, 0): # A stationary repeat is an exact one, found by _record
+                self.period = generation - seen_generation
+                self.pre_period = seen_generation - self.start_generation
+                self.displacement = shift
+                return True
+        self._shapes_seen[key] = (generation, top, left)
+        self._shape_order.append((key, generation))
+        if len(self._shape_order) > self.max_history:
+            old, old_generation = self._shape_order.popleft()
+            if self._shapes_seen[old][0] == old_generation: # Not seen again since
+                del self._shapes_seen[old]
+        return False
+
+    def update(self, rows, cols, generation, alive=None):
+        """
+        Applies the cells that flipped in the last step and checks for a cycle.
+
+        Args:
+            rows, cols (np.ndarray): Coordinates of the cells that changed.
+            generation (int): The generation the board is now at.
+            alive (np.ndarray): New state of each changed cell (births are
+                                nonzero). Without it only exact repeats are
+                                detected, not spaceships.
+
+        Returns:
+            bool: True if this state was seen before, possibly shifted;
+                  `period`, `pre_period` (generations from start() until the
+                  cycle was entered) and `displacement` ((0, 0) for an
+                  oscillator, see `moving`) are then set.
+        """
+        rows = np.asarray(rows, dtype=np.int64)
+        cols = np.asarray(cols, dtype=np.int64)
+        flipped = rows * self.shape[1] + cols
+        high, low = hash_cells(flipped)
+        self.hash = (self.hash[0] ^ high, self.hash[1] ^ low)
+        if self._record(generation):
+            return True
+        if alive is None:
+            return False
+        born = np.asarray(alive) != 0
+        terms = self._terms(rows, cols)
+        # uint64 sums and differences wrap around modulo 2**64
+        self._shape_sum += terms[:, born].sum(axis=1, dtype=np.uint64) - terms[:, ~born].sum(axis=1, dtype=np.uint64)
+        sign = np.where(born, 1, -1)
+        self._row_counts += np.bincount(rows, weights=sign, minlength=self.shape[0]).astype(np.int64)
+        self._col_counts += np.bincount(cols, weights=sign, minlength=self.shape[1]).astype(np.int64)
+        return self._record_shape(generation)
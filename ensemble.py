@@ -0,0 +1,329 @@
+import argparse
+import json
+import sys
+import time
+from collections import Counter
+
+import numpy as np
+
+from cycle_detection import translation_powers
+from game_logic import CONWAY_RULE, StepScratch, format_rule, pad_into, parse_rule, step_padded
+
+# Batched soup search.
+# Many small independent boards are stacked into one (batch, rows, cols) array
+# and stepped together with game_logic.step_padded, a chunk of boards per
+# vectorized call. After every generation each board gets a 128-bit hash (two
+# random linear combinations of its bit-packed words), which is compared with a
+# ring of the board's last `max_period` hashes: a match at lag 1 means the
+# board is still, a longer lag is the period of an oscillation. Finished boards
+# keep their results and are compacted out of the batch once enough of them
+# have accumulated, so the remaining work only covers boards still running.
+#
+# Spaceships (a board that repeats shifted) are found the same way as in
+# cycle_detection.CycleDetector: each board also gets the translation-invariant
+# hash (sum over live cells of a**row * b**col, two uint64 halves, computed as
+# two matrix products per chunk) normalized by its bounding box's top-left
+# corner, and a ring of those hashes and corners is compared at every lag.
+#
+#     python -m ensemble --count 10000 --size 64 --generations 2000
+
+DEFAULT_MAX_PERIOD = 64 # Longest oscillation period detected
+DEFAULT_CHUNK_CELLS = 1 << 22 # Cells stepped per vectorized call (bounds scratch memory)
+COMPACT_FRACTION = 0.25 # Compact the batch when this share of it has finished
+SEED = 12345
+
+RUNNING, DEAD, STABLE, OSCILLATING, SPACESHIP = 0, 1, 2, 3, 4
+STATE_NAMES = ("Running", "Dead", "Stable", "Oscillating", "Spaceship") # Same names as simulation.Simulation.state
+
+
+def random_soups(count, shape, density=0.35, seed=SEED):
+    """Returns a reproducible (count, rows, cols) int8 stack of random soups."""
+    rng = np.random.default_rng(seed)
+    return (rng.random((count, *shape)) < density).astype(np.int8)
+
+
+class Ensemble:
+    """
+    Evolves a batch of independent boards of the same size in lockstep.
+
+    Args:
+        boards (np.ndarray): (batch, rows, cols) array of 0/1 cells (copied).
+        wrap_edges (bool): If True, edges of each board wrap around.
+        rule (str): Life-like rulestring (see game_logic.parse_rule).
+        max_period (int): Longest oscillation period detected; boards with
+                          longer periods keep running.
+        chunk_boards (int): Boards stepped per vectorized call (default:
+                            about DEFAULT_CHUNK_CELLS cells).
+        keep_final (bool): If True, keep each board as it was when its end
+                           state was detected (see `final_boards`).
+        detect_spaceships (bool): If True (default), boards that repeat
+                                  shifted end as SPACESHIP; otherwise they
+                                  keep running (somewhat faster stepping).
+
+    Per-board results are arrays indexed by the board's position in `boards`:
+    `state` (RUNNING, DEAD, STABLE, OSCILLATING or SPACESHIP), `period` (1 for
+    still boards), `displacement` ((rows, cols) moved per period by a
+    spaceship), `end_generation` (generation the end state was detected),
+    `population` (final or current) and `initial_population`.
+    """
+
+    def __init__(self, boards, wrap_edges=True, rule=CONWAY_RULE, max_period=DEFAULT_MAX_PERIOD, chunk_boards=None,
+                 keep_final=False, detect_spaceships=True):
+        boards = np.asarray(boards)
+        if boards.ndim != 3:
+            raise ValueError(f"Expected a (batch, rows, cols) array, got shape {boards.shape}")
+        count, rows, cols = boards.shape
+        self.count = count
+        self.board_shape = (rows, cols)
+        self.wrap_edges = wrap_edges
+        self.rule = format_rule(*parse_rule(rule))
+        self.max_period = max_period
+        self.generation = 0
+
+        self.state = np.full(count, RUNNING, dtype=np.int8)
+        self.period = np.zeros(count, dtype=np.int32)
+        self.displacement = np.zeros((count, 2), dtype=np.int64)
+        self.end_generation = np.full(count, -1, dtype=np.int64)
+        self._boards = (boards != 0).astype(np.int8)
+        self.population = np.count_nonzero(self._boards.reshape(count, -1), axis=1)
+        self.initial_population = self.population.copy()
+        self._final = np.empty_like(self._boards) if keep_final else None
+
+        # Active batch: rows of _boards are the boards in _ids; _done marks
+        # rows that finished since the last compaction
+        self._spare = np.empty_like(self._boards)
+        self._ids = np.arange(count)
+        self._done = np.zeros(count, dtype=bool)
+        self.chunk_boards = max(1, min(count, chunk_boards or DEFAULT_CHUNK_CELLS // max(1, rows * cols)))
+        self._scratch = StepScratch((self.chunk_boards, rows, cols))
+
+        words = -(-rows * cols // 64)
+        self._pad_bytes = words * 8 - -(-rows * cols // 8) # Packed bytes missing from whole 64-bit words
+        rng = np.random.default_rng(SEED)
+        self._keys = rng.integers(0, 2 ** 63, size=(2, words), dtype=np.uint64) | np.uint64(1)
+        self._history = np.zeros((count, max_period, 2), dtype=np.uint64) # Ring indexed by generation % max_period
+        self._history[:, 0] = self._hash(self._boards)
+        self.detect_spaceships = detect_spaceships
+        if detect_spaceships:
+            self._row_powers, self._col_powers, self._row_inverses, self._col_inverses = translation_powers((rows, cols))
+            self._shape_history = np.zeros((count, max_period, 2), dtype=np.uint64) # Normalized hashes, same ring
+            self._corner_history = np.zeros((count, max_period, 2), dtype=np.int64) # Bounding-box top-left corners
+            self._shape_history[:, 0], self._corner_history[:, 0] = self._shape_hash(self._boards)
+
+    @property
+    def active(self):
+        """Number of boards still running."""
+        return int(np.count_nonzero(~self._done))
+
+    def _hash(self, boards):
+        """Returns a (n, 2) uint64 array of 128-bit board hashes."""
+        packed = np.packbits(boards.reshape(len(boards), -1), axis=1)
+        if self._pad_bytes:
+            packed = np.concatenate((packed, np.zeros((len(boards), self._pad_bytes), dtype=np.uint8)), axis=1)
+        words = packed.view(np.uint64)
+        # uint64 products and sums wrap around modulo 2**64
+        return np.stack(((words * self._keys[0]).sum(axis=1, dtype=np.uint64),
+                         (words * self._keys[1]).sum(axis=1, dtype=np.uint64)), axis=1)
+
+    def _shape_hash(self, boards):
+        """
+        Returns the translation-invariant hashes ((n, 2) uint64) and the
+        bounding-box top-left corners ((n, 2) int64) of a stack of boards.
+        Empty boards get corner (0, 0).
+        """
+        n = len(boards)
+        hashes = np.empty((n, 2), dtype=np.uint64)
+        for start in range(0, n, self.chunk_boards):
+            chunk = boards[start:start + self.chunk_boards].astype(np.uint64)
+            # uint64 products and sums wrap around modulo 2**64
+            row_sums = chunk @ self._col_powers.T # (chunk, rows, 2)
+            hashes[start:start + len(chunk)] = (row_sums * self._row_powers.T).sum(axis=1, dtype=np.uint64)
+        live = boards.view(bool)
+        corners = np.stack((live.any(axis=2).argmax(axis=1), live.any(axis=1).argmax(axis=1)), axis=1)
+        hashes *= self._row_inverses.T[corners[:, 0]]
+        hashes *= self._col_inverses.T[corners[:, 1]]
+        return hashes, corners
+
+    def step(self):
+        """
+        Advances every running board by one generation and records the boards
+        that reached an end state.
+
+        Returns:
+            int: Number of boards still running.
+        """
+        boards, spare = self._boards, self._spare
+        n = len(boards)
+        if n == 0:
+            return 0
+        chunk = self.chunk_boards
+        scratch = self._scratch
+        for start in range(0, n, chunk):
+            end = min(n, start + chunk)
+            padded = scratch.padded[:end - start]
+            pad_into(padded, boards[start:end], self.wrap_edges)
+            step_padded(padded, spare[start:end], scratch.index[:end - start], self.rule)
+        self._boards, self._spare = spare, boards
+        self.generation += 1
+        generation = self.generation
+
+        population = np.count_nonzero(self._boards.reshape(n, -1), axis=1)
+        hashes = self._hash(self._boards)
+        # Lag of the generation held in each ring slot; slots not yet written are invalid
+        period = self.max_period
+        lags = (generation - np.arange(period) - 1) % period + 1
+        matches = (self._history == hashes[:, None, :]).all(axis=2) & (lags <= generation)
+        first_lag = np.where(matches, lags, period + 1).min(axis=1)
+        self._history[:, generation % period] = hashes
+
+        running = ~self._done
+        dead = running & (population == 0)
+        repeated = running & ~dead & (first_lag <= period)
+        moving = np.zeros(n, dtype=bool)
+        if self.detect_spaceships:
+            shapes, corners = self._shape_hash(self._boards)
+            candidates = running & ~dead & ~repeated
+            matches = (self._shape_history == shapes[:, None, :]).all(axis=2) & (lags <= generation) & candidates[:, None]
+            self._shape_history[:, generation % period] = shapes
+            board, slot = np.nonzero(matches) # Few pairs: same shape at an earlier generation
+            rows, cols = self.board_shape
+            # Smallest shift of the corner, in case a ship crossed a wrapped edge
+            shifts = corners[board] - self._corner_history[board, slot]
+            shifts[:, 0] = (shifts[:, 0] + rows // 2) % rows - rows // 2
+            shifts[:, 1] = (shifts[:, 1] + cols // 2) % cols - cols // 2
+            self._corner_history[:, generation % period] = corners
+            shifted = shifts.any(axis=1) # A stationary repeat is an exact one
+            board, lag, shifts = board[shifted], lags[slot[shifted]], shifts[shifted]
+            order = np.argsort(lag, kind="stable")
+            board, first = np.unique(board[order], return_index=True) # Shortest lag per board
+            ship_ids = self._ids[board]
+            self.state[ship_ids] = SPACESHIP
+            self.period[ship_ids] = lag[order][first]
+            self.displacement[ship_ids] = shifts[order][first]
+            moving[board] = True
+        finished = dead | repeated | moving
+        ids = self._ids[finished]
+        self.state[self._ids[dead]] = DEAD
+        self.state[self._ids[repeated]] = np.where(first_lag[repeated] == 1, STABLE, OSCILLATING)
+        self.period[self._ids[repeated]] = first_lag[repeated]
+        self.end_generation[ids] = generation
+        if self._final is not None:
+            self._final[ids] = self._boards[finished]
+        self.population[self._ids[running]] = population[running]
+        self._done |= finished
+
+        done = int(np.count_nonzero(self._done))
+        if done and done >= COMPACT_FRACTION * n:
+            self._compact()
+        return self.active
+
+    def _compact(self):
+        """Drops finished boards from the batch."""
+        keep = ~self._done
+        self._boards = self._boards[keep]
+        self._spare = np.empty_like(self._boards)
+        self._ids = self._ids[keep]
+        self._history = self._history[keep]
+        if self.detect_spaceships:
+            self._shape_history = self._shape_history[keep]
+            self._corner_history = self._corner_history[keep]
+        self._done = np.zeros(len(self._ids), dtype=bool)
+
+    def run(self, max_generations=None):
+        """
+        Steps until every board finished or `max_generations` generations were made.
+
+        Returns:
+            dict: Per-board result arrays (see `results`).
+        """
+        while self.active and (max_generations is None or self.generation < max_generations):
+            self.step()
+        return self.results()
+
+    def results(self):
+        """
+        Returns per-board result arrays: state codes, period, displacement,
+        end_generation (-1 while running), stabilized_at (first generation of
+        the final still, oscillating or moving state, or the generation it
+        died), population and initial_population.
+        """
+        cycling = (self.state == OSCILLATING) | (self.state == SPACESHIP)
+        stabilized = np.where(cycling, self.end_generation - self.period,
+                              np.where(self.state == STABLE, self.end_generation - 1, self.end_generation))
+        return {
+            "state": self.state.copy(),
+            "period": self.period.copy(),
+            "displacement": self.displacement.copy(),
+            "end_generation": self.end_generation.copy(),
+            "stabilized_at": stabilized,
+            "population": self.population.copy(),
+            "initial_population": self.initial_population.copy(),
+        }
+
+    def final_boards(self):
+        """
+        Returns the (batch, rows, cols) boards as they were when their end
+        state was detected, and as they are now for boards still running.
+        Requires keep_final=True.
+        """
+        if self._final is None:
+            raise ValueError("Final boards are only kept with keep_final=True")
+        running = ~self._done
+        self._final[self._ids[running]] = self._boards[running]
+        return self._final.copy()
+
+    def summary(self):
+        """Returns a JSON-serializable summary: boards per end state and per oscillation period."""
+        counts = np.bincount(self.state, minlength=len(STATE_NAMES))
+        periods = Counter(int(p) for p in self.period[self.state == OSCILLATING])
+        ended = self.state != RUNNING
+        return {
+            "boards": self.count,
+            "board_shape": list(self.board_shape),
+            "rule": self.rule,
+            "wrap_edges": self.wrap_edges,
+            "generations": self.generation,
+            "states": {name: int(counts[code]) for code, name in enumerate(STATE_NAMES)},
+            "periods": {str(p): n for p, n in sorted(periods.items())},
+            "mean_end_generation": float(self.end_generation[ended].mean()) if ended.any() else None,
+            "mean_final_population": float(self.population.mean()) if self.count else None,
+        }
+
+
+def main(argv=None):
+    """Command line entry point: evolves a batch of random soups and prints how they ended."""
+    parser = argparse.ArgumentParser(description="Evolve many random soups at once and classify how they end.")
+    parser.add_argument("--count", type=int, default=1000, help="Number of soups (default: %(default)s)")
+    parser.add_argument("--size", type=int, default=64, help="Side length of each soup's board (default: %(default)s)")
+    parser.add_argument("--density", type=float, default=0.35, help="Initial live-cell density (default: %(default)s)")
+    parser.add_argument("--seed", type=int, default=SEED)
+    parser.add_argument("--generations", type=int, default=2000, help="Maximum generations (default: %(default)s)")
+    parser.add_argument("--max-period", type=int, default=DEFAULT_MAX_PERIOD,
+                        help="Longest oscillation period detected (default: %(default)s)")
+    parser.add_argument("--rule", default=CONWAY_RULE, help="Life-like rulestring (default: %(default)s)")
+    parser.add_argument("--no-wrap", action="store_true", help="Treat edges as dead cells instead of wrapping")
+    parser.add_argument("--json", action="store_true", help="Print the summary as JSON")
+    args = parser.parse_args(argv)
+    try:
+        parse_rule(args.rule)
+    except ValueError as e:
+        parser.error(str(e))
+
+    soups = random_soups(args.count, (args.size, args.size), args.density, args.seed)
+    ensemble = Ensemble(soups, wrap_edges=not args.no_wrap, rule=args.rule, max_period=args.max_period)
+    start = time.perf_counter()
+    ensemble.run(args.generations)
+    elapsed = time.perf_counter() - start
+    summary = ensemble.summary()
+    summary["elapsed_s"] = elapsed
+
+    if args.json:
+        print(json.dumps(summary, indent=2))
+    else:
+        for key, value in summary.items():
+            print(f"{key}: {value}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,45 +1,265 @@
+import re
+from functools import lru_cache
+
 import numpy as np
 from scipy.signal import convolve2d
 
+# --- Rules ---
+# Life-like rules are written as rulestrings, e.g. "B3/S23" (born with 3
+# neighbors, survives with 2 or 3). A rule is compiled into an 18-entry lookup
+# table indexed by state * 9 + neighbor_count, so applying any rule to the
+# whole grid is a single vectorized gather.
+CONWAY_RULE = "B3/S23"
+RULE_PRESETS = {
+    "Conway's Life": "B3/S23",
+    "HighLife": "B36/S23",
+    "Day & Night": "B3678/S34678",
+    "Seeds": "B2/S",
+}
+
+_RULESTRING_RE = re.compile(r"^B([0-8]*)/S([0-8]*)$", re.IGNORECASE)
+_SWAPPED_RULESTRING_RE = re.compile(r"^S([0-8]*)/B([0-8]*)$", re.IGNORECASE)
+_SB_RULESTRING_RE = re.compile(r"^([0-8]*)/([0-8]*)$") # Classic "S/B" notation, e.g. "23/3"
+
+def parse_rule(rulestring):
+    """
+    Parses a Life-like rulestring.
+
+    Accepts "B3/S23" notation (case-insensitive, optionally "S23/B3") and the
+    classic "23/3" survival/birth notation.
+
+    Returns:
+        tuple: (birth, survival) as frozensets of neighbor counts.
+
+    Raises:
+        ValueError: If the rulestring is not valid.
+    """
+    text = rulestring.strip().replace(" ", "")
+    match = _RULESTRING_RE.match(text)
+    if match:
+        birth, survival = match.groups()
+    else:
+        swapped = _SWAPPED_RULESTRING_RE.match(text)
+        classic = _SB_RULESTRING_RE.match(text)
+        if swapped:
+            survival, birth = swapped.groups()
+        elif classic:
+            survival, birth = classic.groups()
+        else:
+            raise ValueError(f"Invalid rulestring '{rulestring}'. Expected a form like 'B3/S23'.")
+    return frozenset(int(n) for n in birth), frozenset(int(n) for n in survival)
+
+def format_rule(birth, survival):
+    """Returns the canonical "B.../S..." rulestring for birth and survival counts."""
+    return "B" + "".join(str(n) for n in sorted(birth)) + "/S" + "".join(str(n) for n in sorted(survival))
+
+@lru_cache(maxsize=None)
+def _compile_rule(rulestring):
+    birth, survival = parse_rule(rulestring)
+    table = np.zeros(18, dtype=np.int8)
+    table[list(birth)] = 1
+    table[[9 + n for n in survival]] = 1
+    table.flags.writeable = False
+    return table
+
+def rule_table(rule=CONWAY_RULE):
+    """
+    Returns the 18-entry lookup table for a rule.
+
+    Args:
+        rule (str or np.ndarray): A rulestring, or an already compiled table.
+
+    Returns:
+        np.ndarray: int8 table where table[state * 9 + neighbors] is the next state.
+    """
+    if isinstance(rule, np.ndarray):
+        return rule
+    return _compile_rule(rule)
+
 def initialize_grid(size):
     """Initializes a grid of the given size with zeros."""
     return np.zeros((size, size), dtype=np.int8)
 
-def update_grid_logic(grid, wrap_edges=True):
+# Kernel to count neighbors
+_KERNEL = np.array([[1, 1, 1],
+                    [1, 0, 1],
+                    [1, 1, 1]], dtype=np.int8)
+_KERNEL.flags.writeable = False
+
+def update_grid_logic(grid, wrap_edges=True, rule=CONWAY_RULE):
     """
-    Updates the grid based on Conway's Game of Life rules.
+    Updates the grid based on a Life-like rule (Conway's rules by default).
 
     Args:
         grid (np.ndarray): The current state of the grid.
         wrap_edges (bool): If True, edges wrap around (toroidal array).
                            If False, edges are treated as dead cells.
+        rule (str or np.ndarray): Rulestring such as "B36/S23", or a table
+                                  from rule_table().
 
     Returns:
         np.ndarray: The next state of the grid.
     """
-    size = grid.shape[0]
-    # Kernel to count neighbors
-    kernel = np.array([[1, 1, 1],
-                       [1, 0, 1],
-                       [1, 1, 1]], dtype=np.int8)
-
     # Determine boundary condition for convolution based on wrap_edges
     boundary_condition = 'wrap' if wrap_edges else 'fill'
 
     # Calculate the number of live neighbors for each cell
-    neighbor_count = convolve2d(grid, kernel, mode='same', boundary=boundary_condition, fillvalue=0)
-
-    # Apply Conway's rules:
-    # 1. A living cell with 2 or 3 live neighbors survives.
-    # 2. A dead cell with exactly 3 live neighbors becomes a live cell.
-    # 3. All other live cells die in the next generation. Similarly, all other dead cells stay dead.
-    new_grid = np.where(
-        (grid == 1) & ((neighbor_count == 2) | (neighbor_count == 3)) |
-        (grid == 0) & (neighbor_count == 3),
-        1,  # Cell becomes/stays alive
-        0   # Cell becomes/stays dead
-    ).astype(np.int8)
+    neighbor_count = convolve2d(grid, _KERNEL, mode='same', boundary=boundary_condition, fillvalue=0)
+
+    # Apply the rule as one lookup: the table holds the next state for every
+    # (state, neighbor count) pair, e.g. for Conway's rules a live cell with 2
+    # or 3 neighbors survives and a dead cell with exactly 3 becomes alive.
+    new_grid = rule_table(rule)[grid * 9 + neighbor_count]
 
     return new_grid
 
+# --- Allocation-free stepping ---
+# update_grid_into writes the next generation into a caller-owned array using
+# preallocated scratch buffers: the board is copied into a padded array with a
+# one-cell halo, the eight shifted views of it are summed with `out=` ufuncs,
+# and the rule is applied by shifting an 18-bit mask (bit state * 9 + count
+# holds the next state). Callers ping-pong two boards, so a steady-state step
+# allocates no arrays.
+
+# Offsets (d_row, d_col) of the eight neighbors inside a padded board
+_NEIGHBOR_OFFSETS = ((0, 0), (0, 1), (0, 2), (1, 0), (1, 2), (2, 0), (2, 1), (2, 2))
+
+@lru_cache(maxsize=None)
+def _compile_mask(rulestring):
+    return sum(int(v) << i for i, v in enumerate(_compile_rule(rulestring)))
+
+def rule_mask(rule=CONWAY_RULE):
+    """Returns a rule's lookup table as an int whose bit `state * 9 + neighbors` is the next state."""
+    if isinstance(rule, np.ndarray):
+        return sum(int(v) << i for i, v in enumerate(rule))
+    return _compile_mask(rule)
+
+class StepScratch:
+    """
+    Work arrays for update_grid_into, allocated once per board shape.
+
+    Args:
+        shape (tuple): (rows, cols) of the boards that will be stepped, or
+                       (batch, rows, cols) for a stack of boards.
+    """
+    def __init__(self, shape):
+        self.shape = tuple(shape)
+        *batch, rows, cols = self.shape
+        self.padded = np.zeros((*batch, rows + 2, cols + 2), dtype=np.int8) # Board(s) with a one-cell halo
+        self.index = np.empty(self.shape, dtype=np.int32) # state * 9 + neighbors, then the next state
+
+def pad_into(padded, grid, wrap_edges=True):
+    """
+    Copies `grid` into the interior of `padded` (two cells larger in its last
+    two dimensions) and fills the halo. Leading dimensions are a batch of boards.
+    """
+    rows, cols = grid.shape[-2:]
+    padded[..., 1:rows + 1, 1:cols + 1] = grid
+    if wrap_edges:
+        padded[..., 0, 1:cols + 1] = grid[..., -1, :]
+        padded[..., rows + 1, 1:cols + 1] = grid[..., 0, :]
+        padded[..., 0] = padded[..., cols]
+        padded[..., cols + 1] = padded[..., 1]
+    else:
+        padded[..., 0, :] = 0
+        padded[..., rows + 1, :] = 0
+        padded[..., 0] = 0
+        padded[..., cols + 1] = 0
+
+def step_padded(padded, out, index, rule=CONWAY_RULE):
+    """
+    Computes the next state of the interior of a padded board into `out`.
+
+    Args:
+        padded (np.ndarray): int8 (..., rows + 2, cols + 2) board(s) whose halo is filled.
+        out (np.ndarray): (..., rows, cols) array receiving the next state.
+        index (np.ndarray): int32 scratch array shaped like `out`.
+        rule (str or np.ndarray): Rulestring or table from rule_table().
+    """
+    rows, cols = out.shape[-2:]
+    (r0, c0), (r1, c1) = _NEIGHBOR_OFFSETS[:2]
+    np.add(padded[..., r0:r0 + rows, c0:c0 + cols], padded[..., r1:r1 + rows, c1:c1 + cols], out=index, dtype=np.int32)
+    for dr, dc in _NEIGHBOR_OFFSETS[2:]:
+        np.add(index, padded[..., dr:dr + rows, dc:dc + cols], out=index)
+    # Cells are 0/1, so the interior viewed as bool selects the live ones
+    np.add(index, 9, out=index, where=padded[..., 1:rows + 1, 1:cols + 1].view(bool))
+    np.right_shift(rule_mask(rule), index, out=index)
+    np.bitwise_and(index, 1, out=index)
+    np.copyto(out, index, casting="unsafe")
+
+def update_grid_into(grid, out, scratch=None, wrap_edges=True, rule=CONWAY_RULE):
+    """
+    Computes the next generation of `grid` into `out` without allocating arrays.
+
+    Gives the same result as update_grid_logic.
+
+    Args:
+        grid (np.ndarray): The current state of the grid (0/1 cells).
+        out (np.ndarray): Array of the same shape receiving the next state
+                          (must not be `grid`).
+        scratch (StepScratch): Work arrays for this shape (allocated if None).
+        wrap_edges (bool): If True, edges wrap around (toroidal array).
+        rule (str or np.ndarray): Rulestring or table from rule_table().
+
+    Returns:
+        np.ndarray: `out`.
+    """
+    if scratch is None or scratch.shape != grid.shape:
+        scratch = StepScratch(grid.shape)
+    pad_into(scratch.padded, grid, wrap_edges)
+    step_padded(scratch.padded, out, scratch.index, rule)
+    return out
+
+def _placement_spans(start, length, size, wrap_edges):
+    """(board_start, board_stop, pattern_start) runs of one axis of a pattern placed at `start`."""
+    if not wrap_edges:
+        lo, hi = max(0, start), min(size, start + length)
+        return [(lo, hi, lo - start)] if lo < hi else []
+    length = min(length, size) # Cells beyond one full turn around the board would overlap
+    begin = start % size
+    first = min(length, size - begin)
+    spans = [(begin, begin + first, 0)]
+    if first < length:
+        spans.append((0, length - first, first))
+    return spans
+
+def placement_rects(shape, pattern_shape, row, col, wrap_edges=False):
+    """
+    Splits a pattern placed with its top-left corner at (row, col) into the
+    board rectangles it covers: one clipped rectangle, or up to four when it
+    wraps around the edges.
+
+    Returns:
+        list: (row0, col0, row1, col1, pattern_row, pattern_col) tuples.
+    """
+    return [(r0, c0, r1, c1, pr, pc)
+            for r0, r1, pr in _placement_spans(row, pattern_shape[0], shape[0], wrap_edges)
+            for c0, c1, pc in _placement_spans(col, pattern_shape[1], shape[1], wrap_edges)]
+
+def paste_pattern(grid, pattern, row, col, wrap_edges=False):
+    """
+    Overwrites the cells of `grid` under `pattern` (dead cells included) with
+    its top-left corner at (row, col), one slice assignment per rectangle from
+    placement_rects.
+
+    Args:
+        grid (np.ndarray): 2D array of 0/1 cells, modified in place.
+        pattern (np.ndarray): 2D array of 0/1 cells.
+        row, col (int): Board cell of the pattern's top-left corner (may be
+                        outside the board).
+        wrap_edges (bool): If True, the pattern wraps around the edges
+                           instead of being clipped.
+
+    Returns:
+        int: Number of cells that changed.
+    """
+    pattern = np.asarray(pattern)
+    changed = 0
+    for r0, c0, r1, c1, pr, pc in placement_rects(grid.shape, pattern.shape, row, col, wrap_edges):
+        target = grid[r0:r1, c0:c1]
+        piece = pattern[pr:pr + r1 - r0, pc:pc + c1 - c0] != 0
+        changed += int(np.count_nonzero(target != piece))
+        target[:] = piece
+    return changed
+
 # You can add other game logic related functions here if needed
@@ -1,47 +1,494 @@
+import base64
+import hashlib
+import os
+import struct
 import tkinter as tk
+import zlib
+from collections import OrderedDict
 from tkinter import ttk
 import numpy as np
 
-def draw_pattern_preview(preview_canvas, pattern_array, preview_canvas_size):
-    """Draws a small preview of a pattern on a given canvas."""
-    preview_canvas.delete("all") # Clear previous preview
-    if pattern_array is None: return
-
-    rows, cols = pattern_array.shape
-    if rows == 0 or cols == 0: return # Skip empty patterns
-
-    canvas_size = preview_canvas_size
-    padding = 1 # Minimal padding
-
-    # Calculate available drawing area
-    available_width = canvas_size - 2 * padding
-    available_height = canvas_size - 2 * padding
-    if available_width <= 0 or available_height <= 0: return # Not enough space
-
-    # Calculate cell size to fit the pattern within the available area
-    cell_w = available_width / cols
-    cell_h = available_height / rows
-    cell_size = max(1, min(cell_w, cell_h)) # Use floor to avoid drawing outside bounds
-
-    # Calculate total drawing dimensions and centering offset
-    pattern_draw_width = cols * cell_size
-    pattern_draw_height = rows * cell_size
-    offset_x = padding + (available_width - pattern_draw_width) / 2
-    offset_y = padding + (available_height - pattern_draw_height) / 2
-
-    # Draw the pattern cells
-    for r in range(rows):
-        for c in range(cols):
-            if pattern_array[r, c] == 1:
-                # Calculate cell coordinates, ensuring they are integers
-                x0 = int(offset_x + c * cell_size)
-                y0 = int(offset_y + r * cell_size)
-                x1 = int(x0 + cell_size)
-                y1 = int(y0 + cell_size)
-                # Ensure x1 > x0 and y1 > y0, minimum 1 pixel size
-                if x1 <= x0: x1 = x0 + 1
-                if y1 <= y0: y1 = y0 + 1
-                preview_canvas.create_rectangle(x0, y0, x1, y1, fill="black", outline="")
+PREVIEW_PADDING = 1 # Blank pixels around a preview thumbnail
+PREVIEW_CACHE_SIZE = 1024 # Thumbnails kept in memory
+# Thumbnail palette: 0 = dead, 1 = alive
+PREVIEW_PALETTE = np.array([[255, 255, 255], [0, 0, 0]], dtype=np.uint8)
+
+
+def _scale_indices(cells, pixels):
+    """First cell index covered by each of `pixels` pixels when `cells` cells are scaled to them."""
+    return (np.arange(pixels) * cells) // pixels
+
+
+def pattern_thumbnail(pattern_array, size, rotation=0):
+    """
+    Scales a pattern into a size x size thumbnail with vectorized NumPy operations.
+
+    Small patterns are magnified by a whole number of pixels per cell; large
+    ones are shrunk so that a pixel is black if any cell it covers is alive.
+    The pattern keeps its aspect ratio and is centered.
+
+    Args:
+        pattern_array (np.ndarray): 2D array of 0/1 cells.
+        size (int): Side length of the thumbnail in pixels.
+        rotation (int): Number of 90 degree clockwise turns applied first.
+
+    Returns:
+        np.ndarray: uint8 array of shape (size, size) with 1 for black pixels.
+    """
+    image = np.zeros((size, size), dtype=np.uint8)
+    pattern = np.rot90(np.asarray(pattern_array) != 0, k=-rotation)
+    rows, cols = pattern.shape
+    available = size - 2 * PREVIEW_PADDING
+    if rows == 0 or cols == 0 or available <= 0: return image
+
+    scale = min(available / rows, available / cols)
+    if scale >= 1: scale = int(scale) # Whole pixels per cell keep the grid even
+    draw_h, draw_w = max(1, round(rows * scale)), max(1, round(cols * scale))
+    # Max-pool the cells covered by each pixel (a single cell when magnifying)
+    pooled = np.maximum.reduceat(pattern.view(np.uint8), _scale_indices(rows, draw_h), axis=0)
+    pooled = np.maximum.reduceat(pooled, _scale_indices(cols, draw_w), axis=1)
+    top, left = (size - draw_h) // 2, (size - draw_w) // 2
+    image[top:top + draw_h, left:left + draw_w] = pooled
+    return image
+
+
+def thumbnail_ppm(thumbnail):
+    """Returns the binary PPM (P6) image data for a thumbnail from pattern_thumbnail."""
+    pixels = PREVIEW_PALETTE[thumbnail]
+    header = f"P6 {pixels.shape[1]} {pixels.shape[0]} 255 ".encode("ascii")
+    return header + pixels.tobytes()
+
+
+class PreviewCache:
+    """
+    Pattern preview thumbnails as PhotoImages, built once per (pattern,
+    rotation, size) and kept in an in-memory LRU cache.
+
+    Args:
+        cache_dir (str): Optional directory where the PPM data is also stored,
+                         so later runs skip the scaling. Files are named after
+                         a digest of the pattern cells, rotation and size, so
+                         edited patterns never reuse a stale thumbnail.
+        max_items (int): Number of PhotoImages kept in memory. Callers must
+                         keep their own reference to images that are on screen.
+        photo_factory (callable): Creates the image (replaceable for display-free use).
+    """
+    def __init__(self, cache_dir=None, max_items=PREVIEW_CACHE_SIZE, photo_factory=tk.PhotoImage):
+        self.cache_dir = cache_dir
+        self.max_items = max_items
+        self.photo_factory = photo_factory
+        self._photos = OrderedDict() # key -> PhotoImage, most recently used last
+
+    def _ppm_data(self, pattern_array, size, rotation):
+        if self.cache_dir is None:
+            return thumbnail_ppm(pattern_thumbnail(pattern_array, size, rotation))
+        cells = np.ascontiguousarray(np.asarray(pattern_array) != 0)
+        digest = hashlib.sha1(cells.tobytes() + repr((cells.shape, rotation % 4, size)).encode()).hexdigest()
+        path = os.path.join(self.cache_dir, f"{digest}.ppm")
+        try:
+            with open(path, "rb") as f:
+                return f.read()
+        except OSError:
+            pass
+        data = thumbnail_ppm(pattern_thumbnail(cells, size, rotation))
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with open(path, "wb") as f:
+                f.write(data)
+        except OSError as e:
+            print(f"Warning: Could not store preview in '{self.cache_dir}': {e}")
+        return data
+
+    def get(self, master, name, pattern_array, size, rotation=0):
+        """
+        Returns the preview PhotoImage of a pattern.
+
+        Args:
+            master: Widget owning the image.
+            name (str): Pattern name used as the cache key (patterns with the
+                        same name must have the same cells).
+            pattern_array (np.ndarray): 2D array of 0/1 cells.
+            size (int): Side length of the thumbnail in pixels.
+            rotation (int): Number of 90 degree clockwise turns.
+        """
+        key = (name, rotation % 4, size)
+        photo = self._photos.get(key)
+        if photo is not None:
+            self._photos.move_to_end(key)
+            return photo
+        photo = self.photo_factory(master=master, data=self._ppm_data(pattern_array, size, rotation), format="PPM")
+        self._photos[key] = photo
+        if len(self._photos) > self.max_items:
+            self._photos.popitem(last=False)
+        return photo
+
+
+_default_preview_cache = None
+
+
+def draw_pattern_preview(preview_canvas, pattern_array, preview_canvas_size, x=0, y=0, tags=(), name=None, cache=None):
+    """
+    Draws a small preview of a pattern on a given canvas as one cached image.
+
+    By default the whole canvas is cleared and the preview fills it; with `tags`
+    the preview is added at (x, y) without clearing, tagged for later deletion.
+
+    Returns:
+        The PhotoImage drawn (keep a reference while it is on screen), or None.
+    """
+    global _default_preview_cache
+    if not tags:
+        preview_canvas.delete("all") # Clear previous preview
+    if pattern_array is None: return None
+    if cache is None:
+        if _default_preview_cache is None: _default_preview_cache = PreviewCache()
+        cache = _default_preview_cache
+    key = name if name is not None else hashlib.sha1(np.ascontiguousarray(pattern_array).tobytes()
+                                                     + repr(pattern_array.shape).encode()).hexdigest()
+    photo = cache.get(preview_canvas, key, pattern_array, preview_canvas_size)
+    preview_canvas.create_image(x, y, image=photo, anchor="nw", tags=tags)
+    return photo
+
+
+# Zoom levels of the board view in screen pixels per cell; below 1 a pixel covers a block of cells
+ZOOM_LEVELS = (1 / 16, 1 / 8, 1 / 4, 1 / 2, 1, 2, 3, 4, 6, 8, 12, 16, 24, 32)
+SHADE_LEVELS = 8 # Grey levels (besides dead) used by density shading
+
+
+def block_downsample(cells, block, shading="any"):
+    """
+    Shrinks a 2D array of 0/1 cells by `block` cells per pixel in each direction.
+
+    Args:
+        cells (np.ndarray): 2D array whose sides are multiples of `block`.
+        block (int): Side length of the square block of cells per pixel.
+        shading (str): "any" for 1 where any cell of the block is alive, or
+                       "density" for the block's live fraction rounded up to
+                       0..SHADE_LEVELS (so a single live cell still shows).
+
+    Returns:
+        np.ndarray: uint8 array of shape (rows // block, cols // block).
+    """
+    rows, cols = cells.shape
+    blocks = np.asarray(cells).reshape(rows // block, block, cols // block, block)
+    if shading == "density":
+        counts = blocks.sum(axis=(1, 3), dtype=np.int32)
+        area = block * block
+        return ((counts * SHADE_LEVELS + area - 1) // area).astype(np.uint8)
+    return blocks.any(axis=(1, 3)).astype(np.uint8)
+
+
+def _axis_span(origin, pixels, block, size):
+    """
+    Pixels [first, stop) of a view axis that show part of a board axis of
+    `size` cells, when pixel p covers cells [origin + p*block, origin + (p+1)*block).
+    """
+    first = min(pixels, max(0, (-origin) // block))
+    stop = max(first, min(pixels, -((origin - size) // block)))
+    return first, stop
+
+
+class Viewport:
+    """
+    Visible window of the board: which cell is at the canvas origin and how
+    many screen pixels a cell takes (see ZOOM_LEVELS).
+
+    Until the user pans or zooms, the view follows the canvas size and shows
+    the whole board (`fitted`).
+    """
+
+    def __init__(self, zoom=1):
+        self.row = 0 # Board cell shown at the top-left pixel
+        self.col = 0
+        self.zoom = zoom
+        self.fitted = True
+        self._pan_rest = (0, 0) # Pixels dragged that did not add up to a whole cell yet
+
+    @property
+    def cell_size(self):
+        """Pixels per cell side when zoomed in (1 when zoomed out)."""
+        return max(1, int(self.zoom))
+
+    @property
+    def block(self):
+        """Cells per pixel side when zoomed out (1 when zoomed in)."""
+        return max(1, round(1 / self.zoom))
+
+    def fit(self, shape, width, height):
+        """Picks the largest zoom level at which a board of `shape` fits in width x height and centers it."""
+        rows, cols = shape
+        fitting = [z for z in ZOOM_LEVELS if rows * z <= height and cols * z <= width]
+        self.zoom = fitting[-1] if fitting else ZOOM_LEVELS[0]
+        self.row = -int(max(0, height - rows * self.zoom) / 2 // self.zoom)
+        self.col = -int(max(0, width - cols * self.zoom) / 2 // self.zoom)
+        # Zoomed out, the origin must sit on a block boundary of the board
+        self.row -= self.row % self.block
+        self.col -= self.col % self.block
+        self.fitted = True
+
+    def canvas_to_cell(self, x, y):
+        """Returns the (row, col) board cell under canvas pixel (x, y)."""
+        return self.row + int(y // self.zoom), self.col + int(x // self.zoom)
+
+    def cell_to_canvas(self, row, col):
+        """Returns the canvas pixel (x, y) of the top-left corner of a board cell."""
+        return (col - self.col) * self.zoom, (row - self.row) * self.zoom
+
+    def pan(self, dx, dy):
+        """Moves the board by (dx, dy) screen pixels."""
+        rest_x, rest_y = self._pan_rest
+        dx, dy = dx + rest_x, dy + rest_y
+        step = max(self.zoom, 1) # Pixels per whole cell (or block) of movement
+        moved_x, moved_y = int(dx / step), int(dy / step)
+        self._pan_rest = (dx - moved_x * step, dy - moved_y * step)
+        self.col -= moved_x * self.block
+        self.row -= moved_y * self.block
+        self.fitted = False
+
+    def zoom_at(self, steps, x, y):
+        """Zooms `steps` levels in (positive) or out, keeping the cell under (x, y) in place."""
+        level = min(range(len(ZOOM_LEVELS)), key=lambda i: abs(ZOOM_LEVELS[i] - self.zoom))
+        zoom = ZOOM_LEVELS[min(len(ZOOM_LEVELS) - 1, max(0, level + steps))]
+        if zoom == self.zoom: return
+        row, col = self.canvas_to_cell(x, y)
+        self.zoom = zoom
+        self.row = row - int(y // zoom)
+        self.col = col - int(x // zoom)
+        self.row -= self.row % self.block
+        self.col -= self.col % self.block
+        self._pan_rest = (0, 0)
+        self.fitted = False
+
+
+class GridImageRenderer:
+    """
+    Renders a 0/1 grid onto a canvas as a single PhotoImage.
+
+    The grid is turned into a PPM byte buffer with vectorized NumPy indexing
+    (each cell scaled to cell_size pixels, with 1-pixel grid lines when cells
+    are large enough) and swapped into one canvas image item per frame, so the
+    canvas holds one item regardless of the board size.
+
+    `render_view` only rasterizes the part of the board inside a Viewport, into
+    an image the size of the canvas, so the cost of a frame follows the number
+    of screen pixels rather than the board size.
+    """
+    # Palette indices: 0 = dead, 1 = alive, 2 = grid line, 3 = outside the board,
+    # 4.. = density shades from light to black
+    PALETTE = np.array([[255, 255, 255], [0, 0, 0], [128, 128, 128], [211, 211, 211]] +
+                       [[v, v, v] for v in np.linspace(224, 0, SHADE_LEVELS).astype(int)], dtype=np.uint8)
+    OUTSIDE = 3
+    SHADE_BASE = 3 # Density level k (1..SHADE_LEVELS) uses palette index SHADE_BASE + k
+
+    def __init__(self, canvas, tag="grid_image", photo_factory=tk.PhotoImage):
+        self.canvas = canvas
+        self.tag = tag
+        self.photo_factory = photo_factory # Replaceable for display-free benchmarking
+        self._photo = None
+        self._item = None
+        self._layout_key = None
+        self._row_index = None
+        self._col_index = None
+        self._line_mask = None
+        self._view_key = None
+        self._view_rows = None
+        self._view_cols = None
+        self._view_lines = None
+
+    def _layout(self, shape, cell_size):
+        """Caches the pixel -> cell index maps for a grid shape and cell size."""
+        key = (shape, cell_size)
+        if key == self._layout_key: return
+        rows, cols = shape
+        pixel_rows = np.arange(rows * cell_size)
+        pixel_cols = np.arange(cols * cell_size)
+        self._row_index = pixel_rows // cell_size
+        self._col_index = pixel_cols // cell_size
+        if cell_size > 2:
+            self._line_mask = ((pixel_rows % cell_size) == cell_size - 1)[:, None] | \
+                              ((pixel_cols % cell_size) == cell_size - 1)[None, :]
+        else:
+            self._line_mask = None
+        self._layout_key = key
+
+    def to_ppm(self, grid, cell_size):
+        """Returns the binary PPM (P6) image data for the grid at the given cell size."""
+        self._layout(grid.shape, cell_size)
+        codes = grid[self._row_index[:, None], self._col_index[None, :]].astype(np.uint8)
+        if self._line_mask is not None:
+            codes[self._line_mask] = 2
+        return self._codes_to_ppm(codes)
+
+    def _codes_to_ppm(self, codes):
+        pixels = self.PALETTE[codes]
+        header = f"P6 {pixels.shape[1]} {pixels.shape[0]} 255 ".encode("ascii")
+        return header + pixels.tobytes()
+
+    def _view_layout(self, width, height, cell_size):
+        """Caches the pixel -> visible cell index maps of a zoomed-in view."""
+        key = (width, height, cell_size)
+        if key == self._view_key: return
+        pixel_rows = np.arange(height)
+        pixel_cols = np.arange(width)
+        self._view_rows = pixel_rows // cell_size
+        self._view_cols = pixel_cols // cell_size
+        if cell_size > 2:
+            self._view_lines = ((pixel_rows % cell_size) == cell_size - 1)[:, None] | \
+                               ((pixel_cols % cell_size) == cell_size - 1)[None, :]
+        else:
+            self._view_lines = None
+        self._view_key = key
+
+    def view_codes(self, grid, viewport, width, height, shading="any"):
+        """
+        Returns the (height, width) uint8 palette indices of the part of the
+        grid seen through `viewport`.
+
+        Zoomed in, only the visible cells are looked up; zoomed out, only the
+        board area under the canvas is block-downsampled (see block_downsample).
+        """
+        rows, cols = grid.shape
+        if viewport.zoom >= 1:
+            cell_size = viewport.cell_size
+            self._view_layout(width, height, cell_size)
+            visible_rows, visible_cols = -(-height // cell_size), -(-width // cell_size)
+            cells = np.full((visible_rows, visible_cols), self.OUTSIDE, dtype=np.uint8)
+            r0, r1 = _axis_span(viewport.row, visible_rows, 1, rows)
+            c0, c1 = _axis_span(viewport.col, visible_cols, 1, cols)
+            if r0 < r1 and c0 < c1:
+                cells[r0:r1, c0:c1] = grid[viewport.row + r0:viewport.row + r1, viewport.col + c0:viewport.col + c1]
+            codes = cells[self._view_rows[:, None], self._view_cols[None, :]]
+            if self._view_lines is not None:
+                codes[self._view_lines & (codes != self.OUTSIDE)] = 2
+            return codes
+
+        block = viewport.block
+        codes = np.full((height, width), self.OUTSIDE, dtype=np.uint8)
+        p0, p1 = _axis_span(viewport.row, height, block, rows)
+        q0, q1 = _axis_span(viewport.col, width, block, cols)
+        if p0 < p1 and q0 < q1:
+            # Board cells under the covered pixels, padded with dead cells to whole blocks
+            top, left = viewport.row + p0 * block, viewport.col + q0 * block
+            bottom, right = viewport.row + p1 * block, viewport.col + q1 * block
+            cells = np.zeros((bottom - top, right - left), dtype=np.uint8)
+            cells[max(0, -top):min(rows, bottom) - top, max(0, -left):min(cols, right) - left] = \
+                grid[max(0, top):min(rows, bottom), max(0, left):min(cols, right)]
+            small = block_downsample(cells, block, shading)
+            if shading == "density":
+                small = np.where(small > 0, small + self.SHADE_BASE, 0).astype(np.uint8)
+            codes[p0:p1, q0:q1] = small
+        return codes
+
+    def render(self, grid, cell_size):
+        """Draws the grid with its top-left corner at the canvas origin."""
+        if grid.size == 0 or cell_size <= 0: return
+        self._show(self.to_ppm(grid, cell_size))
+
+    def render_view(self, grid, viewport, width, height, shading="any"):
+        """Draws the part of the grid inside `viewport` so that it fills a width x height canvas."""
+        if width <= 0 or height <= 0: return
+        self._show(self._codes_to_ppm(self.view_codes(grid, viewport, width, height, shading)))
+
+    def _show(self, data):
+        photo = self.photo_factory(master=self.canvas, data=data, format="PPM")
+        if self._item is None or not self.canvas.find_withtag(self.tag):
+            self._item = self.canvas.create_image(0, 0, image=photo, anchor="nw", tags=(self.tag,))
+            self.canvas.tag_lower(self.tag)
+        else:
+            self.canvas.itemconfig(self._item, image=photo)
+        self._photo = photo # Keep a reference so Tk does not discard the image
+
+
+def _png_chunk(kind, data):
+    return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+
+def rgba_png(pixels):
+    """Returns PNG file data for a (height, width, 4) uint8 RGBA array."""
+    height, width = pixels.shape[:2]
+    # Every scanline starts with filter type 0 (none)
+    rows = np.zeros((height, width * 4 + 1), dtype=np.uint8)
+    rows[:, 1:] = pixels.reshape(height, width * 4)
+    header = struct.pack(">IIBBBBB", width, height, 8, 6, 0, 0, 0) # 8-bit RGBA
+    return (b"\x89PNG\r\n\x1a\n" + _png_chunk(b"IHDR", header) +
+            _png_chunk(b"IDAT", zlib.compress(rows.tobytes(), 1)) + _png_chunk(b"IEND", b""))
+
+
+class GhostImage:
+    """
+    Translucent preview of the pattern about to be placed, drawn as one canvas image.
+
+    The pattern is rasterized once per pattern (or rotation) and zoom level,
+    at the viewport's scale (block-downsampled when zoomed out), into an RGBA
+    PNG; following the mouse only moves the image item with `canvas.coords`.
+    """
+    # RGBA of live cells and of their outline when cells are large enough
+    FILL = (0, 0, 255, 128)
+    OUTLINE = (173, 216, 230, 200)
+
+    def __init__(self, canvas, tag="ghost", photo_factory=tk.PhotoImage):
+        self.canvas = canvas
+        self.tag = tag
+        self.photo_factory = photo_factory
+        self._photo = None
+        self._item = None
+        self._key = None
+        self._pattern = None
+
+    def _rasterize(self, pattern, viewport):
+        cells = np.asarray(pattern) != 0
+        if viewport.zoom < 1:
+            # The pointer cell is always on a block boundary of the view (see Viewport)
+            block = viewport.block
+            rows, cols = cells.shape
+            padded = np.zeros((-(-rows // block) * block, -(-cols // block) * block), dtype=np.uint8)
+            padded[:rows, :cols] = cells
+            cells, cell_size = block_downsample(padded, block) != 0, 1
+        else:
+            cell_size = viewport.cell_size
+        pixel_rows = np.arange(cells.shape[0] * cell_size)
+        pixel_cols = np.arange(cells.shape[1] * cell_size)
+        live = cells[(pixel_rows // cell_size)[:, None], (pixel_cols // cell_size)[None, :]]
+        pixels = np.zeros((*live.shape, 4), dtype=np.uint8)
+        pixels[live] = self.FILL
+        if cell_size > 2:
+            edge = ((pixel_rows % cell_size) == cell_size - 1)[:, None] | ((pixel_cols % cell_size) == cell_size - 1)[None, :]
+            pixels[live & edge] = self.OUTLINE
+        return pixels
+
+    def show(self, pattern, viewport, row, col):
+        """
+        Shows `pattern` with its top-left corner on board cell (row, col),
+        re-rendering the image only when the pattern object or zoom changed.
+        """
+        key = (id(pattern), viewport.zoom)
+        if key != self._key or self._item is None or not self.canvas.find_withtag(self.tag):
+            pixels = self._rasterize(pattern, viewport)
+            if pixels.size == 0:
+                self.hide()
+                return
+            data = base64.b64encode(rgba_png(pixels)).decode("ascii")
+            self._photo = self.photo_factory(master=self.canvas, data=data, format="png")
+            self._key = key
+            self._pattern = pattern # Keeps id(pattern) from being reused while it is cached
+            if self._item is None or not self.canvas.find_withtag(self.tag):
+                self._item = self.canvas.create_image(0, 0, image=self._photo, anchor="nw", tags=(self.tag,))
+            else:
+                self.canvas.itemconfig(self._item, image=self._photo)
+        x, y = viewport.cell_to_canvas(row, col)
+        self.canvas.coords(self._item, x, y)
+        self.canvas.tag_raise(self.tag)
+
+    def hide(self):
+        """Removes the preview from the canvas."""
+        if self._item is not None:
+            try:
+                self.canvas.delete(self._item)
+            except tk.TclError: pass
+        self._item = None
+        self._key = None
+        self._photo = None
+        self._pattern = None
 
 
 class CollapsibleFrame(tk.Frame):
@@ -97,3 +544,105 @@ class CollapsibleFrame(tk.Frame):
     def get_content_frame(self):
         """Returns the frame where content should be placed."""
         return self.content_frame
+
+
+class VirtualPatternList(tk.Frame):
+    """
+    A scrollable list of patterns that only creates canvas items for the rows
+    currently in view, so it stays responsive with tens of thousands of rows.
+
+    Rows are requested page by page through callbacks, e.g. from a
+    pattern_library.PatternLibrary search.
+
+    Args:
+        parent: Parent widget.
+        count_rows (callable): count_rows() -> total number of rows.
+        fetch_rows (callable): fetch_rows(offset, limit) -> list of PatternInfo.
+        get_pattern (callable): get_pattern(name) -> array for the preview, or None.
+        on_select (callable): on_select(event, name) when a row is clicked.
+        row_height (int): Height of a row in pixels (also the preview size).
+        preview_cache (PreviewCache): Cache for the row thumbnails (default: a new in-memory one).
+    """
+    def __init__(self, parent, count_rows, fetch_rows, get_pattern, on_select, row_height=32, preview_cache=None, **kwargs):
+        super().__init__(parent, **kwargs)
+        self.preview_cache = preview_cache or PreviewCache()
+        self._photos = [] # Thumbnails on screen (the cache may evict them)
+        self.count_rows = count_rows
+        self.fetch_rows = fetch_rows
+        self.get_pattern = get_pattern
+        self.on_select = on_select
+        self.row_height = row_height
+        self.total = 0
+        self.top = 0 # Index of the first visible row
+        self._hover = None
+
+        self.columnconfigure(0, weight=1)
+        self.rowconfigure(0, weight=1)
+        self.canvas = tk.Canvas(self, bg="white", highlightthickness=0)
+        self.canvas.grid(row=0, column=0, sticky="nsew")
+        self.scrollbar = ttk.Scrollbar(self, orient=tk.VERTICAL, command=self._on_scrollbar)
+        self.scrollbar.grid(row=0, column=1, sticky="ns")
+
+        self.canvas.bind("<Configure>", lambda e: self.redraw())
+        self.canvas.bind("<MouseWheel>", lambda e: self.scroll_to(self.top - (1 if e.delta > 0 else -1) * 3))
+        self.canvas.bind("<Button-4>", lambda e: self.scroll_to(self.top - 3)) # X11 wheel up
+        self.canvas.bind("<Button-5>", lambda e: self.scroll_to(self.top + 3)) # X11 wheel down
+
+    def visible_rows(self):
+        """Number of rows that fit in the canvas (the last one may be partly shown)."""
+        return max(1, self.canvas.winfo_height() // self.row_height + 1)
+
+    def refresh(self):
+        """Re-counts the rows (e.g. after the filter changed) and shows the first page."""
+        self.total = self.count_rows()
+        self.top = 0
+        self.redraw()
+
+    def scroll_to(self, row):
+        """Scrolls so `row` is the first visible row (clamped to the list)."""
+        top = max(0, min(int(row), self.total - self.visible_rows() + 1))
+        if top != self.top:
+            self.top = top
+            self.redraw()
+
+    def _on_scrollbar(self, action, *args):
+        if action == "moveto":
+            self.scroll_to(round(float(args[0]) * self.total))
+        elif action == "scroll":
+            step = self.visible_rows() - 1 if args[1] == "pages" else 1
+            self.scroll_to(self.top + int(args[0]) * max(1, step))
+
+    def redraw(self):
+        """Draws the rows in view (at most one canvas page of items)."""
+        self.canvas.delete("row")
+        self._photos = []
+        self._hover = None
+        count = self.visible_rows()
+        rows = self.fetch_rows(self.top, count) if self.total else []
+        width = max(self.canvas.winfo_width(), 1)
+        size = self.row_height
+        for i, info in enumerate(rows):
+            y = i * size
+            tag = f"row{i}"
+            tags = ("row", tag)
+            self.canvas.create_rectangle(0, y, width, y + size - 1, fill="white", outline="lightgrey", tags=tags + ("bg",))
+            photo = draw_pattern_preview(self.canvas, self.get_pattern(info.name), size - 2, x=1, y=y + 1, tags=tags,
+                                         name=info.name, cache=self.preview_cache)
+            if photo is not None: self._photos.append(photo)
+            subtitle = f"{info.category} | {info.width}x{info.height}, pop {info.population}"
+            if info.period:
+                subtitle += f", p{info.period}"
+            self.canvas.create_text(size + 4, y + 2, text=info.name, anchor="nw", tags=tags)
+            self.canvas.create_text(size + 4, y + size - 3, text=subtitle, anchor="sw", fill="grey", font=("TkDefaultFont", 7), tags=tags)
+            self.canvas.tag_bind(tag, "<Button-1>", lambda e, name=info.name: self.on_select(e, name))
+            self.canvas.tag_bind(tag, "<Enter>", lambda e, t=tag: self._set_hover(t))
+        if self.total:
+            self.scrollbar.set(self.top / self.total, min(1.0, (self.top + count) / self.total))
+        else:
+            self.scrollbar.set(0, 1)
+
+    def _set_hover(self, tag):
+        if self._hover:
+            self.canvas.itemconfig(f"{self._hover}&&bg", fill="white")
+        self.canvas.itemconfig(f"{tag}&&bg", fill="lightblue")
+        self._hover = tag
@@ -0,0 +1,373 @@
+import numpy as np
+
+from game_logic import CONWAY_RULE, parse_rule, rule_table
+
+# HashLife engine for huge and long-running patterns.
+# The (unbounded, dead-bordered) plane is stored as a quadtree whose nodes are
+# hash-consed: every distinct square of cells exists exactly once, so repeated
+# structure is shared. The RESULT of a node (its centre after 2^j generations)
+# is memoized, which lets periodic and repetitive patterns be advanced by
+# millions of generations in a handful of steps.
+#
+# The node table is bounded by max_nodes while a step runs, not just between
+# steps: every _result call in progress keeps its node and the sub-results it
+# has computed so far on a stack, and when the table grows past the limit the
+# nodes reachable from the root, that stack and the canonical empty nodes are
+# kept and everything else is dropped (with the memoized results that refer
+# to dropped nodes).
+
+DEFAULT_MAX_NODES = 1_000_000
+
+
+class Node:
+    """A canonical quadtree node. Level k covers a 2^k x 2^k square of cells."""
+    __slots__ = ("nw", "ne", "sw", "se", "level", "population")
+
+    def __init__(self, nw, ne, sw, se, level, population):
+        self.nw = nw
+        self.ne = ne
+        self.sw = sw
+        self.se = se
+        self.level = level
+        self.population = population
+
+
+# Level 0 nodes are the two possible single cells
+DEAD = Node(None, None, None, None, 0, 0)
+ALIVE = Node(None, None, None, None, 0, 1)
+
+
+class HashLife:
+    """
+    HashLife simulation of an unbounded plane.
+
+    Cell coordinates are (row, col) with the root node's top-left corner at
+    `self.origin`. Cells outside the root are dead.
+
+    Args:
+        max_nodes (int): Size of the canonical node table that triggers a
+                         garbage collection, checked during steps as well
+                         as between them. Nodes that are not reachable from
+                         the current pattern or a computation in progress
+                         are dropped along with their memoized results.
+        rule (str): Life-like rulestring (see game_logic.parse_rule). Rules
+                    with birth on 0 neighbors (B0) are not supported, since
+                    they would switch on the whole infinite plane.
+    """
+
+    def __init__(self, max_nodes=DEFAULT_MAX_NODES, rule=CONWAY_RULE):
+        birth, _ = parse_rule(rule)
+        if 0 in birth:
+            raise ValueError("HashLife does not support B0 rules")
+        self.rule = rule
+        self._next_cell = [ALIVE if alive else DEAD for alive in rule_table(rule)]
+        self.max_nodes = max_nodes
+        self._nodes = {}     # (nw, ne, sw, se) -> canonical Node
+        self._results = {}   # (node, j) -> centre of node after 2^j generations
+        self._empty = [DEAD]  # Canonical empty node per level
+        self._pinned = []     # Nodes in use by _result calls in progress (extra GC roots)
+        self._collect_at = max_nodes  # Table size that triggers the next collection
+        self.root = self.empty(3)
+        self.origin = (0, 0)
+        self.generation = 0
+        self.gc_count = 0
+
+    # --- Node construction ---
+
+    def join(self, nw, ne, sw, se):
+        """Returns the canonical node with the given four children."""
+        key = (nw, ne, sw, se)
+        node = self._nodes.get(key)
+        if node is None:
+            node = Node(nw, ne, sw, se, nw.level + 1,
+                        nw.population + ne.population + sw.population + se.population)
+            self._nodes[key] = node
+        return node
+
+    def empty(self, level):
+        """Returns the canonical empty node of the given level."""
+        while len(self._empty) <= level:
+            e = self._empty[-1]
+            self._empty.append(self.join(e, e, e, e))
+        return self._empty[level]
+
+    def _expand(self, node):
+        """Returns a node one level up with `node` in its centre."""
+        e = self.empty(node.level - 1)
+        return self.join(self.join(e, e, e, node.nw), self.join(e, e, node.ne, e),
+                         self.join(e, node.sw, e, e), self.join(node.se, e, e, e))
+
+    def _inner(self, node):
+        """Returns the centred node two levels down (the middle quarter of its width)."""
+        return self.join(node.nw.se.se, node.ne.sw.sw, node.sw.ne.ne, node.se.nw.nw)
+
+    # --- RESULT computation ---
+
+    def _base_result(self, node):
+        """Advances a level-2 (4x4) node by one generation, returning its 2x2 centre."""
+        cells = [[0] * 4 for _ in range(4)]
+        for r0, c0, quad in ((0, 0, node.nw), (0, 2, node.ne), (2, 0, node.sw), (2, 2, node.se)):
+            cells[r0][c0] = quad.nw.population
+            cells[r0][c0 + 1] = quad.ne.population
+            cells[r0 + 1][c0] = quad.sw.population
+            cells[r0 + 1][c0 + 1] = quad.se.population
+        centre = []
+        for r in (1, 2):
+            for c in (1, 2):
+                neighbors = sum(cells[r + dr][c + dc]
+                                for dr in (-1, 0, 1) for dc in (-1, 0, 1)
+                                if dr or dc)
+                centre.append(self._next_cell[cells[r][c] * 9 + neighbors])
+        return self.join(*centre)
+
+    def _result(self, node, j):
+        """
+        Returns the centre (one level down) of `node` advanced by 2^j
+        generations, where j is clamped to node.level - 2.
+        """
+        j = min(j, node.level - 2)
+        key = (node, j)
+        cached = self._results.get(key)
+        if cached is not None:
+            return cached
+
+        if node.population == 0:
+            result = self.empty(node.level - 1)
+        elif node.level == 2:
+            result = self._base_result(node)
+        else:
+            pinned = self._pinned
+            mark = len(pinned)
+            pinned.append(node)
+            if len(self._nodes) > self._collect_at:
+                self.collect()
+            nw, ne, sw, se = node.nw, node.ne, node.sw, node.se
+            join, result_of = self.join, self._result
+            # Nine overlapping sub-squares of half size, each advanced. The
+            # squares and every finished sub-result are pinned so they survive
+            # collections in later calls.
+            squares = (nw, join(nw.ne, ne.nw, nw.se, ne.sw), ne,
+                       join(nw.sw, nw.se, sw.nw, sw.ne), join(nw.se, ne.sw, sw.ne, se.nw), join(ne.sw, ne.se, se.nw, se.ne),
+                       sw, join(sw.ne, se.nw, sw.se, se.sw), se)
+            pinned.extend(squares)
+            for square in squares:
+                pinned.append(result_of(square, j))
+            c1, c2, c3, c4, c5, c6, c7, c8, c9 = pinned[-9:]
+            if j < node.level - 2:
+                # Partial speed: take the centres without further stepping
+                result = join(join(c1.se, c2.sw, c4.ne, c5.nw),
+                              join(c2.se, c3.sw, c5.ne, c6.nw),
+                              join(c4.se, c5.sw, c7.ne, c8.nw),
+                              join(c5.se, c6.sw, c8.ne, c9.nw))
+            else:
+                # Full speed: advance the four combined quadrants again
+                quadrants = (join(c1, c2, c4, c5), join(c2, c3, c5, c6), join(c4, c5, c7, c8), join(c5, c6, c8, c9))
+                pinned.extend(quadrants)
+                for quadrant in quadrants:
+                    pinned.append(result_of(quadrant, j))
+                result = join(*pinned[-4:])
+            del pinned[mark:]
+        self._results[key] = result
+        return result
+
+    # --- Stepping ---
+
+    @property
+    def population(self):
+        """Returns the number of live cells."""
+        return self.root.population
+
+    def step_pow2(self, j):
+        """Advances the pattern by exactly 2^j generations."""
+        root = self.root
+        row, col = self.origin
+        # Pad until the pattern lies in the inner quarter and the jump fits,
+        # so nothing can escape the centre returned by _result.
+        while root.level < j + 3 or self._inner(root).population != root.population:
+            half = 1 << (root.level - 1)
+            root = self._expand(root)
+            row, col = row - half, col - half
+        quarter = 1 << (root.level - 2)
+        self._pinned = [root]
+        self.root = self._result(root, j)
+        self._pinned = []
+        self.origin = (row + quarter, col + quarter)
+        self.generation += 1 << j
+        self._maybe_collect()
+
+    def step(self, generations=1):
+        """Advances the pattern by an arbitrary number of generations."""
+        j = 0
+        while generations:
+            if generations & 1:
+                self.step_pow2(j)
+            generations >>= 1
+            j += 1
+
+    # --- Memory management ---
+
+    def _maybe_collect(self):
+        if len(self._nodes) > self._collect_at:
+            self.collect()
+
+    def collect(self):
+        """
+        Drops every node not reachable from the current root, a computation
+        in progress or the canonical empty nodes, and the memoized results
+        that refer to dropped nodes, keeping memory bounded during long runs.
+        """
+        nodes = {}
+        stack = [self.root, *self._pinned, *self._empty]
+        while stack:
+            node = stack.pop()
+            if node.level == 0:
+                continue
+            key = (node.nw, node.ne, node.sw, node.se)
+            if key in nodes:
+                continue
+            nodes[key] = node
+            stack.extend(key)
+        self._nodes = nodes
+        self._results = {key: result for key, result in self._results.items()
+                         if self._kept(key[0]) and self._kept(result)}
+        # If most of the table is still in use, collecting again soon would only thrash
+        self._collect_at = max(self.max_nodes, 2 * len(nodes))
+        self.gc_count += 1
+
+    def _kept(self, node):
+        return node.level == 0 or self._nodes.get((node.nw, node.ne, node.sw, node.se)) is node
+
+    # --- Dense grid import / export ---
+
+    def _build(self, grid, level):
+        """Builds a node of `level` from a 2^level square array."""
+        if level == 0:
+            return ALIVE if grid[0, 0] else DEAD
+        if not grid.any():
+            return self.empty(level)
+        h = 1 << (level - 1)
+        return self.join(self._build(grid[:h, :h], level - 1), self._build(grid[:h, h:], level - 1),
+                         self._build(grid[h:, :h], level - 1), self._build(grid[h:, h:], level - 1))
+
+    def node_from_grid(self, grid):
+        """Returns the canonical node for a 2^k x 2^k square array of 0/1 cells."""
+        level = grid.shape[0].bit_length() - 1
+        return self._build(np.asarray(grid) != 0, level)
+
+    def set_grid(self, grid, origin=(0, 0)):
+        """
+        Replaces the pattern with a dense grid (as used by game_logic).
+
+        Args:
+            grid (np.ndarray): 2D array of 0/1 cells.
+            origin (tuple): (row, col) plane coordinate of grid[0, 0].
+        """
+        rows, cols = grid.shape
+        level = max(3, int(max(rows, cols, 1) - 1).bit_length())
+        side = 1 << level
+        square = np.zeros((side, side), dtype=np.int8)
+        square[:rows, :cols] = grid != 0
+        self.root = self._build(square, level)
+        self.origin = tuple(origin)
+        self.generation = 0
+
+    def _paint(self, node, out, row, col):
+        """Writes the live cells of `node` (top-left at row, col in `out`) into `out`."""
+        if node.population == 0:
+            return
+        size = 1 << node.level
+        if row >= out.shape[0] or col >= out.shape[1] or row + size <= 0 or col + size <= 0:
+            return
+        if node.level == 0:
+            out[row, col] = 1
+            return
+        h = size >> 1
+        self._paint(node.nw, out, row, col)
+        self._paint(node.ne, out, row, col + h)
+        self._paint(node.sw, out, row + h, col)
+        self._paint(node.se, out, row + h, col + h)
+
+    def get_grid(self, shape, origin=(0, 0)):
+        """
+        Exports a window of the plane as a dense int8 grid.
+
+        Args:
+            shape (tuple): (rows, cols) of the returned grid.
+            origin (tuple): (row, col) plane coordinate of the grid's top-left cell.
+
+        Returns:
+            np.ndarray: 2D int8 array; cells outside the window are dropped.
+        """
+        out = np.zeros(shape, dtype=np.int8)
+        self._paint(self.root, out, self.origin[0] - origin[0], self.origin[1] - origin[1])
+        return out
+
+    def live_cells(self, node=None, origin=(0, 0)):
+        """
+        Lists the live cells of `node` (default: the whole pattern).
+
+        Args:
+            node (Node): Node to export; defaults to the root.
+            origin (tuple): (row, col) of the node's top-left cell. Ignored
+                            for the root, which is placed at `self.origin`.
+
+        Returns:
+            tuple: (rows, cols) int64 arrays of live cell coordinates.
+        """
+        if node is None:
+            node, origin = self.root, self.origin
+        leaf_cells = {}  # Level-3 node -> (rows, cols) offsets, shared by repeated leaves
+        row_parts, col_parts = [], []
+        stack = [(node, origin[0], origin[1])]
+        while stack:
+            node, row, col = stack.pop()
+            if node.population == 0:
+                continue
+            if node.level <= 3:
+                offsets = leaf_cells.get(node)
+                if offsets is None:
+                    size = 1 << node.level
+                    block = np.zeros((size, size), dtype=np.int8)
+                    self._paint(node, block, 0, 0)
+                    offsets = leaf_cells[node] = np.nonzero(block)
+                row_parts.append(offsets[0] + row)
+                col_parts.append(offsets[1] + col)
+                continue
+            h = 1 << (node.level - 1)
+            stack.extend(((node.nw, row, col), (node.ne, row, col + h),
+                          (node.sw, row + h, col), (node.se, row + h, col + h)))
+        if not row_parts:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+        return (np.concatenate(row_parts).astype(np.int64, copy=False),
+                np.concatenate(col_parts).astype(np.int64, copy=False))
+
+    def bounding_box(self):
+        """
+        Returns (min_row, min_col, max_row, max_col) of the live cells in
+        plane coordinates (inclusive), or None if the plane is empty.
+        """
+        if self.root.population == 0:
+            return None
+        bounds = [None, None, None, None]
+
+        def visit(node, row, col):
+            if node.population == 0:
+                return
+            size = 1 << node.level
+            if (bounds[0] is not None and bounds[0] <= row and bounds[1] <= col
+                    and row + size - 1 <= bounds[2] and col + size - 1 <= bounds[3]):
+                return  # Cannot extend the box any further
+            if node.level == 0:
+                bounds[0] = row if bounds[0] is None else min(bounds[0], row)
+                bounds[1] = col if bounds[1] is None else min(bounds[1], col)
+                bounds[2] = row if bounds[2] is None else max(bounds[2], row)
+                bounds[3] = col if bounds[3] is None else max(bounds[3], col)
+                return
+            h = size >> 1
+            visit(node.nw, row, col)
+            visit(node.ne, row, col + h)
+            visit(node.sw, row + h, col)
+            visit(node.se, row + h, col + h)
+
+        visit(self.root, self.origin[0], self.origin[1])
+        return tuple(bounds)
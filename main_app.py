@@ -1,48 +1,100 @@
 import tkinter as tk
-from tkinter import ttk, font
+from tkinter import ttk, font, filedialog
 import numpy as np
+import os
 import time
-from collections import deque
 import copy # Keep for potential future use, though maybe not needed now
 
 # --- Local Imports ---
-from patterns import get_pattern, get_pattern_names
-from game_logic import initialize_grid, update_grid_logic # Import from game_logic
-from gui_components import CollapsibleFrame, draw_pattern_preview # Import from gui_components
+from pattern_library import DEFAULT_PATTERN_DIR, default_library
+from game_logic import initialize_grid, update_grid_logic, update_grid_into, StepScratch, placement_rects, CONWAY_RULE, RULE_PRESETS, parse_rule, format_rule # Import from game_logic
+from sparse_logic import ActiveTileGrid
+from chunked_logic import ChunkedBoard
+from timeline import Timeline
+from cycle_detection import CycleDetector, describe_velocity
+from census import census, format_census
+from simulation import Simulation, ENGINES, ENGINE_NAMES, INPLACE_ENGINE, SPARSE_ENGINE, CHUNKED_ENGINE, DEFAULT_ENGINE, END_STATES
+from scheduler import SimulationThread
+from pattern_io import FORMATS, read_pattern, write_pattern
+from profiling import NULL_PROFILER, PhaseProfiler
+from population_stats import PopulationTracker, RollingStats
+from gui_components import CollapsibleFrame, GhostImage, GridImageRenderer, PreviewCache, VirtualPatternList, Viewport # Import from gui_components
 
 # --- GUI Setup Constants ---
 GRID_SIZE = 100 # Increased grid size from 50 to 100
 UPDATE_INTERVAL = 30
+FRAME_INTERVAL = 33 # ms between rendered frames while stepping in the background
 PREVIEW_CANVAS_SIZE = 30
-MAX_HISTORY_SIZE = 10
+# Preview thumbnails are also kept on disk next to the pattern files, if that directory exists
+PREVIEW_CACHE_DIR = os.path.join(DEFAULT_PATTERN_DIR, "previews") if os.path.isdir(DEFAULT_PATTERN_DIR) else None
+MAX_HISTORY_SIZE = 10000 # Generations remembered for oscillation detection (longest detectable period)
 DIGITAL_FONT_SIZE = 18
 STATS_FONT_SIZE = 10
+PROFILE_REFRESH_INTERVAL = 0.5 # Seconds between refreshes of the profiling panel
+LABEL_REFRESH_INTERVAL = FRAME_INTERVAL / 1000 # Seconds between refreshes of the stats labels while running
+
+# Simulation speeds: 0 steps once per UPDATE_INTERVAL on the Tk main loop; other
+# values run a background thread at that many gens/sec (None = as fast as possible)
+SPEED_OPTIONS = {
+    "1 Gen / Frame": 0,
+    "60 Gens/s": 60,
+    "500 Gens/s": 500,
+    "Turbo": None,
+}
+DEFAULT_SPEED = "1 Gen / Frame"
+ALL_CATEGORIES = "All" # Category filter entry that shows every pattern
 
 # --- Global State ---
 # (Keep global state management in the main application file)
 grid = initialize_grid(GRID_SIZE) # Use imported function
 paused = True
-canvas_rects = [[None for _ in range(GRID_SIZE)] for _ in range(GRID_SIZE)]
-CELL_SIZE = 10
+grid_renderer = None # GridImageRenderer drawing the board as one image
+viewport = Viewport() # Visible window of the board (pan with the middle button, zoom with the wheel)
+density_shading = None # tk.BooleanVar: shade zoomed-out pixels by their live fraction
+pan_anchor = None # Last (x, y) of a middle-button drag
 generation_count = 0
 simulation_state = "Paused"
-previous_grid_states = deque(maxlen=MAX_HISTORY_SIZE)
-previous_grid_state_for_stable_check = None
+cycle_detector = CycleDetector((GRID_SIZE, GRID_SIZE), MAX_HISTORY_SIZE)
 population_count = 0
 initial_run_grid = None
+timeline = Timeline() # Compressed history of the run, for stepping back and scrubbing
+timeline_updating = False # Set while the scrub bar is moved by code rather than the user
 initial_run_generation = 0
-live_cell_count_history = deque(maxlen=20)
-generation_time_history = deque(maxlen=20)
+population_stats = PopulationTracker() # Population, births/deaths, bounding box and rolling stats, updated from the changed cells
+generation_times = RollingStats() # Seconds per generation over the last few generations
+labels_next_refresh = 0.0 # perf_counter time before which throttled label refreshes are skipped
+initial_run_population = 0
 challenge_mode_active = False
 challenge_pattern_placed = False
 challenge_initial_population = 0
 challenge_final_population = 0
+challenge_census = None # Objects on the board when the last challenge ended (census.census)
 wrap_edges = None # Declare globally, initialize later
+engine_name = None # Tk StringVar holding the selected ENGINE_NAMES entry
+active_rule = CONWAY_RULE # Validated rulestring used by the engines
+rule_name = None # Tk StringVar bound to the (editable) rule selector
+sparse_tracker = None # ActiveTileGrid used by the sparse engine
+sparse_tracker_grid = None # The grid view owned by sparse_tracker
+spare_grid = None # Board the in-place engine writes the next generation into (swapped with grid)
+step_scratch = None # StepScratch work arrays of the in-place engine
+step_changed = None # Boolean changed-cell mask reused by the in-place engine
+chunked_board = None # ChunkedBoard (unbounded plane) used by the unbounded engine
+chunked_board_view = None # The last window of chunked_board shown as `grid`
+speed_name = None # Tk StringVar holding the selected SPEED_OPTIONS key
+sim_thread = None # SimulationThread while stepping in the background
+sim_thread_base_generation = 0 # generation_count when sim_thread was started
+profiler = NULL_PROFILER # PhaseProfiler while "Profile Phases" is on
+profiling_enabled = None # Tk BooleanVar of the "Profile Phases" checkbox
+profile_next_refresh = 0.0 # perf_counter time of the next profiling panel refresh
 
 # Pattern Selection State
+pattern_library = default_library() # Indexed lazily on the first query
+pattern_search = None # Tk StringVar with the pattern search text
+pattern_category = None # Tk StringVar with the selected category filter
+pattern_list = None # VirtualPatternList showing the matching patterns
 selected_pattern_name = None
 selected_pattern_array = None
-ghost_pattern_ids = []
+ghost_image = None # GhostImage previewing the selected pattern under the mouse
 last_mouse_event = None
 
 # --- Tkinter UI Widgets (defined globally for access in callbacks) ---
@@ -52,56 +104,80 @@ canvas = None
 pause_button = None
 reset_run_button = None
 full_reset_button = None
+timeline_scale = None # Scrub bar over the recorded generations
+timeline_label = None
+timeline_back_button = None
+timeline_forward_button = None
+load_button = None
+save_button = None
 challenge_button = None
 generation_digital_label = None
 state_digital_label = None
 population_label = None
 gen_time_label = None
 pop_stability_label = None
+births_deaths_label = None
+bounding_box_label = None
 initial_pop_label = None
 final_pop_label = None
+census_label = None # Challenge result: objects on the final board
+profile_label = None # Percentile table of the profiling panel
 wrap_edges_checkbox = None # Placeholder for the checkbox
+engine_combobox = None
+speed_combobox = None
+rule_combobox = None
+rule_description_label = None
 
 # --- UI Update and Event Handlers ---
 # (Keep these in the main app as they interact heavily with global state and UI widgets)
 
 def draw_grid(canvas_width=None, canvas_height=None):
-    """Draws the grid state onto the main canvas, optimizing for reuse."""
-    global CELL_SIZE, canvas_rects, grid, canvas # Need grid and canvas
-    if canvas is None: return # Check if canvas exists
+    """Draws the part of the grid inside the viewport onto the main canvas as a single image."""
+    global grid, canvas, grid_renderer # Need grid and canvas
+    if canvas is None or grid_renderer is None: return # Check if canvas exists
     if canvas_width is None: canvas_width = canvas.winfo_width()
     if canvas_height is None: canvas_height = canvas.winfo_height()
     if canvas_width <= 1 or canvas_height <= 1: return
 
-    cell_width = canvas_width // GRID_SIZE
-    cell_height = canvas_height // GRID_SIZE
-    new_cell_size = max(1, min(cell_width, cell_height))
-
-    needs_creation = not any(any(r is not None for r in row) for row in canvas_rects)
-
-    CELL_SIZE = new_cell_size
-    outline_color = "grey" if CELL_SIZE > 2 else ""
-
-    for r in range(GRID_SIZE):
-        for c in range(GRID_SIZE):
-            color = "black" if grid[r, c] == 1 else "white"
-            x0, y0 = c * CELL_SIZE, r * CELL_SIZE
-            x1, y1 = x0 + CELL_SIZE, y0 + CELL_SIZE
+    if viewport.fitted: # Follow the canvas size until the user pans or zooms
+        viewport.fit(grid.shape, canvas_width, canvas_height)
+    shading = "density" if density_shading is not None and density_shading.get() else "any"
 
-            if needs_creation or canvas_rects[r][c] is None:
-                 try:
-                     if canvas_rects[r][c] is not None: canvas.delete(canvas_rects[r][c])
-                 except tk.TclError: pass
-                 canvas_rects[r][c] = canvas.create_rectangle(x0, y0, x1, y1, fill=color, outline=outline_color, tags=("grid_cell",))
-            else:
-                try:
-                    canvas.coords(canvas_rects[r][c], x0, y0, x1, y1)
-                    canvas.itemconfig(canvas_rects[r][c], fill=color, outline=outline_color)
-                except tk.TclError:
-                    canvas_rects[r][c] = None
-
-    if needs_creation:
-        canvas.tag_lower("grid_cell")
+    t = profiler.start()
+    try:
+        grid_renderer.render_view(grid, viewport, canvas_width, canvas_height, shading)
+    except tk.TclError as e:
+        print(f"Could not draw grid: {e}")
+    profiler.mark("canvas", t)
+
+def refresh_view():
+    """Redraws the board and the ghost pattern after the viewport changed."""
+    draw_grid()
+    if selected_pattern_name and last_mouse_event:
+        update_ghost_position(last_mouse_event)
+
+def zoom_view(event, steps=None):
+    """Mouse wheel: zooms the board view in or out around the pointer."""
+    if steps is None: steps = 1 if event.delta > 0 else -1
+    viewport.zoom_at(steps, event.x, event.y)
+    refresh_view()
+
+def start_pan(event):
+    global pan_anchor
+    pan_anchor = (event.x, event.y)
+
+def drag_pan(event):
+    """Middle-button drag: moves the board view with the pointer."""
+    global pan_anchor
+    if pan_anchor is None: return
+    viewport.pan(event.x - pan_anchor[0], event.y - pan_anchor[1])
+    pan_anchor = (event.x, event.y)
+    refresh_view()
+
+def fit_view(event=None):
+    """Shows the whole board again and follows the canvas size."""
+    viewport.fitted = True
+    refresh_view()
 
 def handle_resize(event):
     """Callback for window resize event."""
@@ -113,78 +189,334 @@ def handle_resize(event):
     elif selected_pattern_name:
          canvas.after_idle(clear_ghost_pattern)
 
-def update_info_labels():
-    """Updates the generation count, simulation state, and stats labels."""
-    global population_count, generation_count, simulation_state, generation_time_history, live_cell_count_history
+def update_info_labels(throttle=False):
+    """
+    Updates the generation count, simulation state, and stats labels.
+    With throttle=True (once per generation while running) they are only
+    redrawn every LABEL_REFRESH_INTERVAL seconds.
+    """
+    global population_count, generation_count, simulation_state, labels_next_refresh
     global challenge_initial_population, challenge_final_population, challenge_mode_active
-    global generation_digital_label, state_digital_label, population_label, gen_time_label, pop_stability_label, initial_pop_label, final_pop_label # Need widgets
+    global generation_digital_label, state_digital_label, population_label, gen_time_label, pop_stability_label, initial_pop_label, final_pop_label, census_label, births_deaths_label, bounding_box_label # Need widgets
 
     # Check if widgets exist before configuring
     if generation_digital_label is None: return
+    now = time.perf_counter()
+    if throttle and now < labels_next_refresh: return
+    labels_next_refresh = now + LABEL_REFRESH_INTERVAL
+    t = profiler.start()
 
     generation_digital_label.config(text=f"{generation_count:06d}")
     state_digital_label.config(text=f"{simulation_state.upper()}")
 
     population_label.config(text=f"Population: {population_count}")
-    if generation_time_history:
-        avg_gen_time = sum(generation_time_history) / len(generation_time_history)
-        gen_time_label.config(text=f"Avg Gen Time: {avg_gen_time:.3f}s")
+    if len(generation_times):
+        gen_time_label.config(text=f"Avg Gen Time: {generation_times.mean:.3f}s")
     else:
         gen_time_label.config(text="Avg Gen Time: N/A")
 
-    if len(live_cell_count_history) > 1:
-        pop_std_dev = np.std(list(live_cell_count_history))
-        pop_stability_label.config(text=f"Pop Stability (StdDev): {pop_std_dev:.2f}")
+    history = population_stats.history
+    if len(history) > 1:
+        pop_stability_label.config(text=f"Pop Stability (StdDev): {history.std:.2f} (Mean {history.mean:.1f})")
     else:
         pop_stability_label.config(text="Pop Stability (StdDev): N/A")
+    births_deaths_label.config(text=f"Births / Deaths: +{population_stats.births} / -{population_stats.deaths}")
+    box = population_stats.bounding_box(grid)
+    if box is None:
+        bounding_box_label.config(text="Bounding Box: N/A")
+    else:
+        top, left, bottom, right = box
+        bounding_box_label.config(text=f"Bounding Box: {right - left + 1}x{bottom - top + 1} at ({top}, {left})")
 
     state_colors = {
         "Paused": "grey", "Running": "#20A020", "Stable": "#3030C0",
-        "Dead": "#C03030", "Oscillating": "#D08000", "Running Challenge": "#20A020",
+        "Dead": "#C03030", "Oscillating": "#D08000", "Spaceship": "#A040C0", "Running Challenge": "#20A020",
         "PLACE PATTERN": "blue" # Added state for challenge setup
     }
     state_digital_label.config(fg=state_colors.get(simulation_state, "black"))
+    update_timeline_controls()
 
-    if challenge_initial_population > 0 and simulation_state in ["Stable", "Dead", "Oscillating"] and not challenge_mode_active:
+    if challenge_initial_population > 0 and simulation_state in END_STATES and not challenge_mode_active:
         initial_pop_label.config(text=f"Challenge Initial Pop: {challenge_initial_population}")
         final_pop_label.config(text=f"Challenge Final Pop: {challenge_final_population}")
+        census_label.config(text=f"Objects: {format_census(challenge_census, limit=4)}" if challenge_census is not None else "")
     else:
         initial_pop_label.config(text="")
         final_pop_label.config(text="")
+        census_label.config(text="")
+    profiler.mark("labels", t)
+    update_profile_panel()
+
+def update_profile_panel(force=False):
+    """Shows the phase percentiles, at most every PROFILE_REFRESH_INTERVAL seconds."""
+    global profile_next_refresh
+    if profile_label is None or not profiler.enabled: return
+    now = time.perf_counter()
+    if not force and now < profile_next_refresh: return
+    profile_next_refresh = now + PROFILE_REFRESH_INTERVAL
+    profile_label.config(text=profiler.format_table())
+
+def toggle_profiling():
+    """Switches per-phase timing on (with fresh samples) or off."""
+    global profiler
+    stop_sim_thread() # A running background simulation keeps the profiler it was started with
+    profiler = PhaseProfiler() if profiling_enabled.get() else NULL_PROFILER
+    if profile_label is not None:
+        profile_label.config(text=profiler.format_table())
+
+def dump_profile():
+    """Asks for a file name and writes the phase timings and histograms as JSON."""
+    if not profiler.enabled:
+        print("Profiling is off; enable \"Profile Phases\" first.")
+        return
+    path = filedialog.asksaveasfilename(title="Save Profile", defaultextension=".json", filetypes=[("JSON", "*.json")])
+    if not path: return
+    try:
+        profiler.dump(path)
+        print(f"Saved phase timings to '{path}'.")
+    except OSError as e:
+        print(f"Error: Could not save '{path}': {e}")
+
+def sync_sparse_tracker():
+    """Returns the sparse engine's tracker, rebuilding it if the grid was replaced."""
+    global sparse_tracker, sparse_tracker_grid, grid, wrap_edges
+    wrap = wrap_edges.get()
+    if (sparse_tracker is None or grid is not sparse_tracker_grid or sparse_tracker.wrap_edges != wrap
+            or sparse_tracker.rule != active_rule):
+        sparse_tracker = ActiveTileGrid(grid, wrap, rule=active_rule)
+        sparse_tracker_grid = sparse_tracker.grid
+        grid = sparse_tracker_grid
+    return sparse_tracker
+
+def sync_step_buffers():
+    """
+    Returns the spare board for the in-place engine, (re)allocating it and the
+    scratch arrays only when the board size changed or the spare is in use elsewhere.
+    """
+    global spare_grid, step_scratch, step_changed
+    if step_scratch is None or step_scratch.shape != grid.shape:
+        step_scratch = StepScratch(grid.shape)
+        step_changed = np.empty(grid.shape, dtype=bool)
+    if spare_grid is None or spare_grid.shape != grid.shape or spare_grid is grid \
+            or spare_grid is sparse_tracker_grid or spare_grid is chunked_board_view:
+        spare_grid = np.empty_like(grid)
+    return spare_grid
+
+def sync_chunked_board():
+    """
+    Returns the unbounded engine's plane, rebuilding it from the grid if the
+    grid was replaced (reset, load) since the board last produced it.
+    """
+    global chunked_board, chunked_board_view
+    if chunked_board is None or grid is not chunked_board_view:
+        chunked_board = ChunkedBoard(grid, rule=active_rule)
+        chunked_board_view = grid
+    elif chunked_board.rule != active_rule:
+        chunked_board.set_rule(active_rule)
+    return chunked_board
+
+def background_stepping_selected():
+    """True if the selected speed runs the engine in a background thread."""
+    return speed_name is not None and SPEED_OPTIONS.get(speed_name.get(), 0) != 0
+
+def start_sim_thread():
+    """Starts advancing the current grid in a background SimulationThread."""
+    global sim_thread, sim_thread_base_generation, initial_run_grid, initial_run_generation, initial_run_population
+    if initial_run_grid is None:
+        initial_run_grid = grid.copy()
+        initial_run_generation = generation_count
+        initial_run_population = population_count
+    engine = engine_name.get() if engine_name.get() in ENGINE_NAMES else DEFAULT_ENGINE
+    board = sync_chunked_board() if engine == CHUNKED_ENGINE else None # Keep the cells outside the window
+    simulation = Simulation(grid, wrap_edges.get(), engine, MAX_HISTORY_SIZE, rule=active_rule, board=board,
+                            timeline=timeline, timeline_start=generation_count,
+                            profiler=profiler if profiler.enabled else None,
+                            population_stats=population_stats.copy()) # Continues the rolling statistics
+    sim_thread_base_generation = generation_count
+    sim_thread = SimulationThread(simulation, SPEED_OPTIONS[speed_name.get()])
+    sim_thread.start()
+
+def stop_sim_thread():
+    """Stops the background thread, if any, and adopts its last generation."""
+    global sim_thread, chunked_board_view
+    if sim_thread is None: return
+    thread, sim_thread = sim_thread, None
+    apply_snapshot(thread.stop())
+    if thread.simulation.board is not None:
+        chunked_board_view = grid # The snapshot is the board's current window
+    cycle_detector.clear() # The main-loop detector did not see these generations
+
+def apply_snapshot(snapshot):
+    """Makes a generation published by the background thread the current grid."""
+    global grid, generation_count, population_count, population_stats
+    grid = snapshot.grid
+    generation_count = sim_thread_base_generation + snapshot.generation
+    population_count = snapshot.population
+    population_stats = snapshot.stats # Updated by the thread for every generation, drawn or not
+    if snapshot.generation:
+        generation_times.add(snapshot.elapsed / snapshot.generation)
+    draw_grid()
+
+def poll_sim_thread():
+    """Renders the newest background generation and handles the end of the run."""
+    global sim_thread, paused, simulation_state, chunked_board_view
+    if sim_thread.finished:
+        thread, sim_thread = sim_thread, None
+        snapshot = thread.final_snapshot
+        apply_snapshot(snapshot)
+        if thread.simulation.board is not None:
+            chunked_board_view = grid # The snapshot is the board's current window
+        if snapshot.state in END_STATES:
+            paused = True
+            simulation_state = snapshot.state
+            if snapshot.state in ("Oscillating", "Spaceship"):
+                report_recurrence(thread.simulation.cycle_detector)
+            update_info_labels()
+            handle_end_state()
+            return
+    else:
+        snapshot = sim_thread.take_latest()
+        if snapshot is None: return
+        apply_snapshot(snapshot)
+    update_info_labels(throttle=True)
+
+def report_recurrence(detector):
+    """Prints the oscillation or spaceship a CycleDetector found."""
+    if detector.moving:
+        velocity = describe_velocity(detector.displacement, detector.period)
+        print(f"Spaceship detected! Moves {detector.displacement} every {detector.period} generations ({velocity}), "
+              f"entered after {detector.pre_period} generations")
+    else:
+        print(f"Oscillation detected! Period {detector.period}, entered after {detector.pre_period} generations")
+
+def handle_end_state():
+    """Updates the controls (and challenge mode) after a run reached an end state."""
+    global challenge_final_population, challenge_census
+    if pause_button: # Check if pause_button exists
+        pause_button.config(text="Resume")
+    if challenge_mode_active and challenge_pattern_placed and simulation_state in END_STATES:
+        print(f"Challenge ended: {simulation_state}")
+        challenge_final_population = population_count
+        wrap = wrap_edges.get() and not (chunked_board is not None and grid is chunked_board_view)
+        challenge_census = census(grid, wrap, active_rule)
+        print(f"Final objects: {format_census(challenge_census)}")
+        end_challenge_mode(display_results=True)
+
+def describe_rule(rulestring):
+    """Returns the preset name of a rulestring, or "Custom"."""
+    for preset_name, preset_rule in RULE_PRESETS.items():
+        if preset_rule == rulestring: return preset_name
+    return "Custom"
+
+def apply_rule(event=None):
+    """Validates the rule selector text and makes it the active rule."""
+    global active_rule
+    if rule_name is None: return
+    try:
+        new_rule = format_rule(*parse_rule(rule_name.get()))
+    except ValueError as e:
+        print(f"Warning: {e} Keeping {active_rule}.")
+        rule_name.set(active_rule)
+        return
+    rule_name.set(new_rule)
+    if rule_description_label: rule_description_label.config(text=describe_rule(new_rule))
+    if new_rule == active_rule: return
+    print(f"Rule changed to {new_rule} ({describe_rule(new_rule)})")
+    active_rule = new_rule
+    cycle_detector.clear() # States seen under the old rule don't form cycles under the new one
+    stop_sim_thread() # animation_step restarts it with the new rule
+
+def on_speed_change(event=None):
+    """Applies a new speed selection to a running background thread."""
+    if sim_thread is None: return
+    if background_stepping_selected():
+        sim_thread.target_rate = SPEED_OPTIONS[speed_name.get()]
+    else:
+        stop_sim_thread() # animation_step continues on the main loop
 
 def animation_step():
     """Performs one step of the simulation and updates state."""
-    global grid, paused, generation_count, simulation_state, previous_grid_state_for_stable_check, population_count, initial_run_grid, initial_run_generation, previous_grid_states, live_cell_count_history, generation_time_history, wrap_edges # Add wrap_edges
-    global root, canvas, canvas_rects # Need root and canvas
+    global grid, paused, generation_count, simulation_state, population_count, initial_run_grid, initial_run_generation, initial_run_population, wrap_edges # Add wrap_edges
+    global root, canvas, engine_name # Need root and canvas
+    global chunked_board_view, spare_grid
 
     if root is None or canvas is None: return # Exit if UI not ready
 
     if paused:
-        if simulation_state not in ["Stable", "Dead", "Oscillating", "PLACE PATTERN"]: # Keep PLACE PATTERN state
+        stop_sim_thread()
+        if simulation_state not in END_STATES + ("PLACE PATTERN", "Paused"): # Keep PLACE PATTERN state
              simulation_state = "Paused"
-        update_info_labels()
+             update_info_labels() # Otherwise nothing changes while paused
         root.after(UPDATE_INTERVAL, animation_step)
         return
 
+    # Background stepping: only render the newest generation at the frame rate
+    if sim_thread is None and background_stepping_selected():
+        start_sim_thread()
+    if sim_thread is not None:
+        poll_sim_thread()
+        root.after(FRAME_INTERVAL, animation_step)
+        return
+
     start_time = time.perf_counter()
 
     if initial_run_grid is None:
         initial_run_grid = grid.copy()
         initial_run_generation = generation_count
+        initial_run_population = population_count
 
+    if timeline.last_generation != generation_count: # First step, or resuming from an earlier generation
+        timeline.record(generation_count, grid)
     generation_count += 1
     # Keep "Running Challenge" state if active
     if not (challenge_mode_active and challenge_pattern_placed):
         simulation_state = "Running"
 
-    current_grid_bytes = grid.tobytes()
-    previous_grid_state_for_stable_check = grid.copy()
-
-    # Use imported game logic function - pass wrap_edges state
-    new_grid = update_grid_logic(grid, wrap_edges.get())
+    if not cycle_detector.started:
+        cycle_detector.start(grid, generation_count - 1)
+
+    t = profiler.start()
+    unbounded = engine_name.get() == CHUNKED_ENGINE
+    if unbounded:
+        # Cells leaving the window live on in the plane; the grid only shows the window
+        board = sync_chunked_board()
+        changes = board.step()
+        new_grid = board.get_grid(grid.shape)
+        chunked_board_view = new_grid
+        t = profiler.mark("step", t)
+        rows, cols = np.nonzero(new_grid != grid)
+        t = profiler.mark("diff", t)
+    elif engine_name.get() == INPLACE_ENGINE:
+        # Write into the spare board; the old grid becomes the spare of the next step
+        new_grid = sync_step_buffers()
+        update_grid_into(grid, new_grid, step_scratch, wrap_edges.get(), active_rule)
+        t = profiler.mark("step", t)
+        np.not_equal(new_grid, grid, out=step_changed)
+        rows, cols = np.nonzero(step_changed) # Sized by the changes only
+        spare_grid = grid
+        t = profiler.mark("diff", t)
+    elif engine_name.get() == SPARSE_ENGINE:
+        # Population, stability and the changed cells come from the per-tile deltas
+        tracker = sync_sparse_tracker()
+        tracker.step()
+        new_grid = sparse_tracker_grid
+        rows, cols = tracker.changed_rows, tracker.changed_cols
+        t = profiler.mark("step", t)
+    else:
+        # Use the selected engine - pass wrap_edges state
+        update_function = ENGINES.get(engine_name.get(), update_grid_logic)
+        new_grid = update_function(grid, wrap_edges.get(), active_rule)
+        t = profiler.mark("step", t)
+        rows, cols = np.nonzero(new_grid != grid)
+        t = profiler.mark("diff", t)
+    # Population and stats follow from the births and deaths; the plane's population includes cells off the window
+    alive = new_grid[rows, cols]
+    population_stats.apply(rows, cols, alive, board.population if unbounded else None)
+    current_population = population_stats.population
+    t = profiler.mark("population", t)
+    grid_unchanged = changes == 0 if unbounded else len(rows) == 0
 
     # --- Check for End States ---
-    current_population = np.sum(new_grid)
     is_stable = False
     is_dead = False
     is_oscillating = False
@@ -193,70 +525,84 @@ def animation_step():
         is_dead = True
         simulation_state = "Dead"
         paused = True
-    elif np.array_equal(new_grid, previous_grid_state_for_stable_check):
+    elif grid_unchanged:
         is_stable = True
         simulation_state = "Stable"
         paused = True
-    else:
-        new_grid_bytes = new_grid.tobytes()
-        if new_grid_bytes in previous_grid_states:
-             is_oscillating = True
-             simulation_state = "Oscillating"
-             paused = True
-             print(f"Oscillation detected!")
-        previous_grid_states.append(current_grid_bytes)
+    elif not unbounded and cycle_detector.update(rows, cols, generation_count, alive): # The plane has no fixed shape to hash
+        is_oscillating = True
+        simulation_state = "Spaceship" if cycle_detector.moving else "Oscillating"
+        paused = True
+        report_recurrence(cycle_detector)
+    t = profiler.mark("end_state", t)
 
     # --- Update Grid, Stats and UI ---
+    timeline.record(generation_count, new_grid, rows * new_grid.shape[1] + cols)
+    profiler.mark("timeline", t)
     grid = new_grid
     population_count = current_population
-    live_cell_count_history.append(population_count)
     end_time = time.perf_counter()
-    generation_time_history.append(end_time - start_time)
+    generation_times.add(end_time - start_time)
 
-    update_info_labels()
-    if paused and pause_button: # Check if pause_button exists
-        pause_button.config(text="Resume")
+    update_info_labels(throttle=not paused) # An end state is shown right away
 
-    # Update canvas
-    diff = grid != previous_grid_state_for_stable_check
-    rows, cols = np.where(diff)
-    needs_full_redraw = False
-    for r, c in zip(rows, cols):
-         if 0 <= r < GRID_SIZE and 0 <= c < GRID_SIZE:
-            rect = canvas_rects[r][c]
-            if rect is not None:
-                color = "black" if grid[r, c] == 1 else "white"
-                try:
-                    if canvas.winfo_exists() and rect in canvas.find_all():
-                        canvas.itemconfig(rect, fill=color)
-                    else:
-                        canvas_rects[r][c] = None
-                        needs_full_redraw = True
-                except tk.TclError:
-                    canvas_rects[r][c] = None
-                    needs_full_redraw = True
-            else:
-                 needs_full_redraw = True
-
-    if needs_full_redraw:
-        draw_grid(canvas.winfo_width(), canvas.winfo_height())
-
-    # --- Handle Challenge Mode End ---
-    if paused and challenge_mode_active and challenge_pattern_placed and simulation_state in ["Stable", "Dead", "Oscillating"]:
-        print(f"Challenge ended: {simulation_state}")
-        global challenge_final_population
-        challenge_final_population = population_count
-        end_challenge_mode(display_results=True)
+    # Update canvas (one image swap per frame, skipped if nothing changed)
+    if len(rows) > 0:
+        draw_grid()
+
+    # --- Handle End States (incl. Challenge Mode End) ---
+    if paused:
+        handle_end_state()
 
     # Schedule next step
     root.after(UPDATE_INTERVAL, animation_step)
 
 
+def update_timeline_controls():
+    """Fits the scrub bar to the recorded generations and moves it to the current one."""
+    global timeline_updating
+    if timeline_scale is None: return
+    first, last = timeline.first_generation, timeline.last_generation
+    if first is None:
+        first = last = generation_count
+    timeline_updating = True
+    timeline_scale.config(from_=first, to=max(last, first + 1)) # A zero-length scale cannot be dragged
+    timeline_scale.set(generation_count)
+    timeline_updating = False
+    state = tk.DISABLED if challenge_mode_active else tk.NORMAL
+    timeline_back_button.config(state=state if generation_count - 1 in timeline else tk.DISABLED)
+    timeline_forward_button.config(state=state if generation_count + 1 in timeline else tk.DISABLED)
+    timeline_scale.state(["disabled"] if challenge_mode_active or len(timeline) < 2 else ["!disabled"])
+    stored = (timeline.memory_bytes + timeline.spilled_bytes) / (1024 * 1024)
+    timeline_label.config(text=f"History: {first}-{last} ({stored:.1f} MB)")
+
+def scrub_to(generation):
+    """Pauses and shows a recorded generation; resuming continues from it (discarding later ones)."""
+    global grid, generation_count, population_count, paused, simulation_state
+    if challenge_mode_active or generation not in timeline: return
+    stop_sim_thread()
+    paused = True
+    simulation_state = "Paused"
+    grid = timeline.get(generation)
+    generation_count = generation
+    population_stats.reset(grid)
+    population_count = population_stats.population
+    cycle_detector.clear() # Oscillation detection restarts from this generation
+    if pause_button: pause_button.config(text="Resume")
+    update_info_labels()
+    draw_grid()
+
+def on_timeline_scale(value):
+    if timeline_updating: return
+    generation = int(round(float(value)))
+    if generation != generation_count:
+        scrub_to(generation)
+
 def pause_resume():
-    global paused, simulation_state, initial_run_grid, previous_grid_states, previous_grid_state_for_stable_check
+    global paused, simulation_state, initial_run_grid
     global pause_button # Need widget
 
-    if paused and simulation_state in ["Stable", "Dead", "Oscillating"]:
+    if paused and simulation_state in END_STATES:
         print(f"Cannot resume, simulation ended ({simulation_state})")
         return
 
@@ -264,8 +610,7 @@ def pause_resume():
 
     if not paused:
         simulation_state = "Running Challenge" if challenge_mode_active else "Running"
-        previous_grid_states.clear()
-        previous_grid_state_for_stable_check = None
+        cycle_detector.clear()
         initial_run_grid = None
         print("Simulation Resumed")
     else:
@@ -278,9 +623,10 @@ def pause_resume():
     update_info_labels()
 
 def reset_run():
-    global grid, paused, generation_count, simulation_state, previous_grid_state_for_stable_check, initial_run_grid, initial_run_generation, population_count, live_cell_count_history, generation_time_history, previous_grid_states
+    global grid, paused, generation_count, simulation_state, initial_run_grid, initial_run_generation, initial_run_population, population_count
     global canvas # Need canvas
 
+    stop_sim_thread()
     if initial_run_grid is None:
         print("No previous run state to reset to. Performing full reset instead.")
         full_reset_simulation()
@@ -294,15 +640,14 @@ def reset_run():
 
     grid = initial_run_grid.copy()
     generation_count = initial_run_generation
-    population_count = np.sum(grid)
+    population_count = initial_run_population
+    population_stats.reset(grid, population_count) # Known from the start of the run; no need to re-count
     paused = True
     simulation_state = "Paused"
-    previous_grid_states.clear()
-    previous_grid_state_for_stable_check = None
+    cycle_detector.clear()
     initial_run_grid = None
     initial_run_generation = 0
-    live_cell_count_history.clear()
-    generation_time_history.clear()
+    generation_times.clear()
 
     if pause_button: pause_button.config(text="Resume")
     cancel_selection()
@@ -310,72 +655,102 @@ def reset_run():
     if canvas: draw_grid(canvas.winfo_width(), canvas.winfo_height())
 
 def full_reset_simulation():
-    global grid, paused, generation_count, simulation_state, previous_grid_state_for_stable_check, canvas_rects, initial_run_grid, initial_run_generation, population_count, live_cell_count_history, generation_time_history, previous_grid_states
+    global grid, paused, generation_count, simulation_state, initial_run_grid, initial_run_generation, population_count
     global canvas, pause_button # Need widgets
 
     print("Performing full grid reset.")
+    stop_sim_thread()
+    timeline.clear()
     grid = initialize_grid(GRID_SIZE) # Use imported function with updated GRID_SIZE
-    canvas_rects = [[None for _ in range(GRID_SIZE)] for _ in range(GRID_SIZE)] # Use new GRID_SIZE
     paused = True
     generation_count = 0
     population_count = 0
+    population_stats.reset(grid, population_count)
     simulation_state = "Paused"
-    previous_grid_states.clear()
-    previous_grid_state_for_stable_check = None
+    cycle_detector.clear()
     initial_run_grid = None
     initial_run_generation = 0
-    live_cell_count_history.clear()
-    generation_time_history.clear()
+    generation_times.clear()
 
     if pause_button: pause_button.config(text="Resume")
     cancel_selection()
     # Don't call update_info_labels here, let caller handle it if needed
     if canvas: draw_grid(canvas.winfo_width(), canvas.winfo_height())
 
+PATTERN_FILE_TYPES = [
+    ("RLE", "*.rle"),
+    ("Plaintext", "*.cells *.txt"),
+    ("Life 1.06", "*.lif *.life"),
+    ("Macrocell", "*.mc"),
+    ("All files", "*.*"),
+]
+
+def pattern_filter():
+    """Returns the (query, category) the pattern list is filtered by."""
+    query = pattern_search.get().strip() if pattern_search else ""
+    category = pattern_category.get() if pattern_category else ALL_CATEGORIES
+    return query, (None if category == ALL_CATEGORIES else category)
+
+def load_board():
+    """Asks for a pattern file and loads it centered onto a cleared board."""
+    global grid, population_count
+    path = filedialog.askopenfilename(title="Load Pattern", filetypes=PATTERN_FILE_TYPES)
+    if not path: return
+    info = {}
+    try:
+        pattern = read_pattern(path, info=info)
+    except (OSError, ValueError) as e:
+        print(f"Error: Could not load '{path}': {e}")
+        return
+    if pattern.shape[0] > GRID_SIZE or pattern.shape[1] > GRID_SIZE:
+        print(f"Warning: Pattern of shape {pattern.shape} is larger than the {GRID_SIZE}x{GRID_SIZE} board and was clipped.")
+
+    full_reset_simulation()
+    # Centre the pattern; anything outside the board is dropped
+    population_stats.paste(grid, pattern, (GRID_SIZE - pattern.shape[0]) // 2, (GRID_SIZE - pattern.shape[1]) // 2)
+    population_count = population_stats.population
+    if "rule" in info and rule_name is not None:
+        rule_name.set(info["rule"])
+        apply_rule()
+    print(f"Loaded '{path}' ({population_count} live cells).")
+    update_info_labels()
+    if canvas: draw_grid(canvas.winfo_width(), canvas.winfo_height())
+
+def save_board():
+    """Asks for a file name and saves the current board in the format given by its extension."""
+    path = filedialog.asksaveasfilename(title="Save Board", defaultextension=".rle", filetypes=PATTERN_FILE_TYPES)
+    if not path: return
+    if os.path.splitext(path)[1].lower() not in FORMATS:
+        path += ".rle"
+    try:
+        write_pattern(path, grid, rule=active_rule)
+    except OSError as e:
+        print(f"Error: Could not save '{path}': {e}")
+        return
+    print(f"Saved board to '{path}'.")
+
 
 # --- Pattern Selection / Placement Functions ---
 
 def clear_ghost_pattern():
-    global ghost_pattern_ids, canvas # Need canvas
-    if canvas and canvas.winfo_exists():
-        for item_id in ghost_pattern_ids:
-            try:
-                 if item_id in canvas.find_all():
-                     canvas.delete(item_id)
-            except tk.TclError: pass
-    ghost_pattern_ids = []
+    if ghost_image is not None and canvas and canvas.winfo_exists():
+        ghost_image.hide()
 
 def update_ghost_position(event):
-    global ghost_pattern_ids, last_mouse_event, selected_pattern_array, CELL_SIZE, canvas # Need canvas
-    clear_ghost_pattern()
+    """Moves the pattern preview to the cell under the mouse (the image is only rebuilt on rotation or zoom)."""
+    global last_mouse_event
     last_mouse_event = event
 
-    if selected_pattern_array is not None and CELL_SIZE > 0 and canvas:
-        canvas_x = event.x
-        canvas_y = event.y
-        col = int(canvas_x // CELL_SIZE)
-        row = int(canvas_y // CELL_SIZE)
-
-        pattern_height, pattern_width = selected_pattern_array.shape
-        new_ghost_ids = []
-        for r_offset in range(pattern_height):
-            for c_offset in range(pattern_width):
-                if selected_pattern_array[r_offset, c_offset] == 1:
-                    target_row, target_col = row + r_offset, col + c_offset
-                    if 0 <= target_row < GRID_SIZE and 0 <= target_col < GRID_SIZE:
-                        x0, y0 = target_col * CELL_SIZE, target_row * CELL_SIZE
-                        x1, y1 = x0 + CELL_SIZE, y0 + CELL_SIZE
-                        rect_id = canvas.create_rectangle(x0, y0, x1, y1,
-                                                          fill="blue", outline="lightblue",
-                                                          stipple="gray50", width=1, tags="ghost")
-                        new_ghost_ids.append(rect_id)
-        ghost_pattern_ids = new_ghost_ids
-        if ghost_pattern_ids:
-            canvas.tag_raise("ghost")
+    if selected_pattern_array is not None and canvas and ghost_image is not None:
+        row, col = viewport.canvas_to_cell(event.x, event.y)
+        try:
+            ghost_image.show(selected_pattern_array, viewport, row, col)
+        except tk.TclError as e:
+            print(f"Could not draw pattern preview: {e}")
 
 def select_pattern(event, pattern_name):
     global selected_pattern_name, selected_pattern_array, last_mouse_event, canvas, root # Need canvas, root
-    pattern = get_pattern(pattern_name)
+    pattern = pattern_library.get(pattern_name)
     if pattern is not None:
         if selected_pattern_name == pattern_name:
              cancel_selection()
@@ -407,42 +782,33 @@ def select_pattern(event, pattern_name):
                  update_ghost_position(fake_event)
 
 def place_pattern(event):
-    global selected_pattern_name, selected_pattern_array, grid, population_count, CELL_SIZE, canvas, canvas_rects
+    global selected_pattern_name, selected_pattern_array, grid, population_count, canvas
     global challenge_mode_active, challenge_pattern_placed, challenge_initial_population, paused, simulation_state
     global pause_button # Need widget
 
-    if selected_pattern_name and selected_pattern_array is not None and CELL_SIZE > 0 and canvas:
-        canvas_x = event.x
-        canvas_y = event.y
-        col = int(canvas_x // CELL_SIZE)
-        row = int(canvas_y // CELL_SIZE)
+    if selected_pattern_name and selected_pattern_array is not None and canvas:
+        row, col = viewport.canvas_to_cell(event.x, event.y)
 
+        stop_sim_thread() # Edit the latest generation; animation_step restarts the thread
         print(f"Placed {selected_pattern_name} at grid ({row}, {col})")
 
-        pattern_height, pattern_width = selected_pattern_array.shape
-        redraw_required = False
-        cells_changed = False # Track if any cell *actually* changed state
-
-        for r_offset in range(pattern_height):
-            for c_offset in range(pattern_width):
-                target_row, target_col = row + r_offset, col + c_offset
-                # Place pattern only within grid boundaries
-                if 0 <= target_row < GRID_SIZE and 0 <= target_col < GRID_SIZE:
-                    # Get the value from the pattern array (0 or 1)
-                    pattern_value = selected_pattern_array[r_offset, c_offset]
-                    # Check if the grid cell needs to be updated
-                    if grid[target_row, target_col] != pattern_value:
-                        grid[target_row, target_col] = pattern_value # Overwrite grid cell
-                        cells_changed = True
-                        # Update the specific cell on the canvas immediately
-                        new_color = "black" if pattern_value == 1 else "white"
-                        if canvas_rects[target_row][target_col] is not None:
-                             try: canvas.itemconfig(canvas_rects[target_row][target_col], fill=new_color)
-                             except tk.TclError: redraw_required = True # Mark for full redraw if error
-                        else: redraw_required = True # Mark for full redraw if rect doesn't exist
+        # On a wrapping board the pattern wraps too; the unbounded plane's window is clipped
+        wrap = wrap_edges.get() and not (chunked_board is not None and grid is chunked_board_view)
+        cells_changed = population_stats.paste(grid, selected_pattern_array, row, col, wrap) > 0
+
+        if cells_changed:
+            population_count = population_stats.population # Counted from the cells under the pattern
+            cycle_detector.clear() # The board was edited outside of stepping
+            timeline.record(generation_count, grid) # Replaces this generation and drops the ones after it
+            if sparse_tracker is not None and grid is sparse_tracker_grid:
+                for r0, c0, r1, c1, _, _ in placement_rects(grid.shape, selected_pattern_array.shape, row, col, wrap):
+                    sparse_tracker.mark_dirty(r0, c0, r1, c1)
+        if chunked_board is not None and grid is chunked_board_view:
+            # The plane also keeps the part of the pattern outside the window
+            chunked_board.paste(selected_pattern_array, row, col)
+            population_count = population_stats.population = chunked_board.population
 
         if cells_changed:
-            population_count = np.sum(grid) # Update population count immediately
 
             # --- Handle Challenge Mode Pattern Placement ---
             if challenge_mode_active and not challenge_pattern_placed:
@@ -455,10 +821,7 @@ def place_pattern(event):
                     pause_button.config(text="Pause", state=tk.NORMAL) # Enable and set text
 
             update_info_labels() # Update display
-
-        if redraw_required:
-            # If itemconfig failed, redraw the whole grid to be safe
-            draw_grid(canvas.winfo_width(), canvas.winfo_height())
+            draw_grid() # Show the placed pattern
 
         cancel_selection()
 
@@ -493,7 +856,7 @@ def toggle_challenge_mode():
         cancel_challenge_mode()
 
 def start_challenge_mode():
-    global challenge_mode_active, challenge_pattern_placed, challenge_initial_population, challenge_final_population, paused, simulation_state
+    global challenge_mode_active, challenge_pattern_placed, challenge_initial_population, challenge_final_population, challenge_census, paused, simulation_state
     global challenge_button, pause_button, reset_run_button, full_reset_button, state_digital_label # Need widgets
 
     print("Starting Pattern Challenge Mode.")
@@ -501,6 +864,7 @@ def start_challenge_mode():
     challenge_pattern_placed = False
     challenge_initial_population = 0
     challenge_final_population = 0
+    challenge_census = None
     paused = True
 
     full_reset_simulation() # Reset board and state first
@@ -519,7 +883,7 @@ def start_challenge_mode():
 def end_challenge_mode(display_results=True):
     global challenge_mode_active, challenge_pattern_placed, paused
     global challenge_button, pause_button, reset_run_button, full_reset_button # Need widgets
-    global challenge_initial_population, challenge_final_population # Need state vars
+    global challenge_initial_population, challenge_final_population, challenge_census # Need state vars
 
     challenge_mode_active = False
     challenge_pattern_placed = False
@@ -537,6 +901,7 @@ def end_challenge_mode(display_results=True):
     else:
         challenge_initial_population = 0
         challenge_final_population = 0
+        challenge_census = None
         update_info_labels() # Clear results display
 
 def cancel_challenge_mode():
@@ -544,28 +909,25 @@ def cancel_challenge_mode():
     end_challenge_mode(display_results=False)
     full_reset_simulation() # Also reset the grid
 
-# --- Pattern Categories ---
-PATTERN_CATEGORIES = {
-    "Still Lifes": ["Block", "Beehive", "Loaf", "Boat", "Tub"],
-    "Oscillators": ["Blinker", "Toad", "Beacon", "Pulsar", "Pentadecathlon"], # Removed Figure Eight
-    "Spaceships": [
-        "Glider", "Lightweight Spaceship (LWSS)", "Middleweight Spaceship (MWSS)",
-        "Heavyweight Spaceship (HWSS)", "Spider" # Replaced Copperhead with Spider
-        ],
-    "Guns": ["Gosper Glider Gun"], # Removed Simkin Glider Gun
-    "Methuselahs": ["R-pentomino", "Diehard", "Acorn", "Bunnies", "Thunderbird", "Figure Eight"] # Added Figure Eight
-}
-
 # --- Main Application Setup ---
 
 def build_gui(root_widget):
     """Builds the Tkinter GUI layout."""
-    global root, canvas, pause_button, reset_run_button, full_reset_button, challenge_button
-    global generation_digital_label, state_digital_label, population_label, gen_time_label, pop_stability_label, initial_pop_label, final_pop_label, wrap_edges_checkbox # Assign widgets
-    global wrap_edges # Need the variable itself
+    global root, canvas, grid_renderer, ghost_image, pause_button, reset_run_button, full_reset_button, challenge_button, load_button, save_button
+    global generation_digital_label, state_digital_label, population_label, gen_time_label, pop_stability_label, initial_pop_label, final_pop_label, census_label, births_deaths_label, bounding_box_label, wrap_edges_checkbox # Assign widgets
+    global wrap_edges, engine_name, engine_combobox, speed_name, speed_combobox # Need the variable itself
+    global rule_name, rule_combobox, rule_description_label, density_shading
+    global pattern_search, pattern_category, pattern_list
+    global timeline_scale, timeline_label, timeline_back_button, timeline_forward_button
+    global profiling_enabled, profile_label
 
     root = root_widget # Assign the main window passed in
     wrap_edges = tk.BooleanVar(value=True) # INITIALIZE HERE, after root exists
+    engine_name = tk.StringVar(value=DEFAULT_ENGINE)
+    speed_name = tk.StringVar(value=DEFAULT_SPEED)
+    rule_name = tk.StringVar(value=active_rule)
+    density_shading = tk.BooleanVar(value=False)
+    profiling_enabled = tk.BooleanVar(value=False)
 
     try:
         if root.tk.call('tk', 'windowingsystem') == 'win32': root.state('zoomed')
@@ -585,8 +947,16 @@ def build_gui(root_widget):
 
     canvas = tk.Canvas(canvas_frame, bg="white", highlightthickness=0)
     canvas.pack(fill=tk.BOTH, expand=True)
+    grid_renderer = GridImageRenderer(canvas)
+    ghost_image = GhostImage(canvas)
     canvas_frame.bind("<Configure>", handle_resize)
     canvas.bind("<Button-1>", place_pattern)
+    canvas.bind("<MouseWheel>", zoom_view)
+    canvas.bind("<Button-4>", lambda e: zoom_view(e, 1)) # X11 wheel up
+    canvas.bind("<Button-5>", lambda e: zoom_view(e, -1)) # X11 wheel down
+    canvas.bind("<ButtonPress-2>", start_pan)
+    canvas.bind("<B2-Motion>", drag_pan)
+    root.bind("<Home>", fit_view)
 
     control_frame_outer = tk.Frame(main_pane, width=300)
     control_frame_outer.pack_propagate(False)
@@ -607,10 +977,52 @@ def build_gui(root_widget):
     full_reset_button = ttk.Button(top_button_frame, text="Full Reset", command=full_reset_simulation)
     full_reset_button.pack(side=tk.LEFT, fill=tk.X, expand=True)
 
+    # --- Board File Buttons ---
+    file_button_frame = tk.Frame(control_frame)
+    file_button_frame.pack(side=tk.TOP, fill=tk.X, pady=(0, 5))
+    load_button = ttk.Button(file_button_frame, text="Load Pattern...", command=load_board)
+    load_button.pack(side=tk.LEFT, padx=(0, 5), fill=tk.X, expand=True)
+    save_button = ttk.Button(file_button_frame, text="Save Board...", command=save_board)
+    save_button.pack(side=tk.LEFT, fill=tk.X, expand=True)
+
     # --- Edge Wrap Checkbox ---
     wrap_edges_checkbox = ttk.Checkbutton(control_frame, text="Wrap Edges", variable=wrap_edges, onvalue=True, offvalue=False)
     wrap_edges_checkbox.pack(side=tk.TOP, pady=(5, 5), anchor='w') # Place below top buttons
 
+    # --- View Options (wheel zooms, middle-drag pans, Home fits the board) ---
+    view_frame = tk.Frame(control_frame)
+    view_frame.pack(side=tk.TOP, fill=tk.X, pady=(0, 5))
+    ttk.Checkbutton(view_frame, text="Density Shading", variable=density_shading, onvalue=True, offvalue=False,
+                    command=draw_grid).pack(side=tk.LEFT)
+    ttk.Button(view_frame, text="Fit View", command=fit_view).pack(side=tk.RIGHT)
+
+    # --- Engine Selector ---
+    engine_frame = tk.Frame(control_frame)
+    engine_frame.pack(side=tk.TOP, fill=tk.X, pady=(0, 5))
+    ttk.Label(engine_frame, text="Engine:").pack(side=tk.LEFT, padx=(0, 5))
+    engine_combobox = ttk.Combobox(engine_frame, textvariable=engine_name, values=ENGINE_NAMES, state="readonly", width=14)
+    engine_combobox.pack(side=tk.LEFT, fill=tk.X, expand=True)
+
+    # --- Speed Selector ---
+    speed_frame = tk.Frame(control_frame)
+    speed_frame.pack(side=tk.TOP, fill=tk.X, pady=(0, 5))
+    ttk.Label(speed_frame, text="Speed:").pack(side=tk.LEFT, padx=(0, 5))
+    speed_combobox = ttk.Combobox(speed_frame, textvariable=speed_name, values=list(SPEED_OPTIONS.keys()), state="readonly", width=14)
+    speed_combobox.pack(side=tk.LEFT, fill=tk.X, expand=True)
+    speed_combobox.bind("<<ComboboxSelected>>", on_speed_change)
+
+    # --- Rule Selector (presets or any typed B/S rulestring) ---
+    rule_frame = tk.Frame(control_frame)
+    rule_frame.pack(side=tk.TOP, fill=tk.X, pady=(0, 5))
+    ttk.Label(rule_frame, text="Rule:").pack(side=tk.LEFT, padx=(0, 5))
+    rule_combobox = ttk.Combobox(rule_frame, textvariable=rule_name, values=list(RULE_PRESETS.values()), width=14)
+    rule_combobox.pack(side=tk.LEFT, fill=tk.X, expand=True)
+    rule_description_label = ttk.Label(rule_frame, text=describe_rule(active_rule), width=14)
+    rule_description_label.pack(side=tk.LEFT, padx=(5, 0))
+    rule_combobox.bind("<<ComboboxSelected>>", apply_rule)
+    rule_combobox.bind("<Return>", apply_rule)
+    rule_combobox.bind("<FocusOut>", apply_rule)
+
     # --- Digital Status Display ---
     status_display_frame = tk.LabelFrame(control_frame, text="Status", relief="ridge", borderwidth=2, padx=5, pady=5)
     status_display_frame.pack(side=tk.TOP, fill=tk.X, pady=(0, 10))
@@ -624,6 +1036,19 @@ def build_gui(root_widget):
     state_digital_label = tk.Label(status_display_frame, text="PAUSED", font=digital_font, anchor="center", fg="grey", bg="lightgrey", relief="sunken", bd=2)
     state_digital_label.grid(row=1, column=0, sticky="ew")
 
+    # --- History (step back/forward through recorded generations or drag to any of them) ---
+    timeline_frame = tk.LabelFrame(control_frame, text="History", relief="ridge", borderwidth=2, padx=5, pady=5)
+    timeline_frame.pack(side=tk.TOP, fill=tk.X, pady=(0, 10))
+    timeline_back_button = ttk.Button(timeline_frame, text="<", width=3, command=lambda: scrub_to(generation_count - 1))
+    timeline_back_button.grid(row=0, column=0)
+    timeline_scale = ttk.Scale(timeline_frame, orient=tk.HORIZONTAL, from_=0, to=1, command=on_timeline_scale)
+    timeline_scale.grid(row=0, column=1, sticky="ew", padx=5)
+    timeline_forward_button = ttk.Button(timeline_frame, text=">", width=3, command=lambda: scrub_to(generation_count + 1))
+    timeline_forward_button.grid(row=0, column=2)
+    timeline_label = ttk.Label(timeline_frame, text="History: empty")
+    timeline_label.grid(row=1, column=0, columnspan=3, sticky="w")
+    timeline_frame.columnconfigure(1, weight=1)
+
     # --- Stats Panel ---
     stats_panel_frame = tk.LabelFrame(control_frame, text="Statistics", relief="ridge", borderwidth=2, padx=5, pady=5)
     stats_panel_frame.pack(side=tk.TOP, fill=tk.X, pady=(0, 10))
@@ -634,66 +1059,52 @@ def build_gui(root_widget):
     gen_time_label.pack(fill=tk.X)
     pop_stability_label = tk.Label(stats_panel_frame, text="Pop Stability (StdDev): N/A", font=stats_font, anchor="w")
     pop_stability_label.pack(fill=tk.X)
+    births_deaths_label = tk.Label(stats_panel_frame, text="Births / Deaths: N/A", font=stats_font, anchor="w")
+    births_deaths_label.pack(fill=tk.X)
+    bounding_box_label = tk.Label(stats_panel_frame, text="Bounding Box: N/A", font=stats_font, anchor="w")
+    bounding_box_label.pack(fill=tk.X)
     initial_pop_label = tk.Label(stats_panel_frame, text="", font=stats_font, anchor="w", fg="blue")
     initial_pop_label.pack(fill=tk.X)
     final_pop_label = tk.Label(stats_panel_frame, text="", font=stats_font, anchor="w", fg="blue")
     final_pop_label.pack(fill=tk.X)
-
-    # --- Pattern Area ---
-    patterns_area_frame = tk.Frame(control_frame)
+    census_label = tk.Label(stats_panel_frame, text="", font=stats_font, anchor="w", fg="blue")
+    census_label.pack(fill=tk.X)
+
+    # --- Profiling Panel (per-phase p50/p95/p99 of the simulation loop, collapsed by default) ---
+    profile_panel = CollapsibleFrame(control_frame, title="Profiling", start_expanded=False)
+    profile_panel.pack(side=tk.TOP, fill=tk.X, pady=(0, 10))
+    profile_content = profile_panel.get_content_frame()
+    profile_options = tk.Frame(profile_content)
+    profile_options.pack(fill=tk.X)
+    ttk.Checkbutton(profile_options, text="Profile Phases", variable=profiling_enabled, onvalue=True, offvalue=False,
+                    command=toggle_profiling).pack(side=tk.LEFT)
+    ttk.Button(profile_options, text="Save JSON...", command=dump_profile).pack(side=tk.RIGHT)
+    profile_label = tk.Label(profile_content, text=profiler.format_table(), font="TkFixedFont", anchor="w", justify=tk.LEFT)
+    profile_label.pack(fill=tk.X)
+
+    # --- Pattern Library (search, category filter and a list that only draws visible rows) ---
+    patterns_area_frame = tk.LabelFrame(control_frame, text="Patterns", relief="ridge", borderwidth=2, padx=5, pady=5)
     patterns_area_frame.pack(side=tk.TOP, fill=tk.BOTH, expand=True)
-    patterns_area_frame.columnconfigure(0, weight=1, uniform="col")
-    patterns_area_frame.columnconfigure(1, weight=1, uniform="col")
-    column1_frame = tk.Frame(patterns_area_frame)
-    column1_frame.grid(row=0, column=0, sticky="nsew", padx=(0, 1))
-    column2_frame = tk.Frame(patterns_area_frame)
-    column2_frame.grid(row=0, column=1, sticky="nsew", padx=(1, 0))
-
-    # --- Populate Patterns ---
-    column_index = 0
-    all_pattern_names = get_pattern_names()
-    for category_title, pattern_names_in_category in PATTERN_CATEGORIES.items():
-        target_column = column1_frame if column_index % 2 == 0 else column2_frame
-        column_index += 1
-
-        # Use imported CollapsibleFrame
-        collapsible = CollapsibleFrame(target_column, title=category_title, start_expanded=True)
-        collapsible.pack(fill=tk.X, pady=(1, 0))
-        category_content_frame = collapsible.get_content_frame()
-
-        for name in pattern_names_in_category:
-            if name not in all_pattern_names:
-                print(f"Warning: Pattern '{name}' in category '{category_title}' not found. Skipping.")
-                continue
-            pattern_array = get_pattern(name)
-            if pattern_array is None: continue
-
-            entry_frame = tk.Frame(category_content_frame, relief="groove", borderwidth=1)
-            entry_frame.pack(fill=tk.X, padx=1, pady=0)
-            entry_frame.columnconfigure(1, weight=1)
-
-            preview_canvas = tk.Canvas(entry_frame, width=PREVIEW_CANVAS_SIZE, height=PREVIEW_CANVAS_SIZE, bg="white", highlightthickness=0)
-            preview_canvas.grid(row=0, column=0, padx=(1, 3), pady=1, sticky="w")
-
-            # Use imported draw_pattern_preview
-            draw_pattern_preview(preview_canvas, pattern_array, PREVIEW_CANVAS_SIZE)
-
-            lbl = ttk.Label(entry_frame, text=name, anchor="w", cursor="hand2")
-            lbl.grid(row=0, column=1, sticky="ew")
-
-            click_handler = lambda event, p=name: select_pattern(event, p)
-            entry_frame.bind("<Button-1>", click_handler)
-            preview_canvas.bind("<Button-1>", click_handler)
-            lbl.bind("<Button-1>", click_handler)
-
-            def on_enter(e, frame=entry_frame): frame.config(bg="lightblue")
-            def on_leave(e, frame=entry_frame): frame.config(bg=category_content_frame.cget("bg"))
-            entry_frame.bind("<Enter>", on_enter)
-            entry_frame.bind("<Leave>", on_leave)
-            preview_canvas.bind("<Enter>", lambda e, f=entry_frame: on_enter(e, f))
-            preview_canvas.bind("<Leave>", lambda e, f=entry_frame: on_leave(e, f))
-            lbl.bind("<Enter>", lambda e, f=entry_frame: on_enter(e, f))
-            lbl.bind("<Leave>", lambda e, f=entry_frame: on_leave(e, f))
+    filter_frame = tk.Frame(patterns_area_frame)
+    filter_frame.pack(side=tk.TOP, fill=tk.X, pady=(0, 5))
+    pattern_search = tk.StringVar()
+    pattern_category = tk.StringVar(value=ALL_CATEGORIES)
+    search_entry = ttk.Entry(filter_frame, textvariable=pattern_search)
+    search_entry.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=(0, 5))
+    category_combobox = ttk.Combobox(filter_frame, textvariable=pattern_category, state="readonly", width=12,
+                                     postcommand=lambda: category_combobox.config(values=[ALL_CATEGORIES] + pattern_library.categories()))
+    category_combobox.pack(side=tk.LEFT)
+
+    pattern_list = VirtualPatternList(patterns_area_frame, count_rows=lambda: pattern_library.count(*pattern_filter()),
+                                      fetch_rows=lambda offset, limit: pattern_library.search(*pattern_filter(), offset, limit),
+                                      get_pattern=pattern_library.get, on_select=select_pattern,
+                                      row_height=PREVIEW_CANVAS_SIZE + 2,
+                                      preview_cache=PreviewCache(PREVIEW_CACHE_DIR))
+    pattern_list.pack(side=tk.TOP, fill=tk.BOTH, expand=True)
+    pattern_search.trace_add("write", lambda *args: pattern_list.refresh())
+    category_combobox.bind("<<ComboboxSelected>>", lambda e: pattern_list.refresh())
+    # The library is indexed on the first query, once the window is up
+    root.after_idle(pattern_list.refresh)
 
 # --- Main Execution ---
 if __name__ == "__main__":
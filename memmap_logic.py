@@ -0,0 +1,174 @@
+import os
+import tempfile
+import weakref
+
+import numpy as np
+
+from game_logic import CONWAY_RULE, rule_mask, step_padded
+
+# Out-of-core boards.
+# Both generations of the board live in one memory-mapped file (after a small
+# header), so the operating system pages cells in and out as needed and the
+# board can be much larger than RAM. A generation is computed in horizontal
+# bands of rows: each band and its two halo rows are copied from the current
+# buffer into a preallocated padded scratch array, stepped with
+# game_logic.step_padded (neighbor sums with `out=` ufuncs into a preallocated
+# int32 array) and written to the other buffer. Reads and writes stream
+# through the file in order and no arrays are allocated while stepping.
+
+DEFAULT_BAND_BYTES = 8 * 1024 * 1024 # Target size of one band of cells
+HEADER_WORDS = 8 # int64 header: magic, rows, cols, current buffer, generation, population
+_MAGIC = 0x4C4946454D4D4150 # "LIFEMMAP"
+
+
+def _remove_file(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+class MemmapBoard:
+    """
+    Game of Life board whose double buffers are stored in a memory-mapped file.
+
+    Args:
+        shape (tuple): (rows, cols) of the board. Ignored when opening an
+                       existing file (mode "r+").
+        path (str): File holding the board, or None for a temporary file
+                    that is removed by `close`.
+        wrap_edges (bool): If True, edges wrap around (toroidal array).
+        rule (str): Life-like rulestring (see game_logic.parse_rule).
+        band_rows (int): Rows computed per band (default: about
+                         DEFAULT_BAND_BYTES of cells). Scratch memory is about
+                         7 bytes per cell of a band.
+        mode (str): "w+" to create a new, empty board (overwriting `path`),
+                    or "r+" to continue the board saved in `path`.
+    """
+
+    def __init__(self, shape=None, path=None, wrap_edges=True, rule=CONWAY_RULE, band_rows=None, mode="w+"):
+        if mode not in ("w+", "r+"):
+            raise ValueError(f"Unsupported mode '{mode}'. Use 'w+' or 'r+'.")
+        self._finalizer = None
+        if path is None:
+            if mode == "r+":
+                raise ValueError("Opening an existing board needs its path")
+            fd, path = tempfile.mkstemp(prefix="life_board_", suffix=".mmap")
+            os.close(fd)
+            self._finalizer = weakref.finalize(self, _remove_file, path)
+        self.path = path
+        self.wrap_edges = wrap_edges
+
+        if mode == "r+":
+            header = np.fromfile(path, dtype=np.int64, count=HEADER_WORDS)
+            if len(header) < HEADER_WORDS or header[0] != _MAGIC:
+                raise ValueError(f"'{path}' is not a memory-mapped board file")
+            shape = (int(header[1]), int(header[2]))
+        elif shape is None:
+            raise ValueError("A new board needs a shape")
+        self.shape = tuple(int(n) for n in shape)
+        rows, cols = self.shape
+
+        self._header = np.memmap(path, dtype=np.int64, mode=mode, shape=(HEADER_WORDS,))
+        if mode == "w+":
+            self._header[:] = (_MAGIC, rows, cols, 0, 0, 0, 0, 0)
+            self._header.flush()
+        header_bytes = HEADER_WORDS * 8
+        # A new file is sparse: untouched pages of dead cells take no disk space
+        self._buffers = np.memmap(path, dtype=np.int8, mode="r+", offset=header_bytes, shape=(2, rows, cols))
+
+        self.band_rows = max(1, min(rows, band_rows or DEFAULT_BAND_BYTES // max(1, cols)))
+        band = self.band_rows
+        self._padded = np.zeros((band + 2, cols + 2), dtype=np.int8) # Band with halo rows and columns
+        self._index = np.empty((band, cols), dtype=np.int32) # state * 9 + neighbors, then the next state
+        self._next = np.empty((band, cols), dtype=np.int8)
+        self._changed = np.empty((band, cols), dtype=bool)
+        self.changed = 0 # Cells that changed in the last generation
+        self.set_rule(rule)
+
+    # --- State ---
+
+    @property
+    def grid(self):
+        """The current generation (a view into the file, valid until the next step)."""
+        return self._buffers[self._header[3]]
+
+    @property
+    def generation(self):
+        return int(self._header[4])
+
+    @property
+    def population(self):
+        return int(self._header[5])
+
+    def set_rule(self, rule):
+        rule_mask(rule) # Validates the rulestring
+        self.rule = rule
+
+    def paste(self, pattern, row=0, col=0):
+        """Writes `pattern` (clipped to the board) into the current generation at (row, col)."""
+        pattern = np.asarray(pattern)
+        rows, cols = self.shape
+        r0, c0 = max(0, row), max(0, col)
+        r1, c1 = min(rows, row + pattern.shape[0]), min(cols, col + pattern.shape[1])
+        if r0 >= r1 or c0 >= c1: return
+        target = self.grid[r0:r1, c0:c1]
+        piece = pattern[r0 - row:r1 - row, c0 - col:c1 - col] != 0
+        self._header[5] += int(np.count_nonzero(piece)) - int(np.count_nonzero(target))
+        target[:] = piece
+
+    def flush(self):
+        """Writes the buffers and header to disk."""
+        self._buffers.flush()
+        self._header.flush()
+
+    def close(self):
+        """Flushes and unmaps the file (removing it if it is temporary)."""
+        if self._buffers is None: return
+        self.flush()
+        self._buffers = self._header = None
+        if self._finalizer is not None:
+            self._finalizer()
+
+    # --- Stepping ---
+
+    def _load_band(self, src, start, end):
+        """Copies rows [start, end) of `src` and their halo into the padded scratch band."""
+        rows, cols = self.shape
+        height = end - start
+        padded = self._padded
+        padded[1:height + 1, 1:cols + 1] = src[start:end]
+        if self.wrap_edges:
+            padded[0, 1:cols + 1] = src[(start - 1) % rows]
+            padded[height + 1, 1:cols + 1] = src[end % rows]
+            padded[:height + 2, 0] = padded[:height + 2, cols]
+            padded[:height + 2, cols + 1] = padded[:height + 2, 1]
+        else: # Halo columns stay zero; halo rows are zero beyond the board
+            padded[0, 1:cols + 1] = src[start - 1] if start > 0 else 0
+            padded[height + 1, 1:cols + 1] = src[end] if end < rows else 0
+
+    def step(self, generations=1):
+        """
+        Advances the board, streaming through the file one band at a time.
+
+        Returns:
+            int: Number of cells that changed in the last generation.
+        """
+        rows = self.shape[0]
+        for _ in range(generations):
+            current = int(self._header[3])
+            src, dst = self._buffers[current], self._buffers[1 - current]
+            population = changed = 0
+            for start in range(0, rows, self.band_rows):
+                end = min(rows, start + self.band_rows)
+                height = end - start
+                self._load_band(src, start, end)
+                new = self._next[:height]
+                step_padded(self._padded[:height + 2], new, self._index[:height], self.rule)
+                np.not_equal(new, self._padded[1:height + 1, 1:self.shape[1] + 1], out=self._changed[:height])
+                changed += int(np.count_nonzero(self._changed[:height]))
+                population += int(np.count_nonzero(new))
+                dst[start:end] = new
+            self._header[3:6] = (1 - current, self._header[4] + 1, population)
+            self.changed = changed
+        return self.changed
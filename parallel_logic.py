@@ -0,0 +1,198 @@
+import multiprocessing as mp
+import os
+import threading
+import time
+from multiprocessing import shared_memory
+from threading import BrokenBarrierError
+
+import numpy as np
+
+from game_logic import CONWAY_RULE, rule_table, update_grid_logic
+
+# Multi-core stepping over shared memory.
+# The board lives in two shared-memory buffers (current and next generation).
+# Each worker process owns a horizontal band of rows; every generation it
+# reads its band plus a one-row halo above and below from the current buffer
+# (the halo rows belong to the neighbouring bands, wrapping around when
+# wrap_edges is on) and writes the band's next state into the other buffer.
+# A barrier between generations makes the halo exchange safe.
+#
+# A worker that fails aborts both barriers, and a watchdog thread in the parent
+# aborts them when a worker process dies (killed by a signal or out of memory),
+# so nobody is left waiting forever: the parent's step() raises
+# BrokenBarrierError and the stepper can only be closed afterwards.
+
+_STOP = -1
+WATCHDOG_INTERVAL = 0.2 # Seconds between checks that the workers are alive
+
+
+def _band_bounds(rows, workers):
+    """Splits `rows` into `workers` contiguous (start, end) bands of near-equal size."""
+    edges = np.linspace(0, rows, workers + 1).astype(int)
+    return [(int(edges[i]), int(edges[i + 1])) for i in range(workers)]
+
+
+def _step_band(src, dst, start, end, wrap_edges, table):
+    """Computes rows [start, end) of the next generation from `src` into `dst`."""
+    rows = src.shape[0]
+    if wrap_edges:
+        above = src[(start - 1) % rows]
+        below = src[end % rows]
+    else:
+        above = src[start - 1] if start > 0 else np.zeros(src.shape[1], dtype=src.dtype)
+        below = src[end] if end < rows else np.zeros(src.shape[1], dtype=src.dtype)
+    extended = np.vstack((above, src[start:end], below))
+    # The halo rows are only used as neighbours; their own results are dropped
+    dst[start:end] = update_grid_logic(extended, wrap_edges, table)[1:-1]
+
+
+def _worker(names, shape, start, end, wrap_edges, table, control, sync, command):
+    """Worker process loop: waits for a command, steps its band, reports back."""
+    buffers = [shared_memory.SharedMemory(name=name) for name in names]
+    grids = [np.ndarray(shape, dtype=np.int8, buffer=shm.buf) for shm in buffers]
+    try:
+        while True:
+            control.wait()
+            generations, current = command[0], command[1]
+            if generations == _STOP:
+                break
+            for _ in range(generations):
+                _step_band(grids[current], grids[1 - current], start, end, wrap_edges, table)
+                current = 1 - current
+                sync.wait()  # Every band is finished before anyone reads the next halo
+            control.wait()
+    except BrokenBarrierError:
+        pass # Another process failed and aborted the barriers; it reports the error
+    except BaseException:
+        # Release the parent and the other workers instead of leaving them waiting
+        control.abort()
+        sync.abort()
+        raise
+    finally:
+        del grids
+        for shm in buffers:
+            shm.close()
+
+
+class ParallelStepper:
+    """
+    Steps a board on several processes, one horizontal band per worker.
+
+    Output is identical to game_logic.update_grid_logic.
+
+    Args:
+        grid (np.ndarray): Initial 2D array of 0/1 cells (copied into shared memory).
+        wrap_edges (bool): If True, edges wrap around (toroidal array).
+                           If False, edges are treated as dead cells.
+        workers (int): Number of worker processes (default: os.cpu_count()).
+                       Capped at the number of rows.
+        rule (str): Life-like rulestring (see game_logic.parse_rule).
+        timeout (float): Seconds a step may take before it is abandoned with
+                         BrokenBarrierError (default: no limit; dead workers
+                         are detected either way).
+    """
+
+    def __init__(self, grid, wrap_edges=True, workers=None, rule=CONWAY_RULE, timeout=None):
+        self.shape = grid.shape
+        self.wrap_edges = wrap_edges
+        self.rule = rule
+        table = np.array(rule_table(rule))
+        self.workers = max(1, min(workers or os.cpu_count() or 1, grid.shape[0]))
+        self.timeout = timeout
+        self.generation = 0
+        self._current = 0
+        self.broken = False
+
+        nbytes = max(1, grid.size)
+        self._shms = [shared_memory.SharedMemory(create=True, size=nbytes) for _ in range(2)]
+        self._grids = [np.ndarray(self.shape, dtype=np.int8, buffer=shm.buf) for shm in self._shms]
+        self._grids[0][:] = grid != 0
+        self._grids[1][:] = 0
+
+        ctx = mp.get_context()
+        self._control = ctx.Barrier(self.workers + 1)
+        self._sync = sync = ctx.Barrier(self.workers)
+        self._command = ctx.Array("q", 2, lock=False)  # (generations, current buffer)
+        names = [shm.name for shm in self._shms]
+        self._processes = [
+            ctx.Process(target=_worker, daemon=True,
+                        args=(names, self.shape, start, end, wrap_edges, table, self._control, sync, self._command))
+            for start, end in _band_bounds(self.shape[0], self.workers)
+        ]
+        for process in self._processes:
+            process.start()
+        self._stopping = threading.Event()
+        self._watchdog = threading.Thread(target=self._watch_workers, daemon=True)
+        self._watchdog.start()
+
+    def _watch_workers(self):
+        """Aborts the barriers as soon as a worker process has died."""
+        while not self._stopping.wait(WATCHDOG_INTERVAL):
+            if any(not process.is_alive() for process in self._processes):
+                self._control.abort()
+                self._sync.abort()
+                return
+
+    def _wait(self):
+        """Waits at the control barrier, raising BrokenBarrierError if a worker failed or died."""
+        start = time.monotonic()
+        try:
+            self._control.wait(self.timeout)
+        except BrokenBarrierError:
+            self.broken = True
+            # A timeout only breaks the control barrier; free the workers stuck at the other one
+            self._sync.abort()
+            if self.timeout is not None and time.monotonic() - start >= self.timeout:
+                raise BrokenBarrierError(f"Parallel step did not finish within {self.timeout} s") from None
+            raise BrokenBarrierError("A parallel worker failed or died during a step") from None
+
+    @property
+    def grid(self):
+        """The current generation (a view into shared memory, valid until the next step)."""
+        return self._grids[self._current]
+
+    @property
+    def previous_grid(self):
+        """The generation before the current one (after at least one step)."""
+        return self._grids[1 - self._current]
+
+    def step(self, generations=1):
+        """Advances the board by `generations` generations in parallel."""
+        if self.broken:
+            raise BrokenBarrierError("A parallel worker failed; close this stepper")
+        if generations <= 0:
+            return
+        self._command[0] = generations
+        self._command[1] = self._current
+        self._wait()  # Start
+        self._wait()  # Wait for all bands to finish
+        self._current = (self._current + generations) % 2
+        self.generation += generations
+
+    def close(self):
+        """Stops the workers and releases the shared memory."""
+        if self._processes is None:
+            return
+        self._stopping.set()
+        self._watchdog.join()
+        if not self.broken:
+            self._command[0] = _STOP
+            try:
+                self._wait()
+            except BrokenBarrierError:
+                pass
+        for process in self._processes:
+            if self.broken and process.is_alive():
+                process.terminate()
+            process.join()
+        self._processes = None
+        self._grids = [grid.copy() for grid in self._grids]  # Keep the last state readable
+        for shm in self._shms:
+            shm.close()
+            shm.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
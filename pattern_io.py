@@ -0,0 +1,518 @@
+import os
+import re
+
+import numpy as np
+
+from game_logic import CONWAY_RULE, format_rule, parse_rule
+from hashlife import HashLife
+
+# Pattern file import and export.
+# Supports the common Life file formats:
+#   - RLE (.rle): run-length encoded rows, e.g. "bo$2bo$3o!"
+#   - Plaintext (.cells, .txt): one line per row, "O"/"*" alive, "." dead
+#   - Life 1.06 (.lif, .life): one "x y" coordinate pair per live cell
+#   - Macrocell (.mc): Golly's quadtree format, read through hashlife.HashLife
+# Readers stream the file in fixed-size chunks and decode each chunk with
+# vectorized NumPy operations into arrays of (row, col) coordinates, which are
+# written straight into a preallocated grid. Memory use is bounded by the
+# chunk size rather than the file size.
+
+CHUNK_SIZE = 1 << 18 # Bytes read per chunk
+RLE_LINE_LENGTH = 70 # Maximum length of an RLE body line, as recommended by the format
+
+FORMATS = {
+    ".rle": "rle",
+    ".cells": "plaintext",
+    ".txt": "plaintext",
+    ".lif": "life106",
+    ".life": "life106",
+    ".mc": "macrocell",
+}
+
+_ABSOLUTE_FORMATS = ("life106", "macrocell") # Formats with (possibly negative) plane coordinates
+_RLE_HEADER = re.compile(rb"x\s*=\s*(\d+)\s*,\s*y\s*=\s*(\d+)(?:\s*,\s*rule\s*=\s*([^\s,]+))?", re.IGNORECASE)
+_COMMENT_LINE = re.compile(rb"(?m)^[ \t]*#.*$")
+_DEAD_TAGS = np.frombuffer(b"b.", dtype=np.uint8)
+
+
+def detect_format(path):
+    """
+    Returns the format name for a file path from its extension.
+
+    Raises:
+        ValueError: If the extension is not one of FORMATS.
+    """
+    ext = os.path.splitext(path)[1].lower()
+    if ext not in FORMATS:
+        raise ValueError(f"Unknown pattern file type '{ext}'. Supported: {', '.join(sorted(FORMATS))}")
+    return FORMATS[ext]
+
+
+def _normalize_rule(rulestring):
+    """Returns the canonical B/S form of a rulestring, or the input if it cannot be parsed."""
+    text = rulestring.split(":")[0] # Drop Golly's bounded-grid suffix, e.g. ":T100,100"
+    try:
+        return format_rule(*parse_rule(text))
+    except ValueError:
+        return rulestring
+
+
+def _expand_runs(rows, starts, counts):
+    """Expands horizontal runs (row, start col, length) into per-cell coordinates."""
+    total = int(counts.sum())
+    offsets = np.arange(total, dtype=np.int64) - np.repeat(np.cumsum(counts) - counts, counts)
+    return np.repeat(rows, counts), np.repeat(starts, counts) + offsets
+
+
+# --- Readers ---
+
+def _read_rle_header(f, info):
+    """Reads the comment and `x = ..., y = ...` header lines; returns any body bytes read past them."""
+    while True:
+        line = f.readline()
+        if not line:
+            return b""
+        stripped = line.strip()
+        if not stripped:
+            continue
+        if stripped.startswith(b"#"):
+            tag, text = stripped[1:2], stripped[2:].strip().decode("utf-8", "replace")
+            if tag == b"N":
+                info["name"] = text
+            elif tag in (b"C", b"c"):
+                info.setdefault("comments", []).append(text)
+            elif tag == b"O":
+                info["author"] = text
+            elif tag == b"r":
+                info["rule"] = _normalize_rule(text)
+            continue
+        match = _RLE_HEADER.match(stripped)
+        if match is None:
+            return line # No header: the line is already part of the body
+        info["width"], info["height"] = int(match.group(1)), int(match.group(2))
+        if match.group(3):
+            info["rule"] = _normalize_rule(match.group(3).decode())
+        return b""
+
+
+def _read_rle(f, info, chunk_size):
+    """
+    Decodes an RLE body chunk by chunk.
+
+    Each chunk is split into tags (`b`/`.` dead, `$` end of row, `!` end of
+    pattern, anything else alive) and the run counts in front of them. Rows and
+    columns of every run are derived with cumulative sums, so no Python code
+    runs per cell or per run.
+    """
+    carry = _read_rle_header(f, info)
+    row, col = 0, 0 # Position where the next run starts
+    while True:
+        chunk = f.read(chunk_size)
+        data = np.frombuffer(carry + chunk, dtype=np.uint8)
+        data = data[data > 32] # Whitespace is not significant
+        is_digit = (data >= 48) & (data <= 57)
+        tag_pos = np.flatnonzero(~is_digit)
+        # Digits after the last tag belong to a run count continued in the next chunk
+        end = tag_pos[-1] + 1 if len(tag_pos) else 0
+        carry = data[end:].tobytes()
+        tags = data[tag_pos]
+        finished = False
+        bang = np.flatnonzero(tags == ord("!"))
+        if len(bang):
+            tag_pos, tags, finished = tag_pos[:bang[0]], tags[:bang[0]], True
+
+        if len(tags):
+            # Run counts: each digit contributes digit * 10^(distance to its tag - 1)
+            digit_pos = np.flatnonzero(is_digit[:tag_pos[-1] + 1])
+            owner = np.searchsorted(tag_pos, digit_pos)
+            values = (data[digit_pos] - 48).astype(np.int64) * 10 ** (tag_pos[owner] - digit_pos - 1)
+            counts = np.bincount(owner, weights=values, minlength=len(tags)).astype(np.int64)
+            counts[np.bincount(owner, minlength=len(tags)) == 0] = 1
+
+            newline = tags == ord("$")
+            across = np.where(newline, 0, counts)
+            down = np.where(newline, counts, 0)
+            run_rows = row + np.cumsum(down) - down
+            x = np.cumsum(across) - across # Columns advanced since the start of the chunk
+            # Column offset of the last `$` before each run (-1 while still on the chunk's first row)
+            row_start = np.maximum.accumulate(np.where(newline, x, -1))
+            run_cols = np.where(row_start < 0, col + x, x - row_start)
+
+            alive = ~newline & ~np.isin(tags, _DEAD_TAGS)
+            if alive.any():
+                yield _expand_runs(run_rows[alive], run_cols[alive], counts[alive])
+
+            row += int(down.sum())
+            total = int(across.sum())
+            col = col + total if row_start[-1] < 0 else total - int(row_start[-1])
+        if finished or not chunk:
+            return
+
+
+def _read_plaintext(f, info, chunk_size):
+    """Decodes a plaintext grid chunk by chunk; lines starting with `!` or `#` are comments."""
+    carry = b""
+    row = 0
+    width = 0
+    while True:
+        chunk = f.read(chunk_size)
+        data = carry + chunk
+        if chunk:
+            cut = data.rfind(b"\n") + 1 # Keep the unfinished last line for the next chunk
+            data, carry = data[:cut], data[cut:]
+        elif data and not data.endswith(b"\n"):
+            data += b"\n"
+        if data:
+            b = np.frombuffer(data, dtype=np.uint8)
+            ends = np.flatnonzero(b == ord("\n"))
+            starts = np.concatenate(([0], ends[:-1] + 1))
+            first = b[starts]
+            is_row = (first != ord("!")) & (first != ord("#"))
+            line_rows = row + np.cumsum(is_row) - is_row
+
+            alive = np.flatnonzero((b == ord("O")) | (b == ord("*")) | (b == ord("1")))
+            line = np.searchsorted(ends, alive)
+            keep = is_row[line]
+            alive, line = alive[keep], line[keep]
+            if len(alive):
+                yield line_rows[line].astype(np.int64), (alive - starts[line]).astype(np.int64)
+
+            lengths = ends - starts
+            lengths -= (lengths > 0) & (b[np.maximum(ends - 1, 0)] == ord("\r"))
+            if is_row.any():
+                width = max(width, int(lengths[is_row].max()))
+            row += int(is_row.sum())
+        if not chunk:
+            break
+    info["width"], info["height"] = width, row
+
+
+def _read_life106(f, info, chunk_size):
+    """Decodes Life 1.06 `x y` coordinate pairs chunk by chunk (x is the column, y the row)."""
+    first_line = f.readline()
+    if first_line.strip().lower().startswith(b"#life 1.05"):
+        raise ValueError("Life 1.05 files are not supported; convert them to Life 1.06 or RLE")
+    carry = first_line
+    while True:
+        chunk = f.read(chunk_size)
+        data = carry + chunk
+        if chunk:
+            cut = data.rfind(b"\n") + 1
+            data, carry = data[:cut], data[cut:]
+        for match in _COMMENT_LINE.finditer(data):
+            text = match.group().strip()
+            if text[:2] in (b"#N", b"#D"):
+                info.setdefault("comments", []).append(text[2:].strip().decode("utf-8", "replace"))
+            elif text[:2] == b"#R":
+                info["rule"] = _normalize_rule(text[2:].strip().decode())
+        text = _COMMENT_LINE.sub(b"", data).strip()
+        # (fromstring parses whitespace-only input as a single 0)
+        values = np.fromstring(text, dtype=np.int64, sep=" ") if text else np.zeros(0, dtype=np.int64)
+        if len(values) % 2:
+            raise ValueError("Life 1.06 file contains a coordinate without a partner")
+        if len(values):
+            pairs = values.reshape(-1, 2)
+            yield pairs[:, 1].copy(), pairs[:, 0].copy()
+        if not chunk:
+            return
+
+
+def read_macrocell(path, max_nodes=None):
+    """
+    Loads a Macrocell (.mc) file into a HashLife universe without expanding it.
+
+    The root node is centred on (0, 0), as in Golly.
+
+    Returns:
+        tuple: (HashLife, info dict with "rule" and "generation" if present).
+    """
+    info = {}
+    life = None
+    nodes = [None] # Node 0 is the empty node of whatever level is asked for
+    with open(path, "rb") as f:
+        for raw in f:
+            line = raw.strip()
+            if not line or line.startswith(b"["):
+                continue
+            if line.startswith(b"#"):
+                text = line[2:].strip().decode("utf-8", "replace")
+                if line[1:2] == b"R":
+                    info["rule"] = _normalize_rule(text)
+                elif line[1:2] == b"G":
+                    info["generation"] = int(text)
+                elif line[1:2] in (b"C", b"N"):
+                    info.setdefault("comments", []).append(text)
+                continue
+            if life is None:
+                rule = info.get("rule", CONWAY_RULE)
+                try:
+                    life = HashLife(rule=rule) if max_nodes is None else HashLife(max_nodes, rule)
+                except ValueError: # Not a Life-like rule HashLife can step; keep the cells
+                    life = HashLife() if max_nodes is None else HashLife(max_nodes)
+            if line[:1] in b".*$":
+                # Level-3 leaf: up to 8 rows of '.'/'*', each terminated by '$'
+                block = np.zeros((8, 8), dtype=np.int8)
+                for r, cells in enumerate(line.split(b"$")[:8]):
+                    bits = np.frombuffer(cells[:8], dtype=np.uint8) == ord("*")
+                    block[r, :len(bits)] = bits
+                nodes.append(life.node_from_grid(block))
+            else:
+                level, *children = (int(v) for v in line.split()[:5])
+                if level <= 3:
+                    raise ValueError("Only two-state Macrocell files with 8x8 leaves are supported")
+                nodes.append(life.join(*(nodes[c] if c else life.empty(level - 1) for c in children)))
+    if life is None:
+        return HashLife(), info
+    life.root = nodes[-1]
+    half = 1 << (life.root.level - 1)
+    life.origin = (-half, -half)
+    life.generation = info.get("generation", 0)
+    return life, info
+
+
+def _read_macrocell(f, info, chunk_size):
+    life, mc_info = read_macrocell(f.name)
+    info.update(mc_info)
+    rows, cols = life.live_cells()
+    if len(rows):
+        yield rows, cols
+
+
+_READERS = {
+    "rle": _read_rle,
+    "plaintext": _read_plaintext,
+    "life106": _read_life106,
+    "macrocell": _read_macrocell,
+}
+
+
+def iter_cells(path, fmt=None, info=None, chunk_size=CHUNK_SIZE):
+    """
+    Streams the live cells of a pattern file.
+
+    Args:
+        path (str): Pattern file.
+        fmt (str): One of FORMATS' values; detected from the extension by default.
+        info (dict): Optional dict that receives the file's metadata ("width",
+                     "height", "rule", "name", "comments", ...) as it is read.
+        chunk_size (int): Bytes decoded at a time.
+
+    Yields:
+        tuple: (rows, cols) int64 arrays of live cells, one pair per chunk.
+               RLE and plaintext coordinates start at (0, 0) at the top-left
+               of the pattern; Life 1.06 and Macrocell use the file's own
+               (possibly negative) coordinates.
+    """
+    fmt = fmt or detect_format(path)
+    info = {} if info is None else info
+    with open(path, "rb") as f:
+        yield from _READERS[fmt](f, info, chunk_size)
+
+
+def _place(out, rows, cols, offset):
+    """Sets the given cells of `out` (shifted by offset) to 1, dropping cells outside it."""
+    rows = rows + offset[0]
+    cols = cols + offset[1]
+    inside = (rows >= 0) & (rows < out.shape[0]) & (cols >= 0) & (cols < out.shape[1])
+    out[rows[inside], cols[inside]] = 1
+
+
+def read_pattern(path, out=None, offset=(0, 0), fmt=None, info=None, chunk_size=CHUNK_SIZE):
+    """
+    Loads a pattern file into a dense grid.
+
+    Args:
+        path (str): Pattern file (.rle, .cells, .txt, .lif, .life or .mc).
+        out (np.ndarray): Optional preallocated grid to write the live cells
+                          into (cells falling outside it are dropped). Existing
+                          cells are kept.
+        offset (tuple): (row, col) added to the file coordinates when writing into `out`.
+        fmt (str): Format name; detected from the extension by default.
+        info (dict): Optional dict that receives the file's metadata.
+        chunk_size (int): Bytes decoded at a time.
+
+    Returns:
+        np.ndarray: `out`, or a new int8 grid just large enough for the
+                    pattern (or the size declared in an RLE header).
+    """
+    fmt = fmt or detect_format(path)
+    info = {} if info is None else info
+    chunks = iter_cells(path, fmt, info, chunk_size)
+    first = next(chunks, None) # Reads the header, if the format has one
+
+    if out is None and "width" not in info:
+        # Size unknown up front: gather the coordinates, then fit the grid around them
+        parts = [first] + list(chunks) if first is not None else []
+        rows = np.concatenate([p[0] for p in parts]) if parts else np.zeros(0, dtype=np.int64)
+        cols = np.concatenate([p[1] for p in parts]) if parts else np.zeros(0, dtype=np.int64)
+        # Absolute coordinates are shifted so the pattern's bounding box starts at (0, 0)
+        shift = len(rows) and fmt in _ABSOLUTE_FORMATS
+        top = int(rows.min()) if shift else 0
+        left = int(cols.min()) if shift else 0
+        height = max(info.get("height", 0), int(rows.max()) - top + 1 if len(rows) else 0)
+        width = max(info.get("width", 0), int(cols.max()) - left + 1 if len(cols) else 0)
+        out = np.zeros((height, width), dtype=np.int8)
+        _place(out, rows, cols, (-top, -left))
+        return out
+
+    if out is None:
+        out = np.zeros((info["height"], info["width"]), dtype=np.int8)
+    if first is not None:
+        _place(out, *first, offset)
+    for rows, cols in chunks:
+        _place(out, rows, cols, offset)
+    return out
+
+
+# --- Writers ---
+
+# Line breaks go before the first token starting in each window of this many
+# characters. Tokens are at most 20 characters, so lines stay within RLE_LINE_LENGTH.
+_RLE_WRAP = RLE_LINE_LENGTH - 20
+_POWERS_OF_TEN = 10 ** np.arange(19, dtype=np.int64)
+_RLE_TAGS = np.frombuffer(b"$bo", dtype=np.uint8)
+_RLE_BLOCK_CELLS = 1 << 22 # Cells encoded at a time
+
+
+class _RleEncoder:
+    """
+    Encodes RLE tokens (count, tag) into wrapped lines with vectorized NumPy
+    operations, keeping the line-wrapping position across calls.
+    """
+    def __init__(self, f):
+        self.f = f
+        self.written = 0 # Body characters written so far, excluding line breaks
+
+    def write(self, counts, tags):
+        digits = np.where(counts > 1, np.searchsorted(_POWERS_OF_TEN, counts, side="right"), 0)
+        lengths = digits + 1
+        starts = np.cumsum(lengths) - lengths
+        out = np.empty(int(lengths.sum()), dtype=np.uint8)
+        out[starts + digits] = tags
+        # Decimal digits of every count greater than 1, most significant first
+        token = np.repeat(np.arange(len(counts)), digits)
+        k = np.arange(len(token)) - np.repeat(np.cumsum(digits) - digits, digits)
+        out[starts[token] + k] = counts[token] // _POWERS_OF_TEN[digits[token] - 1 - k] % 10 + ord("0")
+
+        window = (self.written + starts) // _RLE_WRAP
+        previous = np.concatenate(([(self.written - 1) // _RLE_WRAP if self.written else 0], window[:-1]))
+        self.written += len(out)
+        self.f.write(np.insert(out, starts[window != previous], ord("\n")).tobytes())
+
+
+def write_rle(path, grid, rule=CONWAY_RULE, name=None):
+    """
+    Writes a grid as RLE. The header records the full grid size, so the board
+    is restored with the same dimensions.
+
+    The board is encoded a block of rows at a time: run boundaries come from
+    the row-wise difference of the cells, and each live run becomes up to three
+    tokens (row ends, dead gap, live run), so no Python code runs per run.
+    """
+    height, width = grid.shape
+    with open(path, "wb") as f:
+        if name:
+            f.write(f"#N {name}\n".encode())
+        f.write(f"x = {width}, y = {height}, rule = {rule}\n".encode())
+        encoder = _RleEncoder(f)
+        last_row, last_end = 0, 0 # Row and end column of the previous live run
+        block_rows = max(1, _RLE_BLOCK_CELLS // (width + 2))
+        for row0 in range(0, height, block_rows):
+            block = grid[row0:row0 + block_rows]
+            padded = np.zeros((block.shape[0], width + 2), dtype=np.int8)
+            padded[:, 1:-1] = block != 0
+            # Alternating run starts and (exclusive) ends, in row-major order
+            rows, cols = np.nonzero(np.diff(padded, axis=1))
+            if len(rows) == 0:
+                continue
+            run_rows = rows[0::2].astype(np.int64) + row0
+            run_starts, run_ends = cols[0::2].astype(np.int64), cols[1::2].astype(np.int64)
+            prev_rows = np.concatenate(([last_row], run_rows[:-1]))
+            prev_ends = np.concatenate(([last_end], run_ends[:-1]))
+            new_row = run_rows != prev_rows
+            counts = np.column_stack((run_rows - prev_rows,
+                                      run_starts - np.where(new_row, 0, prev_ends),
+                                      run_ends - run_starts)).ravel()
+            tags = np.tile(_RLE_TAGS, len(run_rows))
+            keep = counts > 0
+            encoder.write(counts[keep], tags[keep])
+            last_row, last_end = int(run_rows[-1]), int(run_ends[-1])
+        encoder.write(np.ones(1, dtype=np.int64), np.frombuffer(b"!", dtype=np.uint8))
+        f.write(b"\n")
+
+
+def write_plaintext(path, grid, name=None):
+    """Writes a grid as plaintext, one line of '.'/'O' per row."""
+    symbols = np.frombuffer(b".O", dtype=np.uint8)
+    with open(path, "wb") as f:
+        if name:
+            f.write(f"!Name: {name}\n".encode())
+        lines = np.empty((grid.shape[0], grid.shape[1] + 1), dtype=np.uint8)
+        lines[:, :-1] = symbols[(grid != 0).astype(np.intp)]
+        lines[:, -1] = ord("\n")
+        f.write(lines.tobytes())
+
+
+def write_life106(path, grid, rule=None):
+    """Writes the live cells of a grid as Life 1.06 `x y` pairs."""
+    rows, cols = np.nonzero(grid)
+    with open(path, "w") as f:
+        f.write("#Life 1.06\n")
+        if rule:
+            f.write(f"#R {rule}\n")
+        np.savetxt(f, np.column_stack((cols, rows)), fmt="%d")
+
+
+def write_macrocell(path, grid, rule=CONWAY_RULE):
+    """Writes a grid as a Macrocell quadtree; identical subtrees are written once."""
+    life = HashLife()
+    life.set_grid(grid)
+    index = {} # Node -> line number (1-based); empty nodes are 0
+    with open(path, "w") as f:
+        f.write("[M2] (GameOfLife)\n")
+        f.write(f"#R {rule}\n")
+
+        def visit(node):
+            if node.population == 0:
+                return 0
+            if node in index:
+                return index[node]
+            if node.level == 3:
+                block = np.zeros((8, 8), dtype=np.int8)
+                block[life.live_cells(node)] = 1
+                used = int(np.flatnonzero(block.any(axis=1))[-1]) + 1
+                rows = []
+                for cells in block[:used]:
+                    live = np.flatnonzero(cells)
+                    rows.append("".join("*" if c else "." for c in cells[:live[-1] + 1]) if len(live) else "")
+                f.write("$".join(rows) + "$\n")
+            else:
+                children = [visit(child) for child in (node.nw, node.ne, node.sw, node.se)]
+                f.write(f"{node.level} {' '.join(map(str, children))}\n")
+            index[node] = len(index) + 1
+            return index[node]
+
+        if visit(life.root) == 0:
+            f.write("$\n") # An empty pattern is a single empty leaf
+
+
+def write_pattern(path, grid, fmt=None, rule=CONWAY_RULE, name=None):
+    """
+    Saves a grid in the format given by `fmt` or the file extension.
+
+    Args:
+        path (str): Output file.
+        grid (np.ndarray): 2D array of 0/1 cells.
+        fmt (str): One of FORMATS' values; detected from the extension by default.
+        rule (str): Rulestring recorded in formats that support it.
+        name (str): Pattern name recorded in formats that support it.
+    """
+    fmt = fmt or detect_format(path)
+    if fmt == "rle":
+        write_rle(path, grid, rule, name)
+    elif fmt == "plaintext":
+        write_plaintext(path, grid, name)
+    elif fmt == "life106":
+        write_life106(path, grid, rule)
+    else:
+        write_macrocell(path, grid, rule)
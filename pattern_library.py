@@ -0,0 +1,283 @@
+import os
+import re
+import sqlite3
+from collections import OrderedDict, namedtuple
+
+import numpy as np
+
+from pattern_io import FORMATS, iter_cells, read_pattern
+
+# Indexed pattern library.
+# The built-in patterns of patterns.py and any pattern files found under the
+# library directories are described by rows of a SQLite index (name, category,
+# bounding box, population, period, tags). Nothing is read until the library is
+# first queried; after that only the index is consulted for listing and
+# searching, and the cell arrays themselves are decoded on demand and kept in a
+# small LRU cache. With an index file, unchanged pattern files are not decoded
+# again on the next start.
+
+DEFAULT_PATTERN_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "pattern_files")
+INDEX_FILE_NAME = "index.sqlite"
+DEFAULT_CACHE_SIZE = 256 # Decoded pattern arrays kept in memory
+OTHER_CATEGORY = "Other"
+
+PatternInfo = namedtuple("PatternInfo", ["name", "category", "width", "height", "population", "period", "tags", "source"])
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS patterns (
+    name TEXT PRIMARY KEY,
+    category TEXT NOT NULL,
+    source TEXT NOT NULL,
+    path TEXT,
+    mtime REAL,
+    size INTEGER,
+    width INTEGER NOT NULL,
+    height INTEGER NOT NULL,
+    population INTEGER NOT NULL,
+    period INTEGER,
+    tags TEXT NOT NULL,
+    rule TEXT
+);
+CREATE INDEX IF NOT EXISTS patterns_by_category ON patterns (category, name);
+CREATE UNIQUE INDEX IF NOT EXISTS patterns_by_path ON patterns (path);
+"""
+_INFO_COLUMNS = "name, category, width, height, population, period, tags, source"
+# "p30", "period 30" or "period: 30" in a pattern's name or comments
+_PERIOD = re.compile(r"\b(?:period\s*[=:]?\s*|p)(\d+)\b", re.IGNORECASE)
+_TAGS = re.compile(r"^\s*tags\s*:\s*(.*)$", re.IGNORECASE)
+
+
+def _to_info(row):
+    name, category, width, height, population, period, tags, source = row
+    return PatternInfo(name, category, width, height, population, period, tuple(t for t in tags.split(",") if t), source)
+
+
+def _like_pattern(text):
+    """Returns a SQL LIKE pattern matching `text` anywhere, with wildcards escaped."""
+    escaped = text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+class PatternLibrary:
+    """
+    Searchable collection of patterns backed by a SQLite index.
+
+    Args:
+        directories (list): Directories scanned (recursively) for pattern
+                            files in the formats of pattern_io. A file's
+                            category is its sub-directory below the library
+                            directory ("Other" at the top level).
+        index_path (str): SQLite file holding the index between runs, or None
+                          to keep it in memory and rebuild it on every start.
+        cache_size (int): Number of decoded pattern arrays kept in the LRU cache.
+        include_builtin (bool): Whether to include the patterns of patterns.py.
+    """
+
+    def __init__(self, directories=(), index_path=None, cache_size=DEFAULT_CACHE_SIZE, include_builtin=True):
+        self.directories = [os.path.abspath(d) for d in directories]
+        self.index_path = index_path
+        self.cache_size = cache_size
+        self.include_builtin = include_builtin
+        self._db = None
+        self._cache = OrderedDict() # name -> read-only int8 array, most recently used last
+
+    # --- Index ---
+
+    @property
+    def db(self):
+        """The SQLite connection; opening it indexes the library on first access."""
+        if self._db is None:
+            self._db = sqlite3.connect(self.index_path or ":memory:")
+            self._db.executescript(_SCHEMA)
+            self.refresh()
+        return self._db
+
+    def refresh(self):
+        """
+        Brings the index up to date: re-indexes the built-in patterns and any
+        pattern file that was added or changed, and drops removed files.
+        """
+        db = self._db if self._db is not None else self.db
+        with db:
+            db.execute("DELETE FROM patterns WHERE source = 'builtin'")
+            if self.include_builtin:
+                self._index_builtin(db)
+            self._index_files(db)
+        self._cache.clear()
+
+    def _index_builtin(self, db):
+        from patterns import PATTERN_CATEGORIES, PATTERN_PERIODS, patterns
+        categories = {name: category for category, names in PATTERN_CATEGORIES.items() for name in names}
+        rows = []
+        for name, array in patterns.items():
+            rows.append((name, categories.get(name, OTHER_CATEGORY), "builtin", None, None, None,
+                         array.shape[1], array.shape[0], int(np.count_nonzero(array)),
+                         PATTERN_PERIODS.get(name), "builtin", None))
+        # A pattern file may have claimed a built-in name while builtins were disabled
+        db.executemany("DELETE FROM patterns WHERE name = ?", [(row[0],) for row in rows])
+        db.executemany("INSERT INTO patterns VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+
+    def _index_files(self, db):
+        known = {path: (mtime, size) for path, mtime, size in
+                 db.execute("SELECT path, mtime, size FROM patterns WHERE source = 'file'")}
+        seen = set()
+        for directory in self.directories:
+            if not os.path.isdir(directory):
+                continue
+            for folder, _, files in os.walk(directory):
+                for file_name in sorted(files):
+                    if os.path.splitext(file_name)[1].lower() not in FORMATS:
+                        continue
+                    path = os.path.join(folder, file_name)
+                    stat = os.stat(path)
+                    seen.add(path)
+                    if known.get(path) == (stat.st_mtime, stat.st_size):
+                        continue # Unchanged since it was indexed
+                    try:
+                        row = self._describe_file(db, directory, path, stat)
+                    except (OSError, ValueError) as e:
+                        print(f"Warning: Skipping pattern file '{path}': {e}")
+                        continue
+                    db.execute("DELETE FROM patterns WHERE path = ?", (path,))
+                    db.execute("INSERT INTO patterns VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", row)
+        removed = [(path,) for path in known if path not in seen]
+        db.executemany("DELETE FROM patterns WHERE path = ?", removed)
+
+    def _describe_file(self, db, directory, path, stat):
+        """Decodes a pattern file once (streaming, without a dense grid) and returns its index row."""
+        info = {}
+        population = 0
+        min_row = min_col = None
+        for rows, cols in iter_cells(path, info=info):
+            population += len(rows)
+            low_row, low_col = int(rows.min()), int(cols.min())
+            high_row, high_col = int(rows.max()), int(cols.max())
+            if min_row is None:
+                min_row, min_col, max_row, max_col = low_row, low_col, high_row, high_col
+            else:
+                min_row, min_col = min(min_row, low_row), min(min_col, low_col)
+                max_row, max_col = max(max_row, high_row), max(max_col, high_col)
+        height = max_row - min_row + 1 if population else 0
+        width = max_col - min_col + 1 if population else 0
+
+        relative = os.path.relpath(path, directory)
+        folder = os.path.dirname(relative)
+        category = folder.replace(os.sep, "/") if folder else OTHER_CATEGORY
+        name = info.get("name") or os.path.splitext(os.path.basename(path))[0]
+        taken = db.execute("SELECT path FROM patterns WHERE name = ?", (name,)).fetchone()
+        if taken is not None and taken[0] != path:
+            name = f"{name} ({relative})"
+
+        comments = info.get("comments", [])
+        period_match = next((m for m in map(_PERIOD.search, [name] + comments) if m), None)
+        tags = [os.path.splitext(path)[1].lower().lstrip(".")]
+        for comment in comments:
+            match = _TAGS.match(comment)
+            if match:
+                tags += [t.strip().lower() for t in match.group(1).split(",") if t.strip()]
+        return (name, category, "file", path, stat.st_mtime, stat.st_size, width, height, population,
+                int(period_match.group(1)) if period_match else None, ",".join(tags), info.get("rule"))
+
+    # --- Queries ---
+
+    def _where(self, query, category):
+        clauses, params = [], []
+        if category:
+            clauses.append("category = ?")
+            params.append(category)
+        if query:
+            like = _like_pattern(query)
+            clauses.append("(name LIKE ? ESCAPE '\\' OR tags LIKE ? ESCAPE '\\')")
+            params += [like, like]
+        return (" WHERE " + " AND ".join(clauses) if clauses else ""), params
+
+    def search(self, query="", category=None, offset=0, limit=None):
+        """
+        Finds patterns whose name or tags contain `query` (case-insensitive).
+
+        Args:
+            query (str): Text to look for; empty matches everything.
+            category (str): Only return patterns of this category.
+            offset (int): Number of matches to skip (for paging).
+            limit (int): Maximum number of matches to return (default: all).
+
+        Returns:
+            list: PatternInfo tuples ordered by category, then name.
+        """
+        where, params = self._where(query, category)
+        sql = f"SELECT {_INFO_COLUMNS} FROM patterns{where} ORDER BY category, name LIMIT ? OFFSET ?"
+        rows = self.db.execute(sql, params + [-1 if limit is None else limit, offset])
+        return [_to_info(row) for row in rows]
+
+    def count(self, query="", category=None):
+        """Returns the number of patterns `search` would return without paging."""
+        where, params = self._where(query, category)
+        return self.db.execute(f"SELECT COUNT(*) FROM patterns{where}", params).fetchone()[0]
+
+    def categories(self):
+        """Returns the sorted list of categories."""
+        return [row[0] for row in self.db.execute("SELECT DISTINCT category FROM patterns ORDER BY category")]
+
+    def info(self, name):
+        """Returns the PatternInfo of a pattern, or None."""
+        row = self.db.execute(f"SELECT {_INFO_COLUMNS} FROM patterns WHERE name = ?", (name,)).fetchone()
+        return _to_info(row) if row else None
+
+    def names(self):
+        """Returns all pattern names, ordered like `search`."""
+        return [row[0] for row in self.db.execute("SELECT name FROM patterns ORDER BY category, name")]
+
+    def __len__(self):
+        return self.count()
+
+    def __contains__(self, name):
+        return self.info(name) is not None
+
+    # --- Pattern data ---
+
+    def get(self, name):
+        """
+        Returns the cells of a pattern, decoding it on first use.
+
+        Returns:
+            np.ndarray: Read-only 2D int8 array of 0/1 cells (copy it before
+                        modifying), or None if there is no such pattern.
+        """
+        array = self._cache.get(name)
+        if array is not None:
+            self._cache.move_to_end(name)
+            return array
+        row = self.db.execute("SELECT source, path FROM patterns WHERE name = ?", (name,)).fetchone()
+        if row is None:
+            return None
+        source, path = row
+        if source == "builtin":
+            from patterns import get_pattern
+            array = (get_pattern(name) != 0).astype(np.int8)
+        else:
+            array = read_pattern(path)
+        array.setflags(write=False) # Shared by every caller through the cache
+        self._cache[name] = array
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return array
+
+    def close(self):
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+
+_default_library = None
+
+
+def default_library():
+    """
+    Returns the shared library of the built-in patterns plus the files under
+    DEFAULT_PATTERN_DIR (indexed into DEFAULT_PATTERN_DIR/index.sqlite).
+    """
+    global _default_library
+    if _default_library is None:
+        index_path = os.path.join(DEFAULT_PATTERN_DIR, INDEX_FILE_NAME) if os.path.isdir(DEFAULT_PATTERN_DIR) else None
+        _default_library = PatternLibrary([DEFAULT_PATTERN_DIR], index_path)
+    return _default_library
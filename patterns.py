@@ -122,10 +122,13 @@ patterns = {
         [0,0,1]
     ]), # Common conduit form, can be complex
     "Queen Bee Shuttle": np.array([
-        [0,0,0,0,1,0],
-        [0,0,0,1,0,1],
-        [1,1,0,1,0,1],
-        [0,1,1,1,0,0]
+        [0,0,0,0,0,0,0,0,0,1,0,0,0,0,0,0,0,0,0,0,0,0],
+        [0,0,0,0,0,0,0,1,0,1,0,0,0,0,0,0,0,0,0,0,0,0],
+        [0,0,0,0,0,0,1,0,1,0,0,0,0,0,0,0,0,0,0,0,0,0],
+        [1,1,0,0,0,1,0,0,1,0,0,0,0,0,0,0,0,0,0,0,1,1],
+        [1,1,0,0,0,0,1,0,1,0,0,0,0,0,0,0,0,0,0,0,1,1],
+        [0,0,0,0,0,0,0,1,0,1,0,0,0,0,0,0,0,0,0,0,0,0],
+        [0,0,0,0,0,0,0,0,0,1,0,0,0,0,0,0,0,0,0,0,0,0]
     ]),
 
     # --- Added Patterns ---
@@ -139,26 +142,24 @@ patterns = {
 
     # REPLACED Simkin Glider Gun with Spider
     "Spider": np.array([
-        [0,0,1,1,0,0,0,0,0,0,1,1,0],
-        [0,1,0,1,0,0,1,0,1,0,0,0,0],
-        [0,0,1,1,0,1,1,0,0,0,0,0,0],
-        [0,0,0,1,1,0,1,1,0,0,0,0,0],
-        [0,0,0,1,0,0,0,1,0,0,0,0,0],
-        [0,0,1,1,0,0,0,1,1,0,0,0,0],
-        [1,0,0,1,0,0,1,0,0,1,0,0,0],
-        [1,0,0,1,0,0,1,0,0,1,0,0,0],
-        [1,1,0,0,1,1,0,0,1,1,0,0,0],
-        [0,0,0,0,0,1,0,0,0,0,0,0,0]
+        [0,0,0,0,0,0,0,0,0,1,0,0,0,0,0,0,0,1,0,0,0,0,0,0,0,0,0],
+        [0,0,0,1,1,0,1,0,1,0,1,1,0,0,0,1,1,0,1,0,1,0,1,1,0,0,0],
+        [1,1,1,0,1,0,1,1,1,0,0,0,0,0,0,0,0,0,1,1,1,0,1,0,1,1,1],
+        [1,0,0,0,1,0,1,0,0,0,0,0,1,0,1,0,0,0,0,0,1,0,1,0,0,0,1],
+        [0,0,0,0,1,1,0,0,0,0,0,0,1,0,1,0,0,0,0,0,0,1,1,0,0,0,0],
+        [0,1,1,0,0,0,0,0,0,0,0,0,1,0,1,0,0,0,0,0,0,0,0,0,1,1,0],
+        [0,1,1,0,1,1,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,1,1,0,1,1,0],
+        [0,0,0,0,0,1,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,1,0,0,0,0,0]
     ]),
 
     # ADDED Figure Eight
     "Figure Eight": np.array([
-        [1,1,0,0,1,1],
-        [1,0,0,1,0,1],
-        [0,1,0,1,0,1],
-        [1,0,1,0,1,0],
-        [1,0,1,0,0,1],
-        [1,1,0,0,1,1]
+        [1,1,1,0,0,0],
+        [1,1,1,0,0,0],
+        [1,1,1,0,0,0],
+        [0,0,0,1,1,1],
+        [0,0,0,1,1,1],
+        [0,0,0,1,1,1]
     ]),
 
     "Bunnies": np.array([
@@ -183,6 +184,27 @@ patterns = {
 
 }
 
+# Categories shown in the pattern library (patterns not listed here go under "Other")
+PATTERN_CATEGORIES = {
+    "Still Lifes": ["Block", "Beehive", "Loaf", "Boat", "Tub"],
+    "Oscillators": ["Blinker", "Toad", "Beacon", "Pulsar", "Pentadecathlon", "Figure Eight", "Queen Bee Shuttle"],
+    "Spaceships": [
+        "Glider", "Lightweight Spaceship (LWSS)", "Middleweight Spaceship (MWSS)",
+        "Heavyweight Spaceship (HWSS)", "Spider" # Replaced Copperhead with Spider
+        ],
+    "Guns": ["Gosper Glider Gun"], # Removed Simkin Glider Gun
+    "Methuselahs": ["R-pentomino", "Diehard", "Acorn", "Bunnies", "Thunderbird"]
+}
+
+# Known periods (generations until the pattern repeats, possibly displaced)
+PATTERN_PERIODS = {
+    "Block": 1, "Beehive": 1, "Loaf": 1, "Boat": 1, "Tub": 1,
+    "Blinker": 2, "Toad": 2, "Beacon": 2, "Pulsar": 3, "Pentadecathlon": 15,
+    "Glider": 4, "Lightweight Spaceship (LWSS)": 4, "Middleweight Spaceship (MWSS)": 4,
+    "Heavyweight Spaceship (HWSS)": 4, "Spider": 5,
+    "Figure Eight": 8, "Queen Bee Shuttle": 30,
+}
+
 def get_pattern(name):
     """Returns the NumPy array for a given pattern name."""
     return patterns.get(name)
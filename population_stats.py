@@ -0,0 +1,200 @@
+import copy
+from collections import deque
+from math import sqrt
+
+import numpy as np
+
+from game_logic import paste_pattern, placement_rects
+
+# Incremental board statistics.
+# The population, the births and deaths of the last generation and the
+# bounding box of the live cells are kept up to date from the cells each step
+# changed (the same rows, cols and new values the cycle detector gets), so
+# nothing has to re-count the whole board per generation. The bounding box
+# comes from per-row and per-column live-cell counts; when the board is
+# replaced without a list of changes they are only rebuilt the next time the
+# box is asked for. A headless Simulation keeps its own tracker, and the
+# background thread hands a copy of it over with each snapshot, so the GUI
+# shows every generation's statistics and not just the ones it draws.
+#
+# Rolling mean and standard deviation over the last few generations use
+# Welford's update, extended to a sliding window: adding a sample that
+# replaces the oldest one adjusts the mean and the sum of squared deviations
+# in O(1) instead of re-reading the window.
+
+STATS_WINDOW = 20 # Generations covered by the rolling statistics
+
+
+class RollingStats:
+    """
+    Mean and standard deviation of the last `window` samples.
+
+    Args:
+        window (int): Number of most recent samples covered.
+    """
+
+    def __init__(self, window=STATS_WINDOW):
+        self.window = window
+        self.clear()
+
+    def clear(self):
+        self._values = deque()
+        self.mean = 0.0
+        self._m2 = 0.0 # Sum of squared deviations from the mean
+
+    def __len__(self):
+        return len(self._values)
+
+    def add(self, value):
+        """Adds a sample, dropping the oldest one once the window is full."""
+        value = float(value)
+        values = self._values
+        if len(values) < self.window:
+            values.append(value)
+            delta = value - self.mean
+            self.mean += delta / len(values)
+            self._m2 += delta * (value - self.mean)
+            return
+        old = values.popleft()
+        values.append(value)
+        old_mean = self.mean
+        self.mean += (value - old) / len(values)
+        self._m2 += (value - old) * (value - self.mean + old - old_mean)
+        if self._m2 < 0.0: # Rounding when all samples are equal
+            self._m2 = 0.0
+
+    @property
+    def variance(self):
+        """Population variance of the samples in the window (0 for fewer than two)."""
+        return self._m2 / len(self._values) if len(self._values) > 1 else 0.0
+
+    @property
+    def std(self):
+        return sqrt(self.variance)
+
+
+class PopulationTracker:
+    """
+    Population, births, deaths and bounding box of a board, updated from the
+    cells that change.
+
+    Args:
+        grid (np.ndarray): Initial board (counted once), or None for an empty one.
+        window (int): Generations covered by `history` (rolling population stats).
+    """
+
+    def __init__(self, grid=None, window=STATS_WINDOW):
+        self.history = RollingStats(window)
+        self.reset(grid)
+
+    def reset(self, grid=None, population=None):
+        """
+        Starts over from a new board, forgetting the rolling statistics.
+
+        Args:
+            grid (np.ndarray): The board, or None for an empty one.
+            population (int): Live cells of `grid`, if already known; the
+                              board is then not re-counted (the bounding box
+                              is rebuilt when first asked for).
+        """
+        self.history.clear()
+        self.births = 0
+        self.deaths = 0
+        self.generations = 0
+        if grid is None:
+            self.population = 0
+            self._row_counts = self._col_counts = None
+            self._counts_valid = False
+        elif population is not None:
+            self.population = int(population)
+            self._counts_valid = False
+        else:
+            self._count(grid)
+            self.population = int(self._row_counts.sum())
+
+    def _count(self, grid):
+        """Rebuilds the row and column counts from the whole board."""
+        live = np.asarray(grid) != 0
+        self._row_counts = np.count_nonzero(live, axis=1).astype(np.int64)
+        self._col_counts = np.count_nonzero(live, axis=0).astype(np.int64)
+        self._counts_valid = True
+
+    def _update_counts(self, rows, cols, born):
+        if self._counts_valid and len(born):
+            sign = np.where(born, 1, -1)
+            np.add.at(self._row_counts, rows, sign)
+            np.add.at(self._col_counts, cols, sign)
+
+    def apply(self, rows, cols, alive, population=None):
+        """
+        Records one generation from the cells that flipped.
+
+        Args:
+            rows, cols (np.ndarray): Coordinates of the changed cells.
+            alive (np.ndarray): New state of each changed cell (births are nonzero).
+            population (int): Population to use instead of the one derived
+                              from the changes (e.g. of an unbounded plane
+                              whose window is the board).
+        """
+        born = np.asarray(alive) != 0
+        self.births = int(np.count_nonzero(born))
+        self.deaths = len(born) - self.births
+        self.population = int(population) if population is not None else self.population + self.births - self.deaths
+        self._update_counts(rows, cols, born)
+        self.generations += 1
+        self.history.add(self.population)
+
+    def copy(self):
+        """Returns an independent copy (e.g. to hand over to another thread)."""
+        return copy.deepcopy(self)
+
+    def sync(self, population):
+        """
+        Records a generation whose board was replaced wholesale (births and
+        deaths unknown); the bounding box is rebuilt on the next request.
+        """
+        self.population = int(population)
+        self.births = self.deaths = 0
+        self._counts_valid = False
+        self.generations += 1
+        self.history.add(self.population)
+
+    def paste(self, grid, pattern, row, col, wrap_edges=False):
+        """
+        Pastes a pattern with game_logic.paste_pattern and applies the cells
+        it changed, reading only the area under the pattern.
+
+        Returns:
+            int: Number of cells that changed.
+        """
+        rects = placement_rects(grid.shape, np.shape(pattern), row, col, wrap_edges)
+        before = [grid[r0:r1, c0:c1].copy() for r0, c0, r1, c1, _, _ in rects]
+        changed = paste_pattern(grid, pattern, row, col, wrap_edges)
+        if changed:
+            rows, cols = [], []
+            for (r0, c0, r1, c1, _, _), old in zip(rects, before):
+                r, c = np.nonzero(grid[r0:r1, c0:c1] != old)
+                rows.append(r + r0)
+                cols.append(c + c0)
+            rows, cols = np.concatenate(rows), np.concatenate(cols)
+            born = grid[rows, cols] != 0
+            self.population += int(np.count_nonzero(born)) * 2 - len(born)
+            self._update_counts(rows, cols, born)
+        return changed
+
+    def bounding_box(self, grid):
+        """
+        Returns (top, left, bottom, right) of the live cells (inclusive), or
+        None for an empty board.
+
+        Args:
+            grid (np.ndarray): The current board, re-counted only if it was
+                               replaced since the counts were last valid.
+        """
+        if not self._counts_valid or len(self._row_counts) != grid.shape[0] or len(self._col_counts) != grid.shape[1]:
+            self._count(grid)
+        live_rows = np.flatnonzero(self._row_counts)
+        if len(live_rows) == 0:
+            return None
+        live_cols = np.flatnonzero(self._col_counts)
+        return int(live_rows[0]), int(live_cols[0]), int(live_rows[-1]), int(live_cols[-1])
@@ -0,0 +1,167 @@
+import json
+import time
+
+import numpy as np
+
+# Per-phase timing of the simulation loop.
+# Each phase (engine step, population count, end-state check, ...) records its
+# durations into a fixed-size ring buffer (a preallocated list), so memory is
+# bounded and recording a sample is one clock read and one list store.
+# Percentiles are computed from the ring only when asked for (by the GUI panel
+# at its refresh rate, or for a JSON dump). Timed code threads the clock through the calls:
+#
+#     t = profiler.start()
+#     step()
+#     t = profiler.mark("step", t)
+#     count()
+#     t = profiler.mark("population", t)
+#
+# and NULL_PROFILER, whose methods do nothing and read no clock, stands in when
+# profiling is switched off.
+
+DEFAULT_CAPACITY = 1024 # Samples kept per phase
+PHASES = ("step", "diff", "population", "end_state", "timeline", "canvas", "labels")
+PERCENTILES = (50, 95, 99)
+
+
+class PhaseProfiler:
+    """
+    Ring-buffer timings of named phases.
+
+    Args:
+        phases (iterable): Phase names, in display order. Unknown phases
+                           passed to `mark` are added on first use.
+        capacity (int): Most recent samples kept per phase.
+    """
+    enabled = True
+
+    def __init__(self, phases=PHASES, capacity=DEFAULT_CAPACITY):
+        self.capacity = capacity
+        self._index = {}
+        self._samples = []
+        self._counts = []
+        self._totals = []
+        for phase in phases:
+            self._add_phase(phase)
+
+    def _add_phase(self, phase):
+        self._index[phase] = len(self._counts)
+        self._samples.append([0.0] * self.capacity)
+        self._counts.append(0)
+        self._totals.append(0.0)
+
+    @property
+    def phases(self):
+        return list(self._index)
+
+    def start(self):
+        """Returns the clock to pass to the first `mark`."""
+        return time.perf_counter()
+
+    def mark(self, phase, since):
+        """
+        Records the time elapsed since `since` under `phase`.
+
+        Returns:
+            float: The current clock, to pass to the next `mark`.
+        """
+        now = time.perf_counter()
+        self.record(phase, now - since)
+        return now
+
+    def record(self, phase, seconds):
+        """Adds one duration sample to a phase."""
+        i = self._index.get(phase)
+        if i is None:
+            self._add_phase(phase)
+            i = self._index[phase]
+        n = self._counts[i]
+        self._samples[i][n % self.capacity] = seconds
+        self._counts[i] = n + 1
+        self._totals[i] += seconds
+
+    def clear(self):
+        """Forgets every sample."""
+        self._samples = [[0.0] * self.capacity for _ in self._samples]
+        self._counts = [0] * len(self._counts)
+        self._totals = [0.0] * len(self._totals)
+
+    def samples(self, phase):
+        """Returns the recent samples of a phase (in no particular order)."""
+        i = self._index[phase]
+        return np.array(self._samples[i][:min(self._counts[i], self.capacity)])
+
+    def histogram(self, phase, bins=16):
+        """
+        Returns (counts, edges) of the recent samples of a phase over
+        log-spaced duration bins from 1 microsecond to 10 seconds.
+        """
+        edges = np.logspace(-6, 1, bins + 1)
+        counts, _ = np.histogram(np.clip(self.samples(phase), edges[0], edges[-1]), bins=edges)
+        return counts, edges
+
+    def summary(self):
+        """
+        Returns per-phase statistics in seconds: total sample count, mean over
+        the whole run, and p50/p95/p99 and max over the recent samples.
+        Phases without samples are left out.
+        """
+        result = {}
+        for phase, i in self._index.items():
+            count = self._counts[i]
+            if count == 0:
+                continue
+            recent = self.samples(phase)
+            p50, p95, p99 = np.percentile(recent, PERCENTILES)
+            result[phase] = {
+                "count": count,
+                "mean": self._totals[i] / count,
+                "p50": float(p50),
+                "p95": float(p95),
+                "p99": float(p99),
+                "max": float(recent.max()),
+            }
+        return result
+
+    def format_table(self):
+        """Returns the summary as a plain-text table in milliseconds."""
+        lines = [f"{'Phase':<10} {'p50':>8} {'p95':>8} {'p99':>8}"]
+        for phase, stats in self.summary().items():
+            lines.append(f"{phase:<10} {stats['p50'] * 1e3:>8.3f} {stats['p95'] * 1e3:>8.3f} {stats['p99'] * 1e3:>8.3f}")
+        return "\n".join(lines)
+
+    def dump(self, path):
+        """Writes the summary and the log-spaced histograms to a JSON file."""
+        data = {"units": "seconds", "capacity": self.capacity, "phases": self.summary(), "histograms": {}}
+        for phase in data["phases"]:
+            counts, edges = self.histogram(phase)
+            data["histograms"][phase] = {"edges": edges.tolist(), "counts": counts.tolist()}
+        with open(path, "w") as f:
+            json.dump(data, f, indent=2)
+
+
+class _NullProfiler:
+    """Profiler with profiling switched off: every call does nothing."""
+    enabled = False
+    phases = []
+
+    def start(self):
+        return 0.0
+
+    def mark(self, phase, since):
+        return 0.0
+
+    def record(self, phase, seconds):
+        pass
+
+    def clear(self):
+        pass
+
+    def summary(self):
+        return {}
+
+    def format_table(self):
+        return "Profiling is off."
+
+
+NULL_PROFILER = _NullProfiler()
@@ -0,0 +1,82 @@
+import threading
+import time
+from collections import namedtuple
+
+# Background stepping for the GUI.
+# A worker thread advances a headless Simulation as fast as possible (or at a
+# target number of generations per second) while the Tk main loop renders at
+# its own fixed frame rate. The newest finished generation is handed over by
+# swapping a single attribute reference, so neither side ever blocks on the
+# other; generations produced between two frames are simply never drawn.
+# Each snapshot carries a copy of the simulation's PopulationTracker, so the
+# statistics still cover every generation, drawn or not.
+
+Snapshot = namedtuple("Snapshot", ["grid", "generation", "population", "state", "elapsed", "stats"])
+
+
+class SimulationThread:
+    """
+    Runs a simulation.Simulation in a daemon thread.
+
+    Args:
+        simulation (Simulation): The simulation to advance (owned by the
+                                 thread while it runs).
+        target_rate (float): Generations per second, or None to run as fast
+                             as possible ("turbo").
+    """
+
+    def __init__(self, simulation, target_rate=None):
+        self.simulation = simulation
+        self.target_rate = target_rate
+        self._snapshot = None
+        self.final_snapshot = None
+        self._stop_event = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="SimulationThread", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        """Asks the worker to stop and waits for it; returns the final snapshot."""
+        self._stop_event.set()
+        if self._thread.is_alive():
+            self._thread.join()
+        return self.final_snapshot
+
+    @property
+    def finished(self):
+        """True once the worker has exited (end state reached or stopped)."""
+        return self.final_snapshot is not None
+
+    def take_latest(self):
+        """
+        Returns the newest generation published since the last call, or None.
+        Taking it tells the worker to publish the next one.
+        """
+        snapshot = self._snapshot
+        self._snapshot = None
+        return snapshot
+
+    def _make_snapshot(self):
+        sim = self.simulation
+        return Snapshot(sim.grid.copy(), sim.generation, sim.population, sim.state, sim.elapsed,
+                        sim.population_stats.copy())
+
+    def _run(self):
+        sim = self.simulation
+        next_due = time.perf_counter()
+        while not self._stop_event.is_set() and not sim.finished:
+            step_start = time.perf_counter()
+            sim.step()
+            now = time.perf_counter()
+            sim.elapsed += now - step_start # Stepping time only, excluding pacing delays
+            # Only the UI clears the slot, so publish whenever it has been taken
+            if self._snapshot is None:
+                self._snapshot = self._make_snapshot()
+            rate = self.target_rate
+            if rate:
+                next_due = max(next_due + 1.0 / rate, now - 1.0)  # Don't burst after a stall
+                delay = next_due - now
+                if delay > 0:
+                    self._stop_event.wait(delay)
+        self.final_snapshot = self._make_snapshot()
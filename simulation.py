@@ -0,0 +1,401 @@
+import argparse
+import json
+import os
+import sys
+import time
+import numpy as np
+
+from pattern_library import default_library
+from game_logic import CONWAY_RULE, StepScratch, format_rule, initialize_grid, parse_rule, update_grid_into, update_grid_logic
+from bitpacked_logic import update_grid_logic_bitpacked
+from sparse_logic import ActiveTileGrid
+from parallel_logic import ParallelStepper
+from chunked_logic import ChunkedBoard
+from memmap_logic import MemmapBoard
+from cycle_detection import CycleDetector, describe_velocity
+from pattern_io import FORMATS, read_pattern
+from profiling import NULL_PROFILER, PhaseProfiler
+from population_stats import PopulationTracker
+
+# Headless Game of Life simulation.
+# Runs the same engines and end-state detection as the GUI (Dead, Stable,
+# Oscillating, Spaceship) in a tight loop without importing tkinter. Usable as a library
+# (`Simulation`) or from the command line:
+#
+#     python -m simulation --pattern Acorn --size 200 --generations 5000
+
+# Selectable simulation engines (all take (grid, wrap_edges, rule) and return the next grid)
+ENGINES = {
+    "Convolution": update_grid_logic,
+    "Bit-packed": update_grid_logic_bitpacked,
+}
+# Allocation-free stepping into two ping-ponged boards (see game_logic.update_grid_into)
+INPLACE_ENGINE = "In-place"
+# Stateful engine that only recomputes tiles near recent changes (see sparse_logic)
+SPARSE_ENGINE = "Sparse (tiled)"
+# Unbounded plane of lazily allocated chunks (see chunked_logic); `grid` is a window onto it
+CHUNKED_ENGINE = "Unbounded (chunks)"
+ENGINE_NAMES = [INPLACE_ENGINE] + list(ENGINES.keys()) + [SPARSE_ENGINE, CHUNKED_ENGINE]
+# Multi-process engine (see parallel_logic); headless only, as it owns worker processes
+PARALLEL_ENGINE = "Parallel (bands)"
+# Board stored in a memory-mapped file and stepped band by band (see memmap_logic); headless only
+MEMMAP_ENGINE = "Memory-mapped (bands)"
+HEADLESS_ENGINE_NAMES = ENGINE_NAMES + [PARALLEL_ENGINE, MEMMAP_ENGINE]
+DEFAULT_ENGINE = INPLACE_ENGINE
+
+DEFAULT_GRID_SIZE = 100
+MAX_HISTORY_SIZE = 10000
+END_STATES = ("Dead", "Stable", "Oscillating", "Spaceship")
+
+
+def load_grid_file(path, info=None):
+    """
+    Loads a seed pattern from a file.
+
+    Supports NumPy `.npy` arrays and the pattern formats of pattern_io (RLE,
+    plaintext, Life 1.06, Macrocell). Files with other extensions are read as
+    plaintext grids, where each line is a row of cells written as `O`, `*` or
+    `1` (alive) and `.` or `0` (dead), and lines starting with `!` or `#` are
+    comments.
+
+    Args:
+        path (str): The seed file.
+        info (dict): Optional dict that receives the file's metadata, such as "rule".
+
+    Returns:
+        np.ndarray: 2D int8 array of 0/1 cells.
+    """
+    if path.endswith(".npy"):
+        return (np.load(path) != 0).astype(np.int8)
+    fmt = FORMATS.get(os.path.splitext(path)[1].lower(), "plaintext")
+    return read_pattern(path, fmt=fmt, info=info)
+
+
+def place_centered(pattern, size):
+    """Returns a new size x size grid with `pattern` placed in its centre."""
+    rows, cols = pattern.shape
+    if rows > size or cols > size:
+        raise ValueError(f"Pattern of shape {pattern.shape} does not fit a {size}x{size} grid")
+    grid = initialize_grid(size)
+    top, left = (size - rows) // 2, (size - cols) // 2
+    grid[top:top + rows, left:left + cols] = pattern != 0
+    return grid
+
+
+class Simulation:
+    """
+    Headless simulation with the same end-state detection as the GUI.
+
+    Args:
+        grid (np.ndarray): Initial 2D array of 0/1 cells (copied).
+        wrap_edges (bool): If True, edges wrap around (toroidal array).
+        engine (str): One of HEADLESS_ENGINE_NAMES.
+        history_size (int): Number of previous generations remembered for
+                            oscillation detection (the longest detectable period).
+        workers (int): Worker processes for the parallel engine (default: all cores).
+        rule (str): Life-like rulestring such as "B36/S23" (default: Conway's B3/S23).
+        board (ChunkedBoard or MemmapBoard): Existing plane for the unbounded
+                              engine (default: a new one holding `grid` at the
+                              origin) or file-backed board for the memory-mapped
+                              engine (default: a temporary file holding `grid`,
+                              which may then be `board.grid` itself). Its rule
+                              is replaced by `rule`.
+        timeline (Timeline): Optional history that every generation is recorded into.
+        timeline_start (int): Timeline generation number of the initial grid.
+        profiler (PhaseProfiler): Optional per-phase timer of each step
+                                  (default: profiling off).
+        population_stats (PopulationTracker): Optional tracker of `grid` to
+                              continue (default: a new one); it is updated
+                              from the changed cells every generation.
+
+    With the unbounded engine, wrap_edges is ignored, `grid` is the window of
+    the plane at the origin with the initial grid's shape, and oscillations
+    and spaceships are not detected (the plane has no fixed shape to hash); the run ends
+    when the plane dies or stops changing. The memory-mapped engine does not
+    detect oscillations either, since hashing would read the whole file
+    every generation.
+    """
+
+    def __init__(self, grid, wrap_edges=True, engine=DEFAULT_ENGINE, history_size=MAX_HISTORY_SIZE, workers=None,
+                 rule=CONWAY_RULE, board=None, timeline=None, timeline_start=0, profiler=None,
+                 population_stats=None):
+        if engine not in HEADLESS_ENGINE_NAMES:
+            raise ValueError(f"Unknown engine '{engine}'. Choose from: {', '.join(HEADLESS_ENGINE_NAMES)}")
+        self.rule = format_rule(*parse_rule(rule)) # Validates and normalizes the rulestring
+        self.wrap_edges = wrap_edges
+        self.engine = engine
+        self.profiler = profiler or NULL_PROFILER
+        self.generation = 0
+        self.state = "Paused"
+        self.cycle_detector = CycleDetector(grid.shape, history_size)
+        self.elapsed = 0.0
+        self._tracker = None
+        self._stepper = None
+        self._scratch = None
+        self._memmap = None
+        self._owns_memmap = False
+        self.board = None
+        self._detect_cycles = engine not in (CHUNKED_ENGINE, MEMMAP_ENGINE)
+        if engine == CHUNKED_ENGINE:
+            self.board = board if board is not None else ChunkedBoard(grid, rule=self.rule)
+            self.board.set_rule(self.rule)
+            self.grid = self.board.get_grid(grid.shape)
+            self.population = self.board.population
+        elif engine == SPARSE_ENGINE:
+            self._tracker = ActiveTileGrid(grid, wrap_edges, rule=self.rule)
+            self.grid = self._tracker.grid
+            self.population = self._tracker.population
+        elif engine == INPLACE_ENGINE:
+            self.grid = np.array(grid, dtype=np.int8)
+            self._spare = np.empty_like(self.grid) # Receives the next generation, then swaps with grid
+            self._scratch = StepScratch(self.grid.shape)
+            self._changed = np.empty(self.grid.shape, dtype=bool)
+            self.population = int(np.count_nonzero(self.grid))
+        elif engine == MEMMAP_ENGINE:
+            self._owns_memmap = board is None
+            if board is None:
+                board = MemmapBoard(grid.shape, wrap_edges=wrap_edges, rule=self.rule)
+                board.paste(grid)
+            self._memmap = board
+            self._memmap.wrap_edges = wrap_edges
+            self._memmap.set_rule(self.rule)
+            self.grid = self._memmap.grid
+            self.population = self._memmap.population
+        elif engine == PARALLEL_ENGINE:
+            self._stepper = ParallelStepper(grid, wrap_edges, workers, self.rule)
+            self.grid = self._stepper.grid
+            self.population = int(np.sum(self.grid))
+        else:
+            self._update = ENGINES[engine]
+            self.grid = np.array(grid, dtype=np.int8)
+            self.population = int(np.sum(self.grid))
+        self.initial_population = self.population
+        if population_stats is None or population_stats.population != self.population:
+            population_stats = population_stats or PopulationTracker()
+            population_stats.reset(self.grid, self.population) # Counted by the engine; the box is built on demand
+        self.population_stats = population_stats
+        if self._detect_cycles:
+            self.cycle_detector.start(self.grid, self.generation)
+        self.timeline = timeline
+        self.timeline_start = timeline_start
+        if timeline is not None and timeline.last_generation != timeline_start:
+            timeline.record(timeline_start, self.grid)
+        self.min_population = self.max_population = self.population
+        self._population_sum = 0
+
+    @property
+    def finished(self):
+        """True once the simulation reached one of END_STATES."""
+        return self.state in END_STATES
+
+    def step(self):
+        """
+        Advances one generation and updates the end state.
+
+        Returns:
+            str: The simulation state after the step.
+        """
+        # Engines that track their own changes and population record it all as "step"
+        profiler = self.profiler
+        t = profiler.start()
+        stats = self.population_stats
+        if self.board is not None:
+            changed = self.board.step()
+            old_grid = self.grid
+            self.grid = self.board.get_grid(self.grid.shape)
+            t = profiler.mark("step", t)
+            # Births and deaths inside the window; the population is the whole plane's
+            changed_rows, changed_cols = np.nonzero(self.grid != old_grid)
+            stats.apply(changed_rows, changed_cols, self.grid[changed_rows, changed_cols], self.board.population)
+            t = profiler.mark("population", t)
+        elif self._memmap is not None:
+            changed = self._memmap.step()
+            self.grid = self._memmap.grid
+            stats.sync(self._memmap.population) # Diffing the file would read all of it
+            t = profiler.mark("step", t)
+        elif self._tracker is not None:
+            self._tracker.step()
+            changed_rows, changed_cols = self._tracker.changed_rows, self._tracker.changed_cols
+            t = profiler.mark("step", t)
+        elif self._scratch is not None:
+            update_grid_into(self.grid, self._spare, self._scratch, self.wrap_edges, self.rule)
+            t = profiler.mark("step", t)
+            np.not_equal(self._spare, self.grid, out=self._changed)
+            changed_rows, changed_cols = np.nonzero(self._changed) # Sized by the changes only
+            self.grid, self._spare = self._spare, self.grid
+            t = profiler.mark("diff", t)
+        elif self._stepper is not None:
+            self._stepper.step()
+            self.grid = self._stepper.grid
+            t = profiler.mark("step", t)
+            changed_rows, changed_cols = np.nonzero(self.grid != self._stepper.previous_grid)
+            t = profiler.mark("diff", t)
+        else:
+            new_grid = self._update(self.grid, self.wrap_edges, self.rule)
+            t = profiler.mark("step", t)
+            changed_rows, changed_cols = np.nonzero(new_grid != self.grid)
+            self.grid = new_grid
+            t = profiler.mark("diff", t)
+        if self._detect_cycles:
+            alive = self.grid[changed_rows, changed_cols]
+            stats.apply(changed_rows, changed_cols, alive) # Population from the births and deaths
+            t = profiler.mark("population", t)
+        self.population = stats.population
+        unchanged = len(changed_rows) == 0 if self._detect_cycles else changed == 0
+
+        self.generation += 1
+        if self.timeline is not None:
+            changed = changed_rows * self.grid.shape[1] + changed_cols if self._detect_cycles else None
+            self.timeline.record(self.timeline_start + self.generation, self.grid, changed)
+            t = profiler.mark("timeline", t)
+        self.min_population = min(self.min_population, self.population)
+        self.max_population = max(self.max_population, self.population)
+        self._population_sum += self.population
+
+        if self.population == 0:
+            self.state = "Dead"
+        elif unchanged:
+            self.state = "Stable"
+        elif self._detect_cycles and self.cycle_detector.update(changed_rows, changed_cols, self.generation, alive):
+            # A board that repeats shifted is a lone spaceship (or a fleet moving together)
+            self.state = "Spaceship" if self.cycle_detector.moving else "Oscillating"
+        else:
+            self.state = "Running"
+        profiler.mark("end_state", t)
+        return self.state
+
+    def run(self, max_generations=None):
+        """
+        Steps until an end state is reached or `max_generations` steps were made.
+
+        Returns:
+            dict: Statistics of the run (see `stats`).
+        """
+        start = time.perf_counter()
+        steps = 0
+        while not self.finished and (max_generations is None or steps < max_generations):
+            self.step()
+            steps += 1
+        self.elapsed += time.perf_counter() - start
+        return self.stats()
+
+    def close(self):
+        """Releases engine resources (worker processes of the parallel engine, the memory-mapped board)."""
+        if self._stepper is not None:
+            self._stepper.close()
+            self.grid = self._stepper.grid
+        if self._memmap is not None:
+            if self._owns_memmap:
+                self._memmap.close()
+            else:
+                self._memmap.flush()
+
+    def stats(self):
+        """Returns a dict with the end state, population statistics and throughput."""
+        cells = self.grid.size * self.generation
+        recurring = self.state in ("Oscillating", "Spaceship")
+        return {
+            "state": self.state,
+            "generations": self.generation,
+            "population": self.population,
+            "initial_population": self.initial_population,
+            "min_population": self.min_population,
+            "max_population": self.max_population,
+            "period": self.cycle_detector.period if recurring else None,
+            "pre_period": self.cycle_detector.pre_period if recurring else None,
+            "displacement": list(self.cycle_detector.displacement) if self.state == "Spaceship" else None,
+            "velocity": describe_velocity(self.cycle_detector.displacement, self.cycle_detector.period)
+                        if self.state == "Spaceship" else None,
+            "mean_population": self._population_sum / self.generation if self.generation else float(self.population),
+            "engine": self.engine,
+            "rule": self.rule,
+            "wrap_edges": self.wrap_edges,
+            "grid_shape": list(self.grid.shape),
+            "elapsed_s": self.elapsed,
+            "gens_per_sec": self.generation / self.elapsed if self.elapsed > 0 else None,
+            "cells_per_sec": cells / self.elapsed if self.elapsed > 0 else None,
+            **({"profile": self.profiler.summary()} if self.profiler.enabled else {}),
+        }
+
+
+def main(argv=None):
+    """Command line entry point: runs a seed pattern headlessly and prints its statistics."""
+    parser = argparse.ArgumentParser(description="Run a Game of Life simulation without the GUI.")
+    seed = parser.add_mutually_exclusive_group(required=True)
+    seed.add_argument("--pattern", help="Name of a pattern from the pattern library (see --list-patterns)")
+    seed.add_argument("--file", help="Seed file (.rle, .cells, .lif, .mc, .npy or plaintext grid)")
+    seed.add_argument("--list-patterns", action="store_true", help="List available pattern names and exit")
+    parser.add_argument("--size", type=int, default=DEFAULT_GRID_SIZE, help="Board side length (default: %(default)s)")
+    parser.add_argument("--generations", type=int, default=None, help="Maximum generations (default: run until an end state)")
+    parser.add_argument("--engine", choices=HEADLESS_ENGINE_NAMES, default=DEFAULT_ENGINE)
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes for the parallel engine (default: all cores)")
+    parser.add_argument("--rule", default=None,
+                        help=f"Life-like rulestring, e.g. B36/S23 (default: the seed file's rule, else {CONWAY_RULE})")
+    parser.add_argument("--no-wrap", action="store_true", help="Treat edges as dead cells instead of wrapping")
+    parser.add_argument("--board-file", default=None,
+                        help="Memory-mapped engine: keep the board in this file (default: a temporary file)")
+    parser.add_argument("--band-rows", type=int, default=None, help="Memory-mapped engine: rows stepped per band")
+    parser.add_argument("--profile", action="store_true", help="Time each phase of a generation and report percentiles")
+    parser.add_argument("--profile-file", default=None, help="Also write the phase timings and histograms to this JSON file")
+    parser.add_argument("--json", action="store_true", help="Print the statistics as JSON")
+    args = parser.parse_args(argv)
+
+    if args.list_patterns:
+        print("\n".join(default_library().names()))
+        return 0
+
+    if args.pattern:
+        pattern = default_library().get(args.pattern)
+        if pattern is None:
+            parser.error(f"Unknown pattern '{args.pattern}'. Use --list-patterns to see the options.")
+    else:
+        info = {}
+        pattern = load_grid_file(args.file, info)
+        if args.rule is None:
+            args.rule = info.get("rule")
+    args.rule = args.rule or CONWAY_RULE
+
+    try:
+        parse_rule(args.rule)
+    except ValueError as e:
+        parser.error(str(e))
+
+    board = None
+    if args.engine == MEMMAP_ENGINE:
+        # Write the seed straight into the file instead of building a dense board in memory
+        rows, cols = pattern.shape
+        if rows > args.size or cols > args.size:
+            parser.error(f"Pattern of shape {pattern.shape} does not fit a {args.size}x{args.size} grid")
+        board = MemmapBoard((args.size, args.size), path=args.board_file, wrap_edges=not args.no_wrap,
+                            rule=args.rule, band_rows=args.band_rows)
+        board.paste(pattern, (args.size - rows) // 2, (args.size - cols) // 2)
+        grid = board.grid
+    else:
+        grid = place_centered(pattern, args.size)
+
+    profiler = PhaseProfiler() if args.profile or args.profile_file else None
+    sim = Simulation(grid, wrap_edges=not args.no_wrap, engine=args.engine, workers=args.workers,
+                     rule=args.rule, board=board, profiler=profiler)
+    try:
+        stats = sim.run(args.generations)
+    finally:
+        sim.close()
+        if board is not None:
+            board.close()
+
+    if profiler is not None and args.profile_file:
+        profiler.dump(args.profile_file)
+
+    if args.json:
+        print(json.dumps(stats, indent=2))
+    else:
+        for key, value in stats.items():
+            if key != "profile":
+                print(f"{key}: {value}")
+        if profiler is not None:
+            print(f"\nPhase timings (ms):\n{profiler.format_table()}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,166 @@
+import numpy as np
+
+from game_logic import CONWAY_RULE, rule_table
+
+# Sparse active-region stepping.
+# The board is split into square tiles. Only tiles that changed in the last
+# generation, plus their neighbors, can change in the next one, so only those
+# are recomputed. Population and the stable check are maintained from the
+# per-tile deltas, so the cost of a generation scales with activity rather
+# than board area.
+
+DEFAULT_TILE_SIZE = 32
+
+
+class ActiveTileGrid:
+    """
+    Game of Life board that only recomputes tiles near recent changes.
+
+    Args:
+        grid (np.ndarray): Initial 2D array of 0/1 cells (copied).
+        wrap_edges (bool): If True, edges wrap around (toroidal array).
+                           If False, edges are treated as dead cells.
+        tile_size (int): Side length of a tile in cells.
+        rule (str): Life-like rulestring (see game_logic.parse_rule).
+    """
+
+    def __init__(self, grid, wrap_edges=True, tile_size=DEFAULT_TILE_SIZE, rule=CONWAY_RULE):
+        self.tile_size = tile_size
+        self.wrap_edges = wrap_edges
+        self.rule = rule
+        self._table = rule_table(rule)
+        self.set_grid(grid)
+
+    # --- Setup ---
+
+    def _axis_map(self, length, n_tiles):
+        """
+        Maps window positions -1..n_tiles*T (shifted by +1) to buffer indices.
+        Positions outside the board map to the always-dead sentinel at `length`.
+        """
+        positions = np.arange(-1, n_tiles * self.tile_size + 1)
+        mapped = np.where((positions >= 0) & (positions < length), positions, length)
+        if self.wrap_edges:
+            mapped[positions == -1] = length - 1
+            mapped[positions == length] = 0
+        return mapped
+
+    def set_grid(self, grid):
+        """Replaces the board and marks every tile for recomputation."""
+        rows, cols = grid.shape
+        t = self.tile_size
+        self.shape = (rows, cols)
+        self.tile_rows = (rows + t - 1) // t
+        self.tile_cols = (cols + t - 1) // t
+        # One extra row and column act as a permanently dead sentinel
+        self._buffer = np.zeros((rows + 1, cols + 1), dtype=np.int8)
+        self._buffer[:rows, :cols] = grid != 0
+        self._row_map = self._axis_map(rows, self.tile_rows)
+        self._col_map = self._axis_map(cols, self.tile_cols)
+        self._window = np.arange(t + 2)
+        # Window positions past the last row/col (ragged edge tiles) are never written
+        self._row_on_board = np.arange(-1, self.tile_rows * t + 1) < rows
+        self._col_on_board = np.arange(-1, self.tile_cols * t + 1) < cols
+        self.population = int(np.count_nonzero(self.grid))
+        self.generation = 0
+        self.changed_tiles = 0
+        self.changed_rows = np.empty(0, dtype=np.intp)
+        self.changed_cols = np.empty(0, dtype=np.intp)
+        self._active = np.arange(self.tile_rows * self.tile_cols)
+
+    @property
+    def grid(self):
+        """The current board as a (rows, cols) view (modify via mark_dirty)."""
+        return self._buffer[:self.shape[0], :self.shape[1]]
+
+    @property
+    def active_tiles(self):
+        """Number of tiles that will be recomputed on the next step."""
+        return len(self._active)
+
+    @property
+    def is_stable(self):
+        """True if the last step changed no cells."""
+        return self.generation > 0 and self.changed_tiles == 0
+
+    def mark_dirty(self, row0, col0, row1, col1):
+        """
+        Schedules the tiles covering rows [row0, row1) and cols [col0, col1)
+        (and their neighbors) for recomputation after an external edit of
+        `grid`, and recounts the population.
+        """
+        rows, cols = self.shape
+        row0, row1 = max(0, row0), min(rows, row1)
+        col0, col1 = max(0, col0), min(cols, col1)
+        if row0 >= row1 or col0 >= col1:
+            return
+        t = self.tile_size
+        tr, tc = np.meshgrid(np.arange(row0 // t, (row1 - 1) // t + 1),
+                             np.arange(col0 // t, (col1 - 1) // t + 1), indexing="ij")
+        self._active = np.union1d(self._active, self._dilate(tr.ravel(), tc.ravel()))
+        self.population = int(np.count_nonzero(self.grid))
+
+    def _dilate(self, tile_r, tile_c):
+        """Returns the linear indices of the given tiles and their 8 neighbors."""
+        offsets = np.array([-1, 0, 1])
+        nr = (tile_r[:, None, None] + offsets[None, :, None]).repeat(3, axis=2)
+        nc = (tile_c[:, None, None] + offsets[None, None, :]).repeat(3, axis=1)
+        if self.wrap_edges:
+            nr %= self.tile_rows
+            nc %= self.tile_cols
+            valid = np.ones(nr.shape, dtype=bool)
+        else:
+            valid = (nr >= 0) & (nr < self.tile_rows) & (nc >= 0) & (nc < self.tile_cols)
+        return np.unique(nr[valid] * self.tile_cols + nc[valid])
+
+    # --- Stepping ---
+
+    def step(self):
+        """
+        Advances the board by one generation, recomputing only active tiles.
+
+        Returns:
+            int: The number of cells that changed.
+        """
+        t = self.tile_size
+        active = self._active
+        self.generation += 1
+        if len(active) == 0:
+            self.changed_tiles = 0
+            self.changed_rows = self.changed_cols = np.empty(0, dtype=np.intp)
+            return 0
+
+        tile_r, tile_c = np.divmod(active, self.tile_cols)
+        # Buffer indices of each tile's (t+2)x(t+2) window including the halo
+        row_pos = (tile_r * t)[:, None] + self._window
+        col_pos = (tile_c * t)[:, None] + self._window
+        rows = self._row_map[row_pos]
+        cols = self._col_map[col_pos]
+        windows = self._buffer[rows[:, :, None], cols[:, None, :]]
+
+        neighbors = (windows[:, :-2, :-2] + windows[:, :-2, 1:-1] + windows[:, :-2, 2:] +
+                     windows[:, 1:-1, :-2] + windows[:, 1:-1, 2:] +
+                     windows[:, 2:, :-2] + windows[:, 2:, 1:-1] + windows[:, 2:, 2:])
+        old = windows[:, 1:-1, 1:-1]
+        new = self._table[old * 9 + neighbors]
+
+        # Only cells that lie on the board are written back
+        inner_rows = rows[:, 1:-1]
+        inner_cols = cols[:, 1:-1]
+        on_board = (self._row_on_board[row_pos[:, 1:-1]][:, :, None] &
+                    self._col_on_board[col_pos[:, 1:-1]][:, None, :])
+        diff = (new != old) & on_board
+
+        tile_idx, r_off, c_off = np.nonzero(diff)
+        changed_rows = inner_rows[tile_idx, r_off]
+        changed_cols = inner_cols[tile_idx, c_off]
+        new_values = new[tile_idx, r_off, c_off]
+        self._buffer[changed_rows, changed_cols] = new_values
+
+        self.population += 2 * int(np.count_nonzero(new_values)) - len(new_values)
+        self.changed_rows, self.changed_cols = changed_rows, changed_cols
+
+        changed = np.unique(tile_idx)
+        self.changed_tiles = len(changed)
+        self._active = self._dilate(tile_r[changed], tile_c[changed])
+        return len(new_values)
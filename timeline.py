@@ -0,0 +1,289 @@
+import os
+import tempfile
+import weakref
+import zlib
+from bisect import bisect_right
+from collections import deque
+
+import numpy as np
+
+# Scrubbable history of a run.
+# Every KEYFRAME_INTERVAL generations the board is stored whole, bit-packed and
+# zlib-compressed. The generations in between are stored as deltas: the flat
+# indices of the cells that flipped (when few did) or the compressed XOR of the
+# two boards (when many did). A flip set undoes itself, so a delta takes the
+# board one generation forward or back, and any generation is rebuilt from the
+# nearest keyframe (or the last generation shown) with at most a keyframe
+# interval of deltas. Entries live in memory up to a byte budget; older ones
+# are moved to a fixed-size memory-mapped spill file used as a ring buffer, and
+# when that is full too the oldest keyframe and its deltas are dropped.
+
+KEYFRAME_INTERVAL = 64
+DEFAULT_MEMORY_BUDGET = 64 * 1024 * 1024
+DEFAULT_SPILL_BUDGET = 512 * 1024 * 1024
+COMPRESSION_LEVEL = 1 # zlib level; higher levels cost more than they save on Life boards
+
+KEYFRAME, SPARSE, XOR = 0, 1, 2 # Entry kinds
+
+
+def _remove_file(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+class Timeline:
+    """
+    Compressed history of consecutive generations of one board.
+
+    Args:
+        keyframe_interval (int): Generations between two full keyframes.
+        memory_budget (int): Bytes of encoded entries kept in memory.
+        spill_budget (int): Size in bytes of the memory-mapped spill file that
+                            takes the entries pushed out of memory, or 0 to
+                            drop them instead.
+        spill_dir (str): Directory of the spill file (default: the system
+                         temporary directory). The file is created on first
+                         spill and removed by `close`.
+    """
+
+    def __init__(self, keyframe_interval=KEYFRAME_INTERVAL, memory_budget=DEFAULT_MEMORY_BUDGET,
+                 spill_budget=DEFAULT_SPILL_BUDGET, spill_dir=None):
+        self.keyframe_interval = keyframe_interval
+        self.memory_budget = memory_budget
+        self.spill_budget = spill_budget
+        self.spill_dir = spill_dir
+        self.memory_bytes = 0 # Encoded bytes held in memory
+        self.spilled_bytes = 0 # Encoded bytes held in the spill file
+        self._spill_path = None
+        self._spill_map = None
+        self._spill_finalizer = None
+        self.clear()
+
+    # --- Bookkeeping ---
+
+    def clear(self):
+        """Forgets every generation (the spill file is kept for reuse)."""
+        self.shape = None
+        self.first_generation = None
+        self.last_generation = None
+        self._entries = deque() # [generation, kind, data or None, spill offset, length], oldest first
+        self._keyframes = [] # Generations of the keyframe entries
+        self._spilled = 0 # The first `_spilled` entries are in the spill file
+        self._spill_tail = 0 # Spill file offset after the newest spilled entry
+        self._last = None # Board of last_generation
+        self._cache = None # (generation, board) of the last `get`
+        self.memory_bytes = 0
+        self.spilled_bytes = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, generation):
+        return self.first_generation is not None and self.first_generation <= generation <= self.last_generation
+
+    def close(self):
+        """Clears the history and removes the spill file."""
+        self.clear()
+        self._spill_map = None
+        if self._spill_finalizer is not None:
+            self._spill_finalizer()
+            self._spill_finalizer = None
+        self._spill_path = None
+
+    # --- Recording ---
+
+    def record(self, generation, grid, changed=None):
+        """
+        Adds a generation. Recording the generation after the last one extends
+        the timeline; recording an earlier one replaces it and discards the
+        generations after it (a new branch); anything else starts over.
+
+        Args:
+            generation (int): Generation number of `grid`.
+            grid (np.ndarray): 2D array of 0/1 cells (copied).
+            changed (np.ndarray): Optional flat indices of the cells that differ
+                                  from the previous generation, if the engine
+                                  already knows them.
+        """
+        grid = np.asarray(grid)
+        if self.last_generation is None or grid.shape != self.shape:
+            self.clear()
+        elif generation in self:
+            self.truncate_after(generation - 1)
+            changed = None # Relative to a board we did not see
+        elif generation != self.last_generation + 1:
+            self.clear()
+
+        if self.last_generation is None:
+            self.shape = grid.shape
+            self.first_generation = generation
+        if self._last is None or generation - self._keyframes[-1] >= self.keyframe_interval:
+            kind, data = KEYFRAME, self._encode_grid(grid)
+            self._keyframes.append(generation)
+        else:
+            kind, data = self._encode_delta(grid, changed)
+        self._entries.append([generation, kind, data, None, len(data)])
+        self.memory_bytes += len(data)
+        self.last_generation = generation
+        self._last = np.array(grid, dtype=np.int8)
+        self._enforce_budget()
+
+    def truncate_after(self, generation):
+        """Discards the generations after `generation`."""
+        while self._entries and self._entries[-1][0] > generation:
+            entry = self._entries.pop()
+            if entry[2] is None:
+                self._spilled -= 1
+                self.spilled_bytes -= entry[4]
+            else:
+                self.memory_bytes -= entry[4]
+            if entry[1] == KEYFRAME:
+                self._keyframes.pop()
+        if not self._entries:
+            self.clear()
+            return
+        self._spill_tail = self._entries[self._spilled - 1][3] + self._entries[self._spilled - 1][4] if self._spilled else 0
+        self.last_generation = self._entries[-1][0]
+        self._last = None
+        if self._cache is not None and self._cache[0] > self.last_generation:
+            self._cache = None
+        self._last = self.get(self.last_generation)
+
+    def _encode_grid(self, grid):
+        return zlib.compress(np.packbits(np.asarray(grid, dtype=bool)).tobytes(), COMPRESSION_LEVEL)
+
+    def _encode_delta(self, grid, changed):
+        cells = self.shape[0] * self.shape[1]
+        flips = None
+        if changed is None:
+            flips = (self._last != grid).reshape(-1)
+            if np.count_nonzero(flips) * 4 <= cells // 8:
+                changed = np.flatnonzero(flips)
+        if changed is not None and len(changed) * 4 <= cells // 8: # Cheaper than a packed bit per cell
+            return SPARSE, np.asarray(changed, dtype=np.uint32).tobytes()
+        if flips is None:
+            flips = np.zeros(cells, dtype=bool)
+            flips[changed] = True
+        return XOR, zlib.compress(np.packbits(flips).tobytes(), COMPRESSION_LEVEL)
+
+    # --- Memory budget and spilling ---
+
+    def _enforce_budget(self):
+        # The newest keyframe and its deltas always stay in memory
+        while self.memory_bytes > self.memory_budget and len(self._keyframes) > 1:
+            entry = self._entries[self._spilled]
+            if entry[0] >= self._keyframes[-1]:
+                break
+            if not self._spill(entry):
+                self._drop_oldest_segment()
+
+    def _drop_oldest_segment(self):
+        """Removes the oldest keyframe and the deltas that depend on it."""
+        self._keyframes.pop(0)
+        stop = self._keyframes[0] if self._keyframes else None
+        while self._entries and self._entries[0][0] != stop:
+            entry = self._entries.popleft()
+            if entry[2] is None:
+                self._spilled -= 1
+                self.spilled_bytes -= entry[4]
+            else:
+                self.memory_bytes -= entry[4]
+        if not self._entries:
+            self.clear()
+            return
+        self.first_generation = self._entries[0][0]
+        if self._cache is not None and self._cache[0] < self.first_generation:
+            self._cache = None
+
+    def _open_spill(self):
+        if self._spill_map is None:
+            fd, self._spill_path = tempfile.mkstemp(prefix="life_timeline_", suffix=".bin", dir=self.spill_dir)
+            os.close(fd)
+            self._spill_finalizer = weakref.finalize(self, _remove_file, self._spill_path)
+            self._spill_map = np.memmap(self._spill_path, dtype=np.uint8, mode="w+", shape=(self.spill_budget,))
+        return self._spill_map
+
+    def _spill(self, entry):
+        """Moves an in-memory entry (the oldest one) to the spill ring; False if it cannot."""
+        length = entry[4]
+        if length > self.spill_budget:
+            return False
+        spill = self._open_spill()
+        offset = self._spill_tail
+        if offset + length > self.spill_budget:
+            # Wrap around; the oldest entries past the tail are overwritten first
+            while self._spilled and self._entries[0][3] >= offset:
+                self._drop_oldest_segment()
+            offset = 0
+        # The oldest spilled entry is always the next one in the way
+        while self._spilled and self._entries[0][3] < offset + length and offset < self._entries[0][3] + self._entries[0][4]:
+            self._drop_oldest_segment()
+        if not self._entries or entry[0] < self.first_generation: # Dropped with its segment
+            return True
+        spill[offset:offset + length] = np.frombuffer(entry[2], dtype=np.uint8)
+        entry[2], entry[3] = None, offset
+        self._spilled += 1
+        self._spill_tail = offset + length
+        self.memory_bytes -= length
+        self.spilled_bytes += length
+        return True
+
+    def _data(self, entry):
+        if entry[2] is not None:
+            return entry[2]
+        return self._spill_map[entry[3]:entry[3] + entry[4]].tobytes()
+
+    # --- Playback ---
+
+    def _entry(self, generation):
+        return self._entries[generation - self.first_generation]
+
+    def _decode_grid(self, data):
+        cells = self.shape[0] * self.shape[1]
+        bits = np.unpackbits(np.frombuffer(zlib.decompress(data), dtype=np.uint8), count=cells)
+        return bits.view(np.int8).reshape(self.shape)
+
+    def _apply_delta(self, board, entry):
+        flat = board.reshape(-1)
+        data = self._data(entry)
+        if entry[1] == SPARSE:
+            flat[np.frombuffer(data, dtype=np.uint32)] ^= 1
+        else:
+            cells = flat.size
+            flips = np.unpackbits(np.frombuffer(zlib.decompress(data), dtype=np.uint8), count=cells)
+            flat ^= flips.view(np.int8)
+
+    def get(self, generation):
+        """
+        Rebuilds the board of a recorded generation.
+
+        Returns:
+            np.ndarray: New int8 array of 0/1 cells.
+
+        Raises:
+            KeyError: If the generation is not (or no longer) in the timeline.
+        """
+        if generation not in self:
+            raise KeyError(f"Generation {generation} is not in the timeline")
+        if generation == self.last_generation and self._last is not None:
+            return self._last.copy()
+        keyframe = self._keyframes[bisect_right(self._keyframes, generation) - 1]
+        start, board = keyframe, None
+        # Walking from the last board returned is cheaper for small scrubs within a segment
+        if self._cache is not None:
+            cached, cached_board = self._cache
+            segment = self._keyframes[bisect_right(self._keyframes, cached) - 1]
+            if segment == keyframe and abs(cached - generation) < generation - keyframe:
+                start, board = cached, cached_board.copy()
+        if board is None:
+            board = self._decode_grid(self._data(self._entry(keyframe)))
+        if start <= generation:
+            for g in range(start + 1, generation + 1):
+                self._apply_delta(board, self._entry(g))
+        else:
+            for g in range(start, generation, -1): # Each delta also undoes its generation
+                self._apply_delta(board, self._entry(g))
+        self._cache = (generation, board.copy())
+        return board